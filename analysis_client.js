@@ -0,0 +1,168 @@
+// 상주 분석 서버 (main.py --serve / server.py) 프로세스 관리와 JSON 줄 프로토콜 클라이언트
+//
+// 앱 시작 시 서버를 한 번 띄워 두고 분석마다 연결 하나로 작업만 보내므로, 분석마다 Python 시작/임포트와
+// PyInstaller 압축 해제 비용을 다시 내지 않습니다. 서버는 stdin이 닫히면 (앱 종료) 스스로 멈춥니다.
+
+const net = require('net');
+const { spawn } = require('child_process');
+
+class AnalysisServerClient {
+  // command/args: 서버 실행 명령 (예: python3 [main.py, --serve]), socketPath가 없으면 localhost TCP 빈 포트
+  constructor(command, args, { cwd, socketPath = null, startTimeoutMs = 60000, log = console.log } = {}) {
+    this.command = command;
+    this.args = args;
+    this.cwd = cwd;
+    this.socketPath = socketPath;
+    this.startTimeoutMs = startTimeoutMs; // PyInstaller onefile 첫 압축 해제까지 고려한 준비 대기 시간
+    this.log = log;
+    this.process = null;
+    this.socket = null;
+    this.starting = null;
+    this.pending = []; // queued 이벤트를 기다리는 요청의 이벤트 처리 함수 (서버가 요청 순서대로 job_id 부여)
+    this.handlers = new Map(); // job_id -> 이벤트 처리 함수
+  }
+
+  get connected() {
+    return this.socket !== null;
+  }
+
+  // 서버 실행 후 연결 (이미 시작 중이면 같은 Promise)
+  start() {
+    if (this.connected) return Promise.resolve();
+    if (!this.starting) {
+      this.starting = this._start().finally(() => { this.starting = null; });
+    }
+    return this.starting;
+  }
+
+  _start() {
+    return new Promise((resolve, reject) => {
+      const address = this.socketPath ? ['--socket', this.socketPath] : ['--port', '0'];
+      const proc = spawn(this.command, [...this.args, ...address, '--exit-on-stdin-close'], {
+        cwd: this.cwd,
+        env: { ...process.env }
+      });
+      this.process = proc;
+
+      let settled = false;
+      const fail = (err) => {
+        if (settled) return;
+        settled = true;
+        clearTimeout(timer);
+        proc.kill();
+        reject(err);
+      };
+      const timer = setTimeout(() => fail(new Error('Analysis server did not start in time')), this.startTimeoutMs);
+
+      // 준비 알림 ({"event": "listening", ...}) 한 줄을 받으면 연결
+      let stdoutText = '';
+      proc.stdout.on('data', (data) => {
+        if (settled) return;
+        stdoutText += data.toString();
+        const lines = stdoutText.split('\n');
+        stdoutText = lines.pop();
+        for (const line of lines) {
+          let message;
+          try {
+            message = JSON.parse(line);
+          } catch (err) {
+            continue;
+          }
+          if (message.event !== 'listening') continue;
+          const options = message.socket ? { path: message.socket } : { host: message.host, port: message.port };
+          const socket = net.createConnection(options, () => {
+            settled = true;
+            clearTimeout(timer);
+            this._attach(socket);
+            resolve();
+          });
+          socket.once('error', fail);
+          return;
+        }
+      });
+      proc.stderr.on('data', (data) => this.log(`🐍 Server: ${data.toString().trim()}`));
+      proc.on('error', fail);
+      proc.on('exit', (code) => {
+        fail(new Error(`Analysis server exited with code ${code}`));
+        if (this.process === proc) this._disconnect(new Error(`Analysis server exited with code ${code}`));
+      });
+    });
+  }
+
+  _attach(socket) {
+    this.socket = socket;
+    socket.removeAllListeners('error');
+    let text = '';
+    socket.on('data', (data) => {
+      text += data.toString();
+      const lines = text.split('\n');
+      text = lines.pop();
+      for (const line of lines) {
+        if (!line) continue;
+        let event;
+        try {
+          event = JSON.parse(line);
+        } catch (err) {
+          // 깨진 줄 이후로는 작업 이벤트를 믿을 수 없으므로 연결을 끊고 진행 중인 작업에 오류 전달
+          this._disconnect(new Error(`Invalid message from analysis server: ${err.message}`));
+          return;
+        }
+        this._dispatch(event);
+      }
+    });
+    socket.on('error', (err) => this._disconnect(err));
+    socket.on('close', () => this._disconnect(new Error('Connection to analysis server closed')));
+  }
+
+  _dispatch(event) {
+    if (event.job_id === undefined) {
+      // 작업에 속하지 않은 오류 (잘못된 요청 줄 등)는 가장 오래 기다린 요청에 전달
+      const handler = this.pending.shift();
+      if (handler) handler(event);
+      return;
+    }
+    if (event.event === 'queued') {
+      const handler = this.pending.shift();
+      if (handler) this.handlers.set(event.job_id, handler);
+    }
+    const handler = this.handlers.get(event.job_id);
+    if (!handler) return;
+    if (event.event === 'done' || event.event === 'error') this.handlers.delete(event.job_id);
+    handler(event);
+  }
+
+  // 연결이 끊기면 진행 중인 모든 작업에 오류 이벤트를 보내고 다음 start()에서 서버를 다시 띄움
+  _disconnect(err) {
+    if (this.socket) {
+      this.socket.destroy();
+      this.socket = null;
+    }
+    if (this.process) {
+      this.process.kill();
+      this.process = null;
+    }
+    const handlers = [...this.pending, ...this.handlers.values()];
+    this.pending = [];
+    this.handlers.clear();
+    handlers.forEach((handler) => handler({ event: 'error', error: err.message }));
+  }
+
+  // 분석 요청 전송 (onEvent는 이 작업의 queued ~ done/error 이벤트마다 호출)
+  analyze(request, onEvent) {
+    if (!this.connected) throw new Error('Analysis server is not running');
+    this.pending.push(onEvent);
+    this.socket.write(JSON.stringify({ type: 'analyze', ...request }) + '\n');
+  }
+
+  stop() {
+    if (this.process) {
+      const proc = this.process;
+      this.process = null;
+      proc.stdin.end(); // --exit-on-stdin-close로 정상 종료
+      setTimeout(() => proc.kill(), 2000).unref();
+    }
+    this._disconnect(new Error('Analysis server stopped'));
+  }
+}
+
+module.exports = { AnalysisServerClient };
@@ -0,0 +1,149 @@
+// 프레임 재조립기 스트레스 테스트
+//
+// 합성 프레임 스트림 (헤더 <IHH + 데이터)을 무작위 크기 청크로 잘라 FrameReassembler에 넣고
+// 모든 프레임이 순서대로 같은 내용으로 복원되는지 확인한 뒤, 파이프 크기 청크에서 이전 Buffer.concat 방식과 처리량을 비교합니다.
+//
+//     node benchmarks/frame_stress.js
+//     node benchmarks/frame_stress.js --frames 600 --width 1280 --height 720 --chunk 65536
+
+const { FrameReassembler, HEADER_SIZE } = require('../frame_reassembler');
+
+function parseArgs() {
+  const options = { frames: 300, width: 640, height: 360, chunk: 65536, seed: 1 };
+  const argv = process.argv.slice(2);
+  for (let i = 0; i < argv.length; i += 2) {
+    const name = argv[i].replace(/^--/, '');
+    if (!(name in options)) throw new Error(`Unknown option: ${argv[i]}`);
+    options[name] = Number(argv[i + 1]);
+  }
+  return options;
+}
+
+// 재현 가능한 의사 난수 (mulberry32)
+function random(seed) {
+  return () => {
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+// 프레임 번호로 채운 BGR 프레임과 헤더를 이어붙인 스트림 (frameSizes[i] = [width, height])
+function buildStream(frameSizes) {
+  const parts = [];
+  frameSizes.forEach(([width, height], index) => {
+    const header = Buffer.alloc(HEADER_SIZE);
+    const size = width * height * 3;
+    header.writeUInt32LE(size, 0);
+    header.writeUInt16LE(width, 4);
+    header.writeUInt16LE(height, 6);
+    const data = Buffer.alloc(size, index & 0xff);
+    if (size >= 4) data.writeUInt32LE(index, size - 4); // 마지막 바이트까지 복사됐는지 확인용
+    parts.push(header, data);
+  });
+  return Buffer.concat(parts);
+}
+
+// 스트림을 청크로 자르기 (chunkSize가 0이면 1 ~ 256KB 무작위, 헤더 중간에서도 잘림)
+function splitStream(stream, chunkSize, rand) {
+  const chunks = [];
+  for (let offset = 0; offset < stream.length;) {
+    const size = chunkSize || 1 + Math.floor(rand() ** 3 * 262144);
+    chunks.push(stream.subarray(offset, offset + size));
+    offset += size;
+  }
+  return chunks;
+}
+
+// 이전 main.js 방식 (청크마다 Buffer.concat, 헤더/프레임마다 slice)
+function legacyReassemble(chunks, onFrame) {
+  let frameBuffer = Buffer.alloc(0);
+  let expectedFrameSize = 0;
+  let frameWidth = 0;
+  let frameHeight = 0;
+  let headerReceived = false;
+  for (const data of chunks) {
+    frameBuffer = Buffer.concat([frameBuffer, data]);
+    while (frameBuffer.length > 0) {
+      if (!headerReceived && frameBuffer.length >= 8) {
+        expectedFrameSize = frameBuffer.readUInt32LE(0);
+        frameWidth = frameBuffer.readUInt16LE(4);
+        frameHeight = frameBuffer.readUInt16LE(6);
+        frameBuffer = frameBuffer.slice(8);
+        headerReceived = true;
+      }
+      if (headerReceived && frameBuffer.length >= expectedFrameSize) {
+        onFrame(frameBuffer.slice(0, expectedFrameSize), frameWidth, frameHeight);
+        frameBuffer = frameBuffer.slice(expectedFrameSize);
+        headerReceived = false;
+      } else {
+        break;
+      }
+    }
+  }
+}
+
+// 무작위 청크 + 해상도 변경 스트림의 복원 검사, 실패 수 반환
+function checkCorrectness(options) {
+  const rand = random(options.seed);
+  const sizes = [[options.width, options.height], [320, 180], [1, 1], [options.width, options.height]];
+  const frameSizes = Array.from({ length: 200 }, (_, i) => sizes[Math.floor(i / 50)]);
+  const stream = buildStream(frameSizes);
+  let failures = 0;
+  for (let trial = 0; trial < 5; trial++) {
+    let received = 0;
+    const reassembler = new FrameReassembler((data, width, height) => {
+      const [expectedWidth, expectedHeight] = frameSizes[received];
+      const ok = width === expectedWidth && height === expectedHeight &&
+        data.length === width * height * 3 && data[0] === (received & 0xff) &&
+        (data.length < 4 || data.readUInt32LE(data.length - 4) === received);
+      if (!ok) failures++;
+      received++;
+    });
+    for (const chunk of splitStream(stream, 0, rand)) reassembler.push(chunk);
+    if (received !== frameSizes.length) {
+      console.log(`❌ trial ${trial}: ${received}/${frameSizes.length} frames`);
+      failures++;
+    }
+  }
+  return failures;
+}
+
+function measure(name, run, frameCount, frameBytes) {
+  const start = process.hrtime.bigint();
+  const frames = run();
+  const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+  if (frames !== frameCount) throw new Error(`${name}: ${frames}/${frameCount} frames`);
+  console.log(`${name.padStart(12)} ${(frameCount / seconds).toFixed(0).padStart(8)} fps ` +
+              `${(frameCount * frameBytes / seconds / 1e9).toFixed(2).padStart(6)} GB/s`);
+  return seconds;
+}
+
+function main() {
+  const options = parseArgs();
+  const failures = checkCorrectness(options);
+  console.log(failures ? `❌ ${failures} frames reassembled incorrectly` : 'Random chunking: all frames intact');
+
+  const frameBytes = options.width * options.height * 3;
+  const stream = buildStream(Array.from({ length: options.frames }, () => [options.width, options.height]));
+  const chunks = splitStream(stream, options.chunk, null);
+  console.log(`${options.frames} frames of ${frameBytes} bytes in ${options.chunk}-byte chunks`);
+
+  let checksum = 0;
+  const consume = (data) => { checksum += data[data.length - 1]; };
+  const legacy = measure('concat', () => {
+    let frames = 0;
+    legacyReassemble(chunks, (data) => { consume(data); frames++; });
+    return frames;
+  }, options.frames, frameBytes);
+  const reassembler = new FrameReassembler(consume);
+  const ring = measure('ring buffer', () => {
+    chunks.forEach((chunk) => reassembler.push(chunk));
+    return reassembler.frames;
+  }, options.frames, frameBytes);
+  console.log(`speedup ${(legacy / ring).toFixed(1)}x, ring buffer allocations: ${reassembler.allocations}`);
+  process.exit(failures ? 1 : 0);
+}
+
+main();
@@ -0,0 +1,83 @@
+"""시작 시간 벤치마크
+
+`python -X importtime`으로 main.py 임포트 비용을 모듈별로 측정하고,
+`main.py --help` (또는 패키징된 실행 파일) 시작 시간을 반복 측정해 중앙값을 출력합니다.
+
+    python benchmarks/startup_bench.py
+    python benchmarks/startup_bench.py --exe dist/soccer_detector --max-seconds 1.5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+def measure_import_costs(module: str = "main") -> list:
+    """-X importtime 출력에서 (누적 시간 ms, 자체 시간 ms, 모듈 이름) 목록 반환"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    costs = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # 헤더 줄
+        self_us, cumulative_us, name = int(fields[0]), int(fields[1]), fields[2]
+        depth = (len(name) - len(name.lstrip())) // 2  # 들여쓰기로 임포트 깊이 표시
+        costs.append((cumulative_us / 1000, self_us / 1000, name.strip(), depth))
+    return costs
+
+def measure_startup(command: list, repeats: int) -> list:
+    """명령 실행 시간 (초)을 repeats번 측정"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup time and import cost benchmark')
+    parser.add_argument('--module', default='main', help='Module to profile with -X importtime')
+    parser.add_argument('--top', type=int, default=15, help='Number of top-level imports to list')
+    parser.add_argument('--repeats', type=int, default=5, help='Number of startup runs to time')
+    parser.add_argument('--exe', help='Packaged executable to time instead of "python main.py"')
+    parser.add_argument('--max-seconds', type=float, help='Exit with status 1 if the median startup exceeds this')
+    args = parser.parse_args()
+
+    costs = measure_import_costs(args.module)
+    total_ms = next((c[0] for c in costs if c[2] == args.module), sum(c[1] for c in costs))
+    top_level = sorted((c for c in costs if c[3] == 1), reverse=True)
+    print(f"import {args.module}: {total_ms:.1f} ms ({len(costs)} modules)")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_ms, self_ms, name, _ in top_level[:args.top]:
+        print(f"{cumulative_ms:14.1f} {self_ms:9.1f}  {name}")
+
+    # 처리 경로에 포함되면 안 되는 GUI/플롯 모듈 확인
+    deferred = [name for _, _, name, _ in costs if name.split('.')[0] in ('matplotlib', 'tkinter', 'PyQt5')]
+    if deferred:
+        print(f"⚠️ GUI/plotting modules imported at startup: {sorted(set(n.split('.')[0] for n in deferred))}")
+
+    if args.exe:
+        command = [os.path.abspath(args.exe), "--help"]
+    else:
+        command = [sys.executable, str(REPO_ROOT / "main.py"), "--help"]
+    timings = measure_startup(command, args.repeats)
+    median = statistics.median(timings)
+    print(f"startup ({' '.join(Path(c).name for c in command)}): median {median:.3f}s, "
+          f"min {min(timings):.3f}s, max {max(timings):.3f}s over {args.repeats} runs")
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"❌ Median startup {median:.3f}s exceeds {args.max_seconds:.3f}s")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
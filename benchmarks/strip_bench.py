@@ -0,0 +1,104 @@
+"""프레임 내 띠 병렬 추출 벤치마크
+
+선수 마스크 생성 + 모폴로지 + 후보 추출 (main.extract_player_boxes)의 프레임당 지연을
+전체 프레임 한 번 처리와 StripExtractor 띠 병렬 처리로 해상도별로 측정하고, 두 결과가 같은지 확인합니다.
+
+    python benchmarks/strip_bench.py
+    python benchmarks/strip_bench.py --video match.mp4 --strips 2 4 8 --sizes 640x360 1920x1080
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from main import extract_player_boxes
+from tools.color_utils import bgr_range
+from tools.detection import StripExtractor
+
+GRASS_BGR = (40, 140, 40)
+TEAM_COLORS_BGR = [[0, 0, 230], [230, 0, 0]]
+
+def synthetic_frames(count: int, seed: int = 0) -> list:
+    """잔디 위 선수 blob과 관중석 잡음이 있는 1920x1080 프레임"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(count):
+        frame = np.empty((1080, 1920, 3), dtype=np.uint8)
+        frame[:] = GRASS_BGR
+        frame[:200] = rng.integers(0, 255, (200, 1920, 3), dtype=np.uint8)
+        for k in range(22):
+            x, y = int(rng.integers(0, 1880)), int(rng.integers(220, 1000))
+            cv2.rectangle(frame, (x, y), (x + 30, y + 80), TEAM_COLORS_BGR[k % 2], -1)
+        frames.append(frame)
+    return frames
+
+def video_frames(path: str, count: int) -> list:
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise RuntimeError(f"Could not read frames from {path}")
+    return frames
+
+def run(frames: list, strip_extractor, repeats: int):
+    """프레임당 지연 (ms) 목록과 마지막 반복의 추출 결과"""
+    lower_green, upper_green = bgr_range(*GRASS_BGR, tolerance=60)
+    timings, results = [], []
+    for _ in range(repeats):
+        results = []
+        for frame in frames:
+            start = time.perf_counter()
+            mask_not_green = cv2.bitwise_not(cv2.inRange(frame, lower_green, upper_green))
+            results.append(extract_player_boxes(frame, mask_not_green, TEAM_COLORS_BGR, GRASS_BGR,
+                                                "components", strip_extractor))
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings, results
+
+def main():
+    parser = argparse.ArgumentParser(description='Strip-parallel player mask extraction benchmark')
+    parser.add_argument('--video', help='Video to take frames from (default: synthetic frames)')
+    parser.add_argument('--frames', type=int, default=30, help='Number of frames')
+    parser.add_argument('--repeats', type=int, default=3, help='Passes over the frames')
+    parser.add_argument('--strips', type=int, nargs='+', default=[2, 4, 8], help='Strip counts to compare')
+    parser.add_argument('--sizes', nargs='+', default=['640x360', '1280x720', '1920x1080'],
+                        help='Processing resolutions (WIDTHxHEIGHT)')
+    args = parser.parse_args()
+
+    source = video_frames(args.video, args.frames) if args.video else synthetic_frames(args.frames)
+    mismatches = 0
+    print(f"OpenCV threads: {cv2.getNumThreads()}")
+    print(f"{'size':>10} {'strips':>6} {'median ms':>10} {'p95 ms':>8} {'speedup':>8}")
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split('x'))
+        frames = [cv2.resize(frame, (width, height)) for frame in source]
+        base_timings, base_results = run(frames, None, args.repeats)
+        base_median = statistics.median(base_timings)
+        print(f"{size:>10} {1:>6} {base_median:10.2f} {np.percentile(base_timings, 95):8.2f} {1.0:8.2f}")
+        for strips in args.strips:
+            strip_extractor = StripExtractor(strips)
+            try:
+                timings, results = run(frames, strip_extractor, args.repeats)
+            finally:
+                strip_extractor.close()
+            mismatches += sum(result != base for result, base in zip(results, base_results))
+            median = statistics.median(timings)
+            print(f"{size:>10} {strips:>6} {median:10.2f} {np.percentile(timings, 95):8.2f} "
+                  f"{base_median / median:8.2f}")
+
+    if mismatches:
+        print(f"❌ {mismatches} frames differ from whole-frame extraction")
+        sys.exit(1)
+    print("Strip results identical to whole-frame extraction")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""추적기 마이크로 벤치마크
+
+감지 없이 추적 세션 (TrackingSession)만 합성 감지 스트림 (선수 수, 잡음 blob, 공 후보 수 조절)
+또는 --record-detections로 기록한 감지 로그로 구동해 프레임당 추적 시간을 측정합니다.
+규모를 늘려가며 측정한 시간에 log-log 직선을 맞춰 주요 경로 (할당, 충돌 해결, 정리 등)별 증가 차수를
+출력하므로, 이차 경로를 최적화했을 때 기울기 변화로 확인할 수 있습니다.
+--sessions를 주면 여러 세션을 순차 실행했을 때와 스레드 (또는 --processes로 프로세스) 풀에서 동시에
+실행했을 때의 시간을 비교합니다 (결과가 같은지는 tests/test_tracking_session.py에서 확인).
+
+    python benchmarks/tracker_bench.py
+    python benchmarks/tracker_bench.py --log run.detlog
+    python benchmarks/tracker_bench.py --scales 22 44 88 176 --max-slope 2.2
+    python benchmarks/tracker_bench.py --scales --sessions 8 --workers 4
+"""
+import argparse
+import statistics
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tools.tracking_session import TrackingSession
+from tools.detection_log import DetectionLogReader
+
+FRAME_WIDTH, FRAME_HEIGHT = 640, 360
+GRASS_COLOR = (60, 140, 60)
+CLASS_NAMES = {1: "team1", 2: "team2"}
+FPS = 25
+
+# 시간을 따로 재는 tracker 내부 경로 (세션의 관리자, 메소드 이름)
+HOT_PATHS = [
+    ("players", "_predicted_distance_matrix"),
+    ("players", "_assign_bboxes_to_trackers"),
+    ("players", "_resolve_conflicts"),
+    ("players", "_update_tracker_positions"),
+    ("players", "_create_new_trackers"),
+    ("players", "_cleanup_trackers"),
+    ("ball", "_filter_candidates_near_players"),
+    ("ball", "_assign_candidates_to_trackers"),
+    ("ball", "_create_new_trackers"),
+    ("ball", "_update_possession"),
+]
+
+def synthetic_stream(num_players: int = 22, num_clutter: int = 4, num_ball_candidates: int = 8,
+                     num_frames: int = 300, miss_rate: float = 0.05, seed: int = 0):
+    """두 팀 선수가 등속으로 움직이는 합성 감지 스트림 (감지 누락, 잡음 blob, 공 후보 잡음 포함)"""
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((20, 20), (FRAME_WIDTH - 40, FRAME_HEIGHT - 60), size=(num_players, 2))
+    velocities = rng.normal(0, 1.5, size=(num_players, 2))
+    sizes = rng.integers((12, 28), (20, 44), size=(num_players, 2))
+    teams = np.arange(num_players) % 2 + 1
+    ball = np.array([FRAME_WIDTH / 2, FRAME_HEIGHT / 2])
+    ball_velocity = rng.normal(0, 4, size=2)
+    grass_map = np.ones((FRAME_HEIGHT, FRAME_WIDTH), dtype=bool)
+
+    for frame_number in range(1, num_frames + 1):
+        positions += velocities
+        # 화면 가장자리에서 튕김
+        for axis, limit in ((0, FRAME_WIDTH - 20), (1, FRAME_HEIGHT - 44)):
+            out = (positions[:, axis] < 0) | (positions[:, axis] > limit)
+            velocities[out, axis] *= -1
+            positions[:, axis] = np.clip(positions[:, axis], 0, limit)
+        velocities += rng.normal(0, 0.2, size=velocities.shape)
+
+        detected_by_class = {1: [], 2: []}
+        jitter = rng.integers(-2, 3, size=(num_players, 2))
+        visible = rng.random(num_players) >= miss_rate
+        for i in np.flatnonzero(visible):
+            x, y = (positions[i] + jitter[i]).astype(int)
+            detected_by_class[int(teams[i])].append((int(x), int(y), int(sizes[i, 0]), int(sizes[i, 1])))
+        for _ in range(num_clutter):
+            x, y = rng.integers(0, FRAME_WIDTH - 20), rng.integers(0, FRAME_HEIGHT - 30)
+            detected_by_class[int(rng.integers(1, 3))].append((int(x), int(y), 10, 20))
+
+        ball += ball_velocity
+        if not (0 <= ball[0] < FRAME_WIDTH and 0 <= ball[1] < FRAME_HEIGHT):
+            ball_velocity *= -1
+            ball = np.clip(ball, 0, (FRAME_WIDTH - 1, FRAME_HEIGHT - 1))
+        ball_bboxes = [(int(ball[0]) - 3, int(ball[1]) - 3, 6, 6)]
+        for _ in range(max(num_ball_candidates - 1, 0)):
+            x, y = rng.integers(0, FRAME_WIDTH - 6), rng.integers(0, FRAME_HEIGHT - 6)
+            ball_bboxes.append((int(x), int(y), 6, 6))
+
+        yield {
+            "frame_number": frame_number,
+            "is_cut": False,
+            "skipped": False,
+            "camera_shift": (0.0, 0.0),
+            "detected_by_class": detected_by_class,
+            "ball_bboxes": ball_bboxes,
+            "grass_map": grass_map,
+            "descriptors": None,
+        }
+
+def instrument(manager, name: str, path_times: dict):
+    """manager.name 호출 시간을 path_times에 누적하도록 인스턴스 메소드 교체"""
+    method = getattr(manager, name)
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            path_times[name] += time.perf_counter() - start
+
+    setattr(manager, name, timed)
+
+def run_stream(records, frame_size=(FRAME_WIDTH, FRAME_HEIGHT), grass_color=GRASS_COLOR,
+               tracker_debug_mode: bool = False, profile_paths: bool = True) -> dict:
+    """감지 스트림으로 추적 세션을 구동하고 프레임당 시간과 경로별 누적 시간 반환"""
+    session = TrackingSession(*frame_size, grass_color, CLASS_NAMES, FPS, tracker_debug_mode=tracker_debug_mode)
+    path_times = {"players": defaultdict(float), "ball": defaultdict(float)}
+    if profile_paths:
+        for owner, name in HOT_PATHS:
+            manager = session.player_manager if owner == "players" else session.ball_manager
+            instrument(manager, name, path_times[owner])
+
+    frame_times, tracker_counts, ball_counts = [], [], []
+    for record in records:
+        if record["skipped"]:
+            session.step(record)
+            continue
+        start = time.perf_counter()
+        tracking = session.step(record)
+        frame_times.append(time.perf_counter() - start)
+        tracker_counts.append(len(tracking["player_snapshot"]["tracker_ids"]))
+        ball_counts.append(session.ball_manager.get_tracker_count())
+
+    num_frames = max(len(frame_times), 1)
+    return {
+        "frames": len(frame_times),
+        "frame_ms": [t * 1000 for t in frame_times],
+        "mean_trackers": float(np.mean(tracker_counts)) if tracker_counts else 0.0,
+        "mean_ball_trackers": float(np.mean(ball_counts)) if ball_counts else 0.0,
+        "path_ms": {f"{owner}.{name}": path_times[owner][name] * 1000 / num_frames for owner, name in HOT_PATHS},
+    }
+
+def summarize(label: str, result: dict):
+    """프레임당 시간 요약 출력"""
+    frame_ms = result["frame_ms"]
+    if not frame_ms:
+        print(f"{label}: no frames")
+        return
+    p95 = float(np.percentile(frame_ms, 95))
+    print(f"{label}: {result['frames']} frames, mean {statistics.mean(frame_ms):.3f} ms, "
+          f"median {statistics.median(frame_ms):.3f} ms, p95 {p95:.3f} ms, "
+          f"{1000 / statistics.mean(frame_ms):.0f} FPS, "
+          f"trackers {result['mean_trackers']:.1f} players / {result['mean_ball_trackers']:.1f} ball")
+
+def log_log_slope(sizes, times) -> float:
+    """log(시간) = slope * log(규모) + c 직선의 기울기 (1: 선형, 2: 이차)"""
+    sizes, times = np.asarray(sizes, dtype=np.float64), np.asarray(times, dtype=np.float64)
+    valid = times > 0
+    if valid.sum() < 2:
+        return float("nan")
+    return float(np.polyfit(np.log(sizes[valid]), np.log(times[valid]), 1)[0])
+
+def scaling_sweep(scales, num_frames: int, repeats: int, seed: int):
+    """선수 수 (잡음 blob, 공 후보도 비례)를 늘려가며 경로별 프레임당 시간과 증가 차수 측정"""
+    rows = []
+    for scale in scales:
+        best = None
+        for repeat in range(repeats):
+            stream = list(synthetic_stream(num_players=scale, num_clutter=max(scale // 5, 1),
+                                           num_ball_candidates=max(scale // 3, 1), num_frames=num_frames,
+                                           seed=seed + repeat))
+            result = run_stream(stream)
+            if best is None or statistics.mean(result["frame_ms"]) < statistics.mean(best["frame_ms"]):
+                best = result  # 반복 중 가장 빠른 측정 (잡음 제거)
+        rows.append((scale, best))
+
+    # 열 이름: p.=선수 관리자, b.=공 관리자 메소드
+    columns = [f"{name[0]}.{name.split('.')[1].strip('_')}"[:14] for name in rows[0][1]["path_ms"]]
+    print(f"\n{'players':>8} {'trackers':>9} {'frame ms':>9}  " + "  ".join(f"{c:>14}" for c in columns))
+    for scale, result in rows:
+        print(f"{scale:8d} {result['mean_trackers']:9.1f} {statistics.mean(result['frame_ms']):9.3f}  "
+              + "  ".join(f"{ms:14.4f}" for ms in result["path_ms"].values()))
+
+    sizes = [result["mean_trackers"] for _, result in rows]
+    slopes = {"frame": log_log_slope(sizes, [statistics.mean(r["frame_ms"]) for _, r in rows])}
+    for name in rows[0][1]["path_ms"]:
+        slopes[name] = log_log_slope(sizes, [r["path_ms"][name] for _, r in rows])
+    print("\nScaling exponent vs player tracker count (log-log slope; 1 = linear, 2 = quadratic):")
+    for name, slope in slopes.items():
+        print(f"  {name:45s} {slope:5.2f}")
+    return slopes
+
+def concurrency_timing(streams, workers: int, use_processes: bool):
+    """스트림별 세션을 순차 실행한 시간과 풀에서 동시에 실행한 시간 출력"""
+    start = time.perf_counter()
+    for stream in streams:
+        run_stream(stream, profile_paths=False)
+    sequential = time.perf_counter() - start
+
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    start = time.perf_counter()
+    with executor_class(max_workers=workers) as pool:
+        list(pool.map(run_stream, streams))
+    concurrent = time.perf_counter() - start
+
+    kind = "processes" if use_processes else "threads"
+    print(f"\n{len(streams)} sessions sequential: {sequential:.2f}s; "
+          f"on {workers} {kind}: {concurrent:.2f}s ({sequential / concurrent:.2f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Tracker-only benchmark on synthetic or recorded detection streams')
+    parser.add_argument('--log', help='Detection log recorded with main.py --record-detections')
+    parser.add_argument('--players', type=int, default=22, help='Synthetic players per frame')
+    parser.add_argument('--clutter', type=int, default=4, help='Synthetic false player blobs per frame')
+    parser.add_argument('--ball-candidates', type=int, default=8, help='Synthetic ball candidates per frame')
+    parser.add_argument('--frames', type=int, default=200, help='Synthetic frames per stream')
+    parser.add_argument('--scales', type=int, nargs='*', default=[11, 22, 44, 88, 176],
+                        help='Player counts for the scaling sweep (clutter and ball candidates scale along)')
+    parser.add_argument('--repeats', type=int, default=2, help='Runs per scale (fastest is kept)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-slope', type=float,
+                        help='Exit with status 1 if any hot path scales worse than this exponent')
+    parser.add_argument('--sessions', type=int, default=0,
+                        help='Time this many synthetic sessions run sequentially and concurrently')
+    parser.add_argument('--workers', type=int, default=4, help='Pool size for --sessions')
+    parser.add_argument('--processes', action='store_true', help='Use a process pool instead of threads for --sessions')
+    args = parser.parse_args()
+
+    if args.log:
+        log = DetectionLogReader(args.log)
+        result = run_stream(log, (log.frame_width, log.frame_height), tuple(log.header["grass_color"]),
+                            tracker_debug_mode=log.header["tracker_debug_mode"])
+        summarize(f"log {args.log}", result)
+        for name, ms in result["path_ms"].items():
+            print(f"  {name:45s} {ms:8.4f} ms/frame")
+
+    stream = list(synthetic_stream(args.players, args.clutter, args.ball_candidates, args.frames, seed=args.seed))
+    summarize(f"synthetic ({args.players} players, {args.clutter} clutter, {args.ball_candidates} ball candidates)",
+              run_stream(stream, profile_paths=False))
+
+    if args.scales:
+        slopes = scaling_sweep(args.scales, args.frames, args.repeats, args.seed)
+        if args.max_slope is not None:
+            measured = {name: slope for name, slope in slopes.items() if not np.isnan(slope)}
+            worst = max(measured, key=measured.get)
+            if measured[worst] > args.max_slope:
+                print(f"❌ {worst} scales with exponent {measured[worst]:.2f} > {args.max_slope:.2f}")
+                sys.exit(1)
+
+    if args.sessions:
+        streams = [list(synthetic_stream(args.players, args.clutter, args.ball_candidates, args.frames,
+                                         seed=args.seed + i)) for i in range(args.sessions)]
+        concurrency_timing(streams, args.workers, args.processes)
+
+if __name__ == '__main__':
+    main()
@@ -38,6 +38,9 @@ def build_executable():
         "--console",  # 콘솔 앱으로 생성
         "--name", "soccer_detector",
         "--add-data", f"{tools_dir}{os.pathsep}tools",  # tools 폴더 포함
+        "--hidden-import", "server",  # main.py --serve로 실행하는 상주 분석 서버 (main()에서 지연 임포트)
+        "--exclude-module", "matplotlib",  # 시각화 전용 (tools/color_display.py) - 실행 파일 크기와 압축 해제 시간 절약
+        "--exclude-module", "tkinter",
         str(main_py)
     ]
     
@@ -1,6 +1,11 @@
+import os
+import sys
 import cv2
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.kernels import spectator_cutoffs
+
 def apply_blur(image_path, lower_green=(30, 40, 0), upper_green=(100, 255, 255)):
     # 이미지 로드
     img = image_path
@@ -30,31 +35,13 @@ def remove_spectator_region(mask_person_shape, n):
     """
     height, width = mask_person_shape.shape
     slice_width = width // n
-    cutoff_rows = []
 
-    for i in range(n):
-        # Determine column range for this slice
+    # 슬라이스별 경계 행은 tools/kernels.py 커널로 계산 (Numba가 있으면 JIT, 없으면 NumPy)
+    cutoff_rows = spectator_cutoffs(mask_person_shape, n).tolist()
+    for i, slice_cutoff in enumerate(cutoff_rows):
         start_col = i * slice_width
-        # Ensure last slice goes to the right edge
         end_col = (i + 1) * slice_width if i < n - 1 else width
-        current_slice = mask_person_shape[:, start_col:end_col]
-        white_threshold = int((end_col - start_col) * 0.3)
-
-        slice_cutoff = None
-        for row_idx in range(height):
-            # Count white pixels in this row of the slice
-            white_count = np.count_nonzero(current_slice[row_idx] == 255)
-            if white_count <= white_threshold:
-                slice_cutoff = row_idx
-                break
-            # Fill this row in the slice completely with black
-            mask_person_shape[row_idx, start_col:end_col] = 0
-
-        if slice_cutoff is None:
-            slice_cutoff = height
-
         # Mask all rows above the cutoff within this slice
         mask_person_shape[:slice_cutoff, start_col:end_col] = 0
-        cutoff_rows.append(slice_cutoff)
 
     return mask_person_shape, cutoff_rows
\ No newline at end of file
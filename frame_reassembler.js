@@ -0,0 +1,105 @@
+// Python stdout 프레임 스트림 (헤더 <IHH: 바이트 수, 가로, 세로 + BGR 데이터) 재조립기
+//
+// 청크마다 Buffer.concat/slice로 버퍼를 새로 만들지 않고, 미리 할당한 프레임 크기 슬롯 링에
+// 청크를 바로 복사합니다. 완성된 프레임은 onFrame(data, width, height)로 넘기며, data는 슬롯의 뷰이므로
+// 이후 slots - 1 프레임이 더 들어올 때까지만 유효합니다 (webContents.send처럼 바로 복사하는 소비자 기준).
+
+const HEADER_SIZE = 8;
+
+class FrameReassembler {
+  constructor(onFrame, { slots = 2, maxFrameSize = 64 * 1024 * 1024 } = {}) {
+    this.onFrame = onFrame;
+    this.maxFrameSize = maxFrameSize; // 손상된 헤더로 거대한 버퍼를 할당하지 않도록 제한
+    this.header = Buffer.alloc(HEADER_SIZE); // 청크 경계에 걸친 헤더 조립용
+    this.slots = new Array(Math.max(1, slots)).fill(null); // 프레임 크기 버퍼 링 (크기가 커질 때만 재할당)
+    this.slotIndex = 0;
+    this.reset();
+    // 통계 (디버그 로그용)
+    this.frames = 0;
+    this.bytes = 0;
+    this.chunks = 0;
+    this.allocations = 0;
+  }
+
+  // 스트림 상태 초기화 (프로세스 재시작 시)
+  reset() {
+    this.headerFilled = 0;
+    this.frameSize = 0;
+    this.frameFilled = 0;
+    this.width = 0;
+    this.height = 0;
+    this.current = null;
+  }
+
+  // 다음 프레임을 받을 슬롯 (필요하면 더 큰 버퍼로 교체)
+  _nextSlot(size) {
+    this.slotIndex = (this.slotIndex + 1) % this.slots.length;
+    let slot = this.slots[this.slotIndex];
+    if (!slot || slot.length < size) {
+      slot = Buffer.allocUnsafe(size);
+      this.slots[this.slotIndex] = slot;
+      this.allocations++;
+    }
+    return slot;
+  }
+
+  // stdout 청크 하나 처리 (완성된 프레임마다 onFrame 호출)
+  push(chunk) {
+    this.chunks++;
+    this.bytes += chunk.length;
+    let offset = 0;
+    while (offset < chunk.length) {
+      if (this.current === null) {
+        // 헤더 조립
+        const take = Math.min(HEADER_SIZE - this.headerFilled, chunk.length - offset);
+        chunk.copy(this.header, this.headerFilled, offset, offset + take);
+        this.headerFilled += take;
+        offset += take;
+        if (this.headerFilled < HEADER_SIZE) break;
+
+        this.frameSize = this.header.readUInt32LE(0);
+        this.width = this.header.readUInt16LE(4);
+        this.height = this.header.readUInt16LE(6);
+        this.headerFilled = 0;
+        if (this.frameSize > this.maxFrameSize) {
+          const size = this.frameSize;
+          this.reset();
+          throw new Error(`Frame size ${size} exceeds limit ${this.maxFrameSize} (corrupt stream?)`);
+        }
+        this.current = this._nextSlot(this.frameSize);
+        this.frameFilled = 0;
+      }
+
+      // 프레임 데이터를 슬롯 위치에 바로 복사
+      const take = Math.min(this.frameSize - this.frameFilled, chunk.length - offset);
+      chunk.copy(this.current, this.frameFilled, offset, offset + take);
+      this.frameFilled += take;
+      offset += take;
+
+      if (this.frameFilled === this.frameSize) {
+        const frame = this.current.subarray(0, this.frameSize);
+        this.current = null;
+        this.frames++;
+        this.onFrame(frame, this.width, this.height);
+      }
+    }
+  }
+}
+
+// 최대 intervalMs마다 한 번만 log를 호출하는 함수 반환 (사이에 버린 메시지 수를 덧붙임)
+function rateLimited(log, intervalMs = 1000) {
+  let last = -Infinity;
+  let dropped = 0;
+  return (message) => {
+    const now = Date.now();
+    if (now - last < intervalMs) {
+      dropped++;
+      return;
+    }
+    log(dropped > 0 ? `${message} (+${dropped} suppressed)` : message);
+    last = now;
+    dropped = 0;
+  };
+}
+
+module.exports = { FrameReassembler, rateLimited, HEADER_SIZE };
@@ -0,0 +1,113 @@
+"""다중 카메라 추적 결과 통합
+
+경기장의 서로 다른 구역을 찍는 고정 카메라 영상들을 카메라마다 별도 프로세스에서 process_video로 분석한 뒤,
+각 카메라의 보정으로 선수 위치를 경기장 좌표에 투영해 하나의 전역 track 집합 (fused_tracks.json)으로 합칩니다.
+
+    python fuse_cameras.py --camera left left.mp4 left_calibration.json \\
+                           --camera right right.mp4 right_calibration.json \\
+                           --team1-color 255 0 0 --team2-color 0 0 255 --output-dir output/fused
+    # 이미 분석한 결과만 합치기
+    python fuse_cameras.py --tracks left output/left/tracking_data.json left_calibration.json \\
+                           --tracks right output/right/tracking_data.json right_calibration.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.pitch_calibration import PitchCalibration
+from tools.multicam_fusion import CameraTracks, fuse_camera_tracks
+from tools.job_cache import default_cache_dir
+
+def analyze_camera(name, video_path, calibration_path, output_dir, options):
+    """카메라 하나의 영상 분석 (작업 프로세스에서 실행), tracking_data.json 경로 반환"""
+    from main import process_video  # 작업 프로세스에서만 분석 파이프라인 임포트
+
+    camera_dir = os.path.join(output_dir, name)
+    os.makedirs(camera_dir, exist_ok=True)
+    start = time.perf_counter()
+    json_path = process_video(video_path, calibration_path=calibration_path,
+                              output_path=os.path.join(camera_dir, "tracked_video.mp4"),
+                              frame_sink=lambda frame: None, show_window=False, **options)
+    if json_path is None:
+        raise RuntimeError(f"Camera {name}: could not analyze {video_path}")
+    print(f"Camera {name}: analyzed in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return json_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuse player tracks from several fixed cameras on one pitch')
+    parser.add_argument('--camera', nargs=3, action='append', default=[], metavar=('NAME', 'VIDEO', 'CALIBRATION'),
+                        help='Camera to analyze with its pitch calibration JSON; repeatable')
+    parser.add_argument('--tracks', nargs=3, action='append', default=[], metavar=('NAME', 'TRACKING_JSON', 'CALIBRATION'),
+                        help='Already analyzed camera (tracking_data.json) to fuse without reprocessing; repeatable')
+    parser.add_argument('--offset', nargs=2, action='append', default=[], metavar=('NAME', 'FRAMES'),
+                        help='Video frames a camera started after the others (negative if earlier), '
+                             'used to synchronize it; repeatable')
+    parser.add_argument('--team1-color', nargs=3, type=int, default=[255, 0, 0], help='Team 1 color (RGB)')
+    parser.add_argument('--team2-color', nargs=3, type=int, default=[0, 0, 255], help='Team 2 color (RGB)')
+    parser.add_argument('--class-color', nargs=4, action='append', default=[], metavar=('NAME', 'R', 'G', 'B'),
+                        help='Extra color class to track in every camera; repeatable')
+    parser.add_argument('--camera-motion', action='store_true',
+                        help='Enable camera pan compensation (off by default for fixed cameras)')
+    parser.add_argument('--output-dir', default='output/fused', help='Output directory (one subdirectory per camera)')
+    parser.add_argument('--jobs', type=int, help='Number of camera processes to run at once (default: one per camera)')
+    parser.add_argument('--gate', type=float, default=1.5,
+                        help='Maximum pitch distance in meters between observations of the same player in two cameras')
+    parser.add_argument('--handoff-gate', type=float, default=3.0,
+                        help='Maximum pitch distance in meters to continue a lost global track in another camera')
+    parser.add_argument('--max-lost-frames', type=int, default=50,
+                        help='Frames a global track may be unseen and still be continued')
+    parser.add_argument('--no-cache', action='store_true', help='Always reprocess the videos without the result cache')
+    args = parser.parse_args()
+
+    names = [name for name, _, _ in args.camera + args.tracks]
+    if len(names) < 2:
+        parser.error("At least two cameras (--camera or --tracks) are required")
+    if len(set(names)) != len(names):
+        parser.error("Camera names must be unique")
+    try:
+        offsets = {name: int(frames) for name, frames in args.offset}
+    except ValueError:
+        parser.error("--offset takes a whole number of video frames")
+    unknown = set(offsets) - set(names)
+    if unknown:
+        parser.error(f"--offset for unknown cameras: {sorted(unknown)}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    tracking_paths = {name: path for name, path, _ in args.tracks}
+    calibration_paths = {name: path for name, _, path in args.camera + args.tracks}
+
+    # 카메라별 파이프라인을 각자 프로세스에서 실행
+    if args.camera:
+        options = {
+            "team1_color_rgb": tuple(args.team1_color),
+            "team2_color_rgb": tuple(args.team2_color),
+            "extra_classes": [(name, (int(r), int(g), int(b))) for name, r, g, b in args.class_color],
+            "camera_motion": args.camera_motion,
+            "cache_dir": None if args.no_cache else default_cache_dir(),
+        }
+        with ProcessPoolExecutor(max_workers=args.jobs or len(args.camera)) as pool:
+            futures = {name: pool.submit(analyze_camera, name, video_path, calibration_path, args.output_dir, options)
+                       for name, video_path, calibration_path in args.camera}
+            for name, future in futures.items():
+                tracking_paths[name] = future.result()
+
+    cameras = [CameraTracks(name, tracking_paths[name], PitchCalibration.load(calibration_paths[name]),
+                            offsets.get(name, 0)) for name in names]
+    start = time.perf_counter()
+    try:
+        fused = fuse_camera_tracks(cameras, args.gate, args.handoff_gate, args.max_lost_frames)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Fused {len(cameras)} cameras: {len(fused['frames'])} frames, {len(fused['tracks'])} global tracks "
+          f"in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    output_path = os.path.join(args.output_dir, "fused_tracks.json")
+    with open(output_path, 'w') as f:
+        json.dump(fused, f, indent=2)
+    print(f"Fused tracks saved to: {output_path}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,8 @@ const { app, BrowserWindow, ipcMain, dialog, shell } = require('electron');
 const path = require('path');
 const fs = require('fs');
 const { spawn } = require('child_process');
+const { FrameReassembler, rateLimited } = require('./frame_reassembler');
+const { AnalysisServerClient } = require('./analysis_client');
 
 let mainWindow;
 let analyzeWindow;
@@ -67,6 +69,17 @@ app.whenReady().then(() => {
 
   // 앱 시작 시 한 번만 output 폴더 생성
   getOutputDir();
+
+  // 첫 분석도 서버 시작을 기다리지 않도록 미리 실행
+  try {
+    getAnalysisServer().start().catch((err) => console.error('Analysis server unavailable:', err.message));
+  } catch (err) {
+    console.error('Analysis server unavailable:', err.message);
+  }
+});
+
+app.on('will-quit', () => {
+  if (analysisServer) analysisServer.stop();
 });
 
 app.on('window-all-closed', () => {
@@ -94,6 +107,181 @@ ipcMain.handle('save-video', async (event, buffer) => {
   }
 });
 
+// Python 실행 명령 (패키징: 번들된 실행 파일, 개발: python + main.py)
+function findPythonCommand(log) {
+  if (!app.isPackaged) {
+    return {
+      command: process.platform === 'win32' ? 'python' : 'python3',
+      args: [path.join(__dirname, 'main.py')]
+    };
+  }
+
+  const executableName = process.platform === 'win32' ? 'soccer_detector.exe' : 'soccer_detector';
+
+  // 여러 가능한 경로를 시도 (패키징된 앱에서)
+  const possiblePaths = [
+    // asar 압축 해제된 파일들의 위치
+    path.join(process.resourcesPath, 'app.asar.unpacked', 'python-dist', executableName),
+    // 리소스 폴더 직접 접근
+    path.join(process.resourcesPath, 'python-dist', executableName),
+    // 앱 번들 내부
+    path.join(process.resourcesPath, 'app', 'python-dist', executableName),
+    // 백업 경로들
+    path.join(__dirname, 'python-dist', executableName),
+    path.join(app.getAppPath(), 'python-dist', executableName)
+  ];
+
+  for (const possiblePath of possiblePaths) {
+    log(`Checking: ${possiblePath}`);
+    if (fs.existsSync(possiblePath)) {
+      log(`✓ Found Python executable at: ${possiblePath}`);
+      return { command: possiblePath, args: [] };
+    }
+  }
+
+  log('❌ Python executable not found in any of these paths:');
+  possiblePaths.forEach(p => log(`  - ${p}`));
+  throw new Error('Python executable not found');
+}
+
+// 비디오 경로를 절대 경로로 변환
+function resolveVideoPath(videoPath, outputDir) {
+  if (path.isAbsolute(videoPath)) {
+    return videoPath;
+  } else if (videoPath.startsWith('output/')) {
+    // videoPath가 'output/input_video.mp4' 형태인 경우
+    return path.join(path.dirname(outputDir), videoPath);
+  }
+  return path.join(outputDir, videoPath);
+}
+
+// 상주 분석 서버 (앱 시작 시 한 번 실행해 분석마다 Python 시작/임포트 비용을 내지 않음)
+let analysisServer = null;
+
+function getAnalysisServer() {
+  if (!analysisServer) {
+    const { command, args } = findPythonCommand(console.log);
+    // Unix 소켓은 경로 길이 제한 (약 104자)이 있어 짧을 때만 사용, Windows는 localhost TCP
+    const socketPath = path.join(app.getPath('userData'), 'analysis.sock');
+    analysisServer = new AnalysisServerClient(command, [...args, '--serve'], {
+      cwd: app.isPackaged ? process.resourcesPath : __dirname,
+      socketPath: process.platform !== 'win32' && socketPath.length < 100 ? socketPath : null
+    });
+  }
+  return analysisServer;
+}
+
+// 분석 서버로 작업 실행 (프레임은 JPEG로 받아 렌더러에서 디코딩)
+function runOnServer(server, videoPath, team1Rgb, team2Rgb, outputDir, sendDebug) {
+  const window = analyzeWindow;
+  const send = (channel, payload) => {
+    if (window && !window.isDestroyed()) window.webContents.send(channel, payload);
+  };
+
+  server.analyze({
+    video_path: videoPath,
+    output_dir: outputDir,
+    team1_color: [team1Rgb.r, team1Rgb.g, team1Rgb.b],
+    team2_color: [team2Rgb.r, team2Rgb.g, team2Rgb.b],
+    send_frames: true,
+    send_tracks: false
+  }, (message) => {
+    switch (message.event) {
+      case 'queued':
+        sendDebug(`Analysis job ${message.job_id} queued`);
+        break;
+      case 'started':
+        sendDebug(`✓ Analysis job ${message.job_id} started (${message.startup_ms} ms after request)`);
+        break;
+      case 'frame':
+        send('frame-data', { jpeg: Buffer.from(message.jpeg, 'base64') });
+        break;
+      case 'progress':
+        if (message.total_frames > 0) {
+          send('analysis-progress', Math.min(100, message.frame / message.total_frames * 100));
+        }
+        break;
+      case 'done':
+        sendDebug(`✓ Analysis job ${message.job_id} finished in ${message.elapsed_s}s`);
+        send('analysis-complete', true);
+        break;
+      case 'error':
+        sendDebug(`❌ Analysis error: ${message.error}`);
+        send('analysis-error', message.error);
+        send('analysis-complete', false);
+        break;
+    }
+  });
+}
+
+// 분석마다 Python 프로세스를 새로 실행 (분석 서버를 띄울 수 없을 때)
+function runInProcess(videoPath, team1Rgb, team2Rgb, outputDir, sendDebug) {
+  const { command: pythonCmd, args } = findPythonCommand(sendDebug);
+  const pythonArgs = [
+    ...args,
+    videoPath,
+    '--team1-color', team1Rgb.r, team1Rgb.g, team1Rgb.b,
+    '--team2-color', team2Rgb.r, team2Rgb.g, team2Rgb.b,
+    '--output-dir', outputDir
+  ].map(String);
+
+  sendDebug(`About to spawn: ${pythonCmd}`);
+  sendDebug(`Args: ${pythonArgs.join(' ')}`);
+
+  const py = spawn(pythonCmd, pythonArgs, {
+    cwd: app.isPackaged ? process.resourcesPath : __dirname,
+    env: { ...process.env }
+  });
+  sendDebug('✓ Python process spawned');
+
+  // 프로세스 에러 처리
+  py.on('error', (err) => {
+    sendDebug(`❌ Python process error: ${err.message}`);
+  });
+
+  py.on('close', (code) => {
+    sendDebug(`Python process closed with code: ${code}`);
+  });
+
+  // Python 프로세스 출력 처리 (프레임 스트림 재조립, 청크/프레임별 로그는 SOCCER_DEBUG_STREAM=1일 때만 초당 한 번)
+  const streamDebug = process.env.SOCCER_DEBUG_STREAM ? rateLimited(sendDebug, 1000) : null;
+  const reassembler = new FrameReassembler((frameData, width, height) => {
+    // Electron 렌더러로 프레임 전송 (send가 바로 직렬화하므로 슬롯 버퍼를 그대로 넘김)
+    if (analyzeWindow && !analyzeWindow.isDestroyed()) {
+      analyzeWindow.webContents.send('frame-data', { data: frameData, width, height });
+    }
+    if (streamDebug) {
+      streamDebug(`📺 Frame ${reassembler.frames}: ${frameData.length} bytes, ${width}x${height} ` +
+                  `(${reassembler.chunks} chunks, ${reassembler.allocations} buffer allocations)`);
+    }
+  });
+
+  py.stdout.on('data', (data) => {
+    try {
+      reassembler.push(data);
+    } catch (err) {
+      // 헤더가 깨진 스트림은 더 이상 해석할 수 없으므로 프로세스 종료
+      sendDebug(`❌ Frame stream error: ${err.message}`);
+      py.kill();
+    }
+  });
+
+  py.stderr.on('data', (data) => {
+    const message = data.toString();
+    sendDebug(`🐍 Python stderr: ${message.trim()}`);
+    if (analyzeWindow && !analyzeWindow.isDestroyed()) {
+      analyzeWindow.webContents.send('python-log', message);
+    }
+  });
+
+  // 예시: 분석 완료 시 tracked_video.mp4가 outputDir에 생성되었다고 가정
+  py.on('close', code => {
+    if (analyzeWindow && !analyzeWindow.isDestroyed()) {
+      analyzeWindow.webContents.send('analysis-complete', code === 0);
+    }
+  });
+}
+
 // 3. 분석 시작 핸들러
 ipcMain.handle('start-analysis', async (event, { videoPath, team1Color, team2Color }) => {
   try {
@@ -117,172 +305,23 @@ ipcMain.handle('start-analysis', async (event, { videoPath, team1Color, team2Col
     sendDebug(`app.isPackaged: ${app.isPackaged}`);
     sendDebug(`videoPath: ${videoPath}`);
 
-    // 패키징된 앱에서 Python 실행 파일 경로 처리
-    let pythonCmd, pythonArgs;
-    
-    if (app.isPackaged) {
-      sendDebug('=== Packaged app mode ===');
-      // 패키징된 경우: 번들된 실행 파일 사용
-      const executableName = process.platform === 'win32' ? 'soccer_detector.exe' : 'soccer_detector';
-      
-      // 여러 가능한 경로를 시도 (패키징된 앱에서)
-      const possiblePaths = [
-        // asar 압축 해제된 파일들의 위치
-        path.join(process.resourcesPath, 'app.asar.unpacked', 'python-dist', executableName),
-        // 리소스 폴더 직접 접근
-        path.join(process.resourcesPath, 'python-dist', executableName),
-        // 앱 번들 내부
-        path.join(process.resourcesPath, 'app', 'python-dist', executableName),
-        // 백업 경로들
-        path.join(__dirname, 'python-dist', executableName),
-        path.join(app.getAppPath(), 'python-dist', executableName)
-      ];
-      
-      pythonCmd = null;
-      for (const possiblePath of possiblePaths) {
-        sendDebug(`Checking: ${possiblePath}`);
-        if (fs.existsSync(possiblePath)) {
-          pythonCmd = possiblePath;
-          sendDebug(`✓ Found Python executable at: ${pythonCmd}`);
-          break;
-        }
-      }
-      
-      if (!pythonCmd) {
-        sendDebug('❌ Python executable not found in any of these paths:');
-        possiblePaths.forEach(p => sendDebug(`  - ${p}`));
-        throw new Error('Python executable not found');
-      }
-      
-      // 절대 경로로 변환 (패키징 모드)
-      let absoluteVideoPath;
-      if (path.isAbsolute(videoPath)) {
-        absoluteVideoPath = videoPath;
-      } else if (videoPath.startsWith('output/')) {
-        // videoPath가 'output/input_video.mp4' 형태인 경우
-        absoluteVideoPath = path.join(path.dirname(outputDir), videoPath);
-      } else {
-        absoluteVideoPath = path.join(outputDir, videoPath);
-      }
-      sendDebug(`Converting video path: ${videoPath} → ${absoluteVideoPath}`);
-      
-      pythonArgs = [
-        absoluteVideoPath,
-        '--team1-color', team1Rgb.r, team1Rgb.g, team1Rgb.b,
-        '--team2-color', team2Rgb.r, team2Rgb.g, team2Rgb.b,
-        '--output-dir', outputDir
-      ].map(String);
+    const absoluteVideoPath = resolveVideoPath(videoPath, outputDir);
+    sendDebug(`Converting video path: ${videoPath} → ${absoluteVideoPath}`);
+
+    // 상주 분석 서버로 작업 전송, 서버를 쓸 수 없으면 이번 분석만 Python 프로세스를 새로 실행
+    let server = null;
+    try {
+      server = getAnalysisServer();
+      await server.start();
+    } catch (err) {
+      sendDebug(`⚠️ Analysis server unavailable (${err.message}), spawning a Python process`);
+      server = null;
+    }
+    if (server) {
+      runOnServer(server, absoluteVideoPath, team1Rgb, team2Rgb, outputDir, sendDebug);
     } else {
-      sendDebug('=== Development mode ===');
-      // 개발 모드: Python 스크립트 직접 실행
-      pythonCmd = process.platform === 'win32' ? 'python' : 'python3';
-      const script = path.join(__dirname, 'main.py');
-      
-      // 절대 경로로 변환
-      let absoluteVideoPath;
-      if (path.isAbsolute(videoPath)) {
-        absoluteVideoPath = videoPath;
-      } else if (videoPath.startsWith('output/')) {
-        // videoPath가 'output/input_video.mp4' 형태인 경우
-        absoluteVideoPath = path.join(path.dirname(outputDir), videoPath);
-      } else {
-        absoluteVideoPath = path.join(outputDir, videoPath);
-      }
-      sendDebug(`Converting video path: ${videoPath} → ${absoluteVideoPath}`);
-      
-      pythonArgs = [
-        script,
-        absoluteVideoPath,
-        '--team1-color', team1Rgb.r, team1Rgb.g, team1Rgb.b,
-        '--team2-color', team2Rgb.r, team2Rgb.g, team2Rgb.b,
-        '--output-dir', outputDir
-      ].map(String);
+      runInProcess(absoluteVideoPath, team1Rgb, team2Rgb, outputDir, sendDebug);
     }
-    
-    sendDebug(`About to spawn: ${pythonCmd}`);
-    sendDebug(`Args: ${pythonArgs.join(' ')}`);
-    
-    const py = spawn(pythonCmd, pythonArgs, {
-      cwd: app.isPackaged ? process.resourcesPath : __dirname,
-      env: { ...process.env }
-    });
-    sendDebug('✓ Python process spawned');
-
-    // 프로세스 에러 처리
-    py.on('error', (err) => {
-      sendDebug(`❌ Python process error: ${err.message}`);
-    });
-
-    py.on('close', (code) => {
-      sendDebug(`Python process closed with code: ${code}`);
-    });
-
-    // Python 프로세스 출력 처리
-    let frameBuffer = Buffer.alloc(0);
-    let expectedFrameSize = 0;
-    let frameWidth = 0;
-    let frameHeight = 0;
-    let headerReceived = false;
-
-    py.stdout.on('data', (data) => {
-      sendDebug(`📥 Received ${data.length} bytes from Python stdout`);
-      
-      // 텍스트 데이터 확인 (디버깅용)
-      const textData = data.toString().trim();
-      if (textData && textData.length < 200) { // 짧은 텍스트만 로깅
-        sendDebug(`📄 Text content: "${textData}"`);
-      }
-      
-      frameBuffer = Buffer.concat([frameBuffer, data]);
-      
-      while (frameBuffer.length > 0) {
-        if (!headerReceived && frameBuffer.length >= 8) {
-          // 헤더 읽기: 프레임 크기(4바이트) + 너비(2바이트) + 높이(2바이트)
-          expectedFrameSize = frameBuffer.readUInt32LE(0);
-          frameWidth = frameBuffer.readUInt16LE(4);
-          frameHeight = frameBuffer.readUInt16LE(6);
-          frameBuffer = frameBuffer.slice(8);
-          headerReceived = true;
-          sendDebug(`📺 Frame header: ${expectedFrameSize} bytes, ${frameWidth}x${frameHeight}`);
-        }
-        
-        if (headerReceived && frameBuffer.length >= expectedFrameSize) {
-          // 프레임 데이터 추출
-          const frameData = frameBuffer.slice(0, expectedFrameSize);
-          frameBuffer = frameBuffer.slice(expectedFrameSize);
-          
-          sendDebug(`🎬 Processing frame data: ${frameData.length} bytes`);
-          
-          // Electron 렌더러로 프레임 전송
-          if (analyzeWindow && !analyzeWindow.isDestroyed()) {
-            analyzeWindow.webContents.send('frame-data', {
-              data: frameData,
-              width: frameWidth,
-              height: frameHeight
-            });
-          }
-          
-          // 다음 프레임을 위해 리셋
-          headerReceived = false;
-          expectedFrameSize = 0;
-        } else {
-          break; // 더 많은 데이터 필요
-        }
-      }
-    });
-
-    py.stderr.on('data', (data) => {
-      const message = data.toString();
-      sendDebug(`🐍 Python stderr: ${message.trim()}`);
-      if (analyzeWindow && !analyzeWindow.isDestroyed()) {
-        analyzeWindow.webContents.send('python-log', message);
-      }
-    });
-
-    // 예시: 분석 완료 시 tracked_video.mp4가 outputDir에 생성되었다고 가정
-    py.on('close', code => {
-      analyzeWindow.webContents.send('analysis-complete', code === 0);
-    });
 
     return { success: true };
   } catch (err) {
@@ -6,105 +6,297 @@ import json
 from datetime import datetime
 from tools.color_picker import integrate_realtime_colors
 from tools.color_utils import bgr_range, create_uniform_mask
-from tools.detection import get_bounding_boxes, draw_boxes_on_frame
-from tools.player_tracker import PlayerTrackerManager
+from tools.detection import get_bounding_boxes, boxes_on_field, draw_boxes_on_frame, StripExtractor, EXTRACTORS
+from tools.player_tracker import grass_map_from_frame
 from tools.ball_detection import detect_ball, draw_ball_detection, filter_ball_by_field_position
-from tools.ball_tracker import BallTrackerManager
+from tools.tracking_session import TrackingSession, validate_tracker_params
+from tools.scene_detection import SceneChangeDetector
+from tools.field_mask import FieldMask
+from tools.integral_image import IntegralImage
+from tools.possession import PossessionTimeline
+from tools.match_stats import MatchStatsAggregator
+from tools.player_heatmaps import PlayerHeatmapAccumulator
+from tools.pitch_calibration import PitchCalibration
+from tools.camera_motion import CameraMotionEstimator
+from tools.appearance import AppearanceFrame
+from tools.team_classifier import TeamClassifier, TEAM_MODES
+from tools.video_source import VideoSource
+from tools.detection_log import DetectionLogWriter, DetectionLogReader, LoggedAppearance
+from tools.job_cache import JobCache, fast_file_hash, params_key, default_cache_dir
 import base64
 import sys
 import struct
+import time
+from contextlib import ExitStack
 from pathlib import Path
 
-def process_video(video_path, team1_color_rgb, team2_color_rgb, ball_color_rgb=None, tracker_debug_mode=False, output_path=None):
+def process_video(video_path, team1_color_rgb, team2_color_rgb, ball_color_rgb=None, tracker_debug_mode=False, output_path=None,
+                  scene_detection=True, extractor="contours", calibration_path=None, auto_calibrate=False,
+                  camera_motion=True, reid=True, team_mode="masks", extra_classes=None, field_mask=True,
+                  strips=1, realtime=False, stdin_size=(640, 360), stdin_fps=25, cache_dir=None, cache_max_bytes=2 << 30,
+                  record_detections=None, tracker_params=None, frame_sink=None, track_sink=None, progress_sink=None, show_window=True):
+    # 결과 전달 함수 (기본: 프레임은 stdout 바이너리로 Electron에 전송, 분석 서버는 자체 함수 사용)
+    if frame_sink is None:
+        frame_sink = write_frame_to_stdout
+
     # RGB 입력을 BGR로 변환 (한 번만 변환)
     team1_color_bgr = [team1_color_rgb[2], team1_color_rgb[1], team1_color_rgb[0]]  # R,G,B -> B,G,R
     team2_color_bgr = [team2_color_rgb[2], team2_color_rgb[1], team2_color_rgb[0]]  # R,G,B -> B,G,R
     
+    # 색상 클래스 목록 (1, 2는 두 팀, 3부터 심판/골키퍼 등 추가 클래스) - JSON 출력 키로 사용
+    class_names = {1: "team1", 2: "team2"}
+    class_colors_bgr = {1: team1_color_bgr, 2: team2_color_bgr}
+    for class_id, (name, color_rgb) in enumerate(extra_classes or [], start=3):
+        class_names[class_id] = name
+        class_colors_bgr[class_id] = [color_rgb[2], color_rgb[1], color_rgb[0]]
+    
+    # 추가 클래스는 마스크를 늘리지 않도록 한 번의 blob 분류로만 처리
+    if len(class_names) > 2 and team_mode != "blobs":
+        print("Extra color classes require blob classification, using --team-mode blobs", file=sys.stderr)
+        team_mode = "blobs"
+    
+    # 띠 병렬 추출은 연결 요소 라벨링으로 띠를 합치므로 전체 프레임 components 추출과 같은 결과
+    if strips > 1 and extractor != "components":
+        print("Strip-parallel extraction uses connected components, using --extractor components", file=sys.stderr)
+        extractor = "components"
+    
     # 공 색상도 BGR로 변환 (기본값: 흰색)
     if ball_color_rgb is None:
         ball_color_bgr = [255, 255, 255]  # 흰색 (BGR)
     else:
         ball_color_bgr = [ball_color_rgb[2], ball_color_rgb[1], ball_color_rgb[0]]  # R,G,B -> B,G,R
     
-    # 비디오 캡처 초기화
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        print("Error: Could not open video file", file=sys.stderr)
-        return
-
-    # 비디오 정보 가져오기
-    frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = int(cap.get(cv2.CAP_PROP_FPS))
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
-    # 출력 경로 설정
-    if output_path is None:
-        # 현재 디렉토리에 output 폴더 생성
-        output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
-        os.makedirs(output_dir, exist_ok=True)
+    # 입출력을 열기 전에 실패할 수 있는 설정부터 확인 (잘못된 추적 파라미터/보정 파일로 빈 출력 파일을 남기지 않음)
+    validate_tracker_params(tracker_params)
+    calibration = PitchCalibration.load(calibration_path) if calibration_path else None
+
+    # 윈도우 생성
+    if show_window:
+        cv2.namedWindow("Soccer Tracking", cv2.WINDOW_NORMAL)
+
+    # 설정 중 실패하거나 일찍 끝나면 그때까지 연 입력/출력 파일과 임시 폴더를 정리
+    with ExitStack() as setup:
+        # 비디오 캡처 초기화
+        # (파일, 카메라 번호, 스트림 URL, stdin 원시 프레임 - 실시간 입력은 밀린 프레임을 버리고 최신 프레임만 처리)
+        cap = VideoSource(video_path, realtime=realtime, stdin_size=stdin_size, stdin_fps=stdin_fps)
+        setup.callback(lambda: cap.release())  # 단계 캐시 입력으로 바뀌어도 그때의 입력을 해제
+        if not cap.is_opened():
+            print("Error: Could not open video file", file=sys.stderr)
+            return
+
+        # 비디오 정보 가져오기 (실시간 입력은 총 프레임 수를 알 수 없으므로 0)
+        fps = cap.fps
+        total_frames = cap.total_frames
+        total_display = total_frames if total_frames > 0 else "live"
+    
+        # 실시간 입력의 종단 지연 (프레임 수신 ~ 결과 전송) 통계
+        latency_sum = 0.0
+        latency_max = 0.0
+        latency_count = 0
+
+        # 출력 경로 설정
+        if output_path is None:
+            # 현재 디렉토리에 output 폴더 생성
+            output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+            os.makedirs(output_dir, exist_ok=True)
         
-        # 입력 비디오 파일명을 기반으로 출력 파일명 생성
-        input_filename = os.path.basename(video_path)
-        output_filename = f"tracked_{input_filename}"
-        output_path = os.path.join(output_dir, output_filename)
-
-    # JSON 출력 파일 설정
-    json_output_dir = os.path.dirname(output_path)
-    os.makedirs(json_output_dir, exist_ok=True)
-    json_filename = f"tracking_data.json"
-    json_output_path = os.path.join(json_output_dir, json_filename)
-
-    # 비디오 작성자 초기화
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (640, 360))
-
-    # 첫 프레임에서 잔디 색상 추출
-    ret, first_frame = cap.read()
-    if not ret:
-        print("Error: Could not read first frame", file=sys.stderr)
-        return
-
-    # 프레임 크기 조정 후 PlayerTrackerManager 초기화
-    first_frame = cv2.resize(first_frame, (640, 360))
-    frame_height, frame_width = first_frame.shape[:2]
+            # 입력 비디오 파일명을 기반으로 출력 파일명 생성
+            input_filename = os.path.basename(video_path)
+            output_filename = f"tracked_{input_filename}"
+            output_path = os.path.join(output_dir, output_filename)
+
+        # JSON 출력 파일 설정
+        json_output_dir = os.path.dirname(output_path)
+        os.makedirs(json_output_dir, exist_ok=True)
+        json_filename = f"tracking_data.json"
+        json_output_path = os.path.join(json_output_dir, json_filename)
+
+        # 결과 캐시 (파일 입력만): 같은 영상 + 같은 추적 파라미터면 이전 결과를 복사해 바로 반환
+        job_cache = None
+        stage_reader = None
+        stage_recorder = None
+        if cache_dir and not cap.is_live and os.path.isfile(video_path):
+            job_cache = JobCache(cache_dir, cache_max_bytes)
+            video_hash = fast_file_hash(video_path)
+            job_key = params_key(video_hash, team1_color_rgb, team2_color_rgb, ball_color_rgb, tracker_debug_mode,
+                                 scene_detection, extractor, fast_file_hash(calibration_path) if calibration_path else None,
+                                 auto_calibrate, camera_motion, reid, team_mode, extra_classes, field_mask,
+                                 sorted((tracker_params or {}).items()))
+            job_outputs = {name: os.path.join(json_output_dir, name) for name in (
+                json_filename, "possession_timeline.jsonl", "match_summary.json", "player_stats.npy",
+                "player_heatmaps.npy", "team_heatmaps.npy", "calibration.json")}
+            job_outputs["tracked_video.mp4"] = output_path
+            if not record_detections and job_cache.restore_outputs(job_key, job_outputs):
+                print(f"Cache hit: restored results for {video_path} ({job_key})", file=sys.stderr)
+                return json_output_path
+
+            # 단계 캐시: 색상만 바꾼 재분석은 디코딩/축소된 프레임과 잔디 마스크를 재사용
+            stage_key = params_key(video_hash, "frames+grass", (640, 360), 60)
+            stage_reader = job_cache.open_stage(stage_key)
+            if stage_reader is not None:
+                cap.release()
+                cap = stage_reader
+                print(f"Stage cache hit: reusing {cap.num_frames} decoded frames and grass masks", file=sys.stderr)
+            elif total_frames * (640 * 360 * 3 + 640 * 360 // 8) <= cache_max_bytes // 2:
+                stage_recorder = job_cache.record_stage(stage_key, (640, 360), fps)
+                setup.callback(stage_recorder.discard)
+
+        # 비디오 작성자 초기화
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        out = cv2.VideoWriter(output_path, fourcc, fps, (640, 360))
+        setup.callback(out.release)
+
+        # 첫 프레임에서 잔디 색상 추출
+        ret, first_frame, first_captured_at = cap.read()
+        if not ret:
+            print("Error: Could not read first frame", file=sys.stderr)
+            return
+
+        # 프레임 크기 조정 후 추적 세션 초기화
+        first_frame_raw = first_frame
+        first_frame = cv2.resize(first_frame, (640, 360))
+        frame_height, frame_width = first_frame.shape[:2]
     
-    # 잔디 색상 분석 (BGR 색상 공간)
-    all_mask = np.ones_like(first_frame, dtype=np.uint8) * 255
-    dominant_colors = integrate_realtime_colors(first_frame, all_mask, color_space="bgr")  
-    print("Grass color (BGR):", dominant_colors, file=sys.stderr)
-    print("Ball color (BGR):", ball_color_bgr, file=sys.stderr)
+        # 잔디 색상 분석 (BGR 색상 공간)
+        if job_cache is not None and stage_reader is not None:
+            dominant_colors = stage_reader.dominant_colors  # 캐시된 잔디 마스크를 만든 색상과 동일하게 유지
+        else:
+            all_mask = np.ones_like(first_frame, dtype=np.uint8) * 255
+            dominant_colors = integrate_realtime_colors(first_frame, all_mask, color_space="bgr")  
+        print("Grass color (BGR):", dominant_colors, file=sys.stderr)
+        print("Ball color (BGR):", ball_color_bgr, file=sys.stderr)
     
-    # PlayerTrackerManager 초기화 (잔디색 전달)
-    tracker_manager = PlayerTrackerManager(frame_width, frame_height, dominant_colors)
+        # 경기장 보정 (수동 대응점 파일 또는 첫 프레임 잔디 영역에서 자동 추정)
+        if calibration_path:
+            print(f"Pitch calibration loaded: {calibration_path}", file=sys.stderr)
+        elif auto_calibrate:
+            lower_green, upper_green = bgr_range(dominant_colors[0], dominant_colors[1], dominant_colors[2], tolerance=60)
+            calibration = PitchCalibration.from_grass_mask(cv2.inRange(first_frame, lower_green, upper_green))
+            if calibration is None:
+                print("Auto calibration failed: pitch outline not found, tracking in pixels", file=sys.stderr)
+            else:
+                calibration.save(os.path.join(json_output_dir, "calibration.json"))
+                print("Pitch calibration estimated from grass mask", file=sys.stderr)
     
-    # BallTrackerManager 초기화
-    ball_tracker_manager = BallTrackerManager(frame_width, frame_height, dominant_colors)
+        # 선수/공 추적 세션 초기화 (잔디색 전달, 추적 파라미터 튜닝 값 적용)
+        session = TrackingSession(frame_width, frame_height, dominant_colors, class_names, fps, calibration=calibration,
+                                  tracker_debug_mode=tracker_debug_mode, tracker_params=tracker_params)
 
-    # 추적 모드 출력
-    mode_text = "추적 전용 모드 (첫 프레임만 등록)" if tracker_debug_mode else "일반 모드 (매 프레임 등록/업데이트)"
-    print(f"실행 모드: {mode_text}", file=sys.stderr)
-    print(f"출력 파일: {output_path}", file=sys.stderr)
-    print(f"JSON 파일: {json_output_path}", file=sys.stderr)
+        # 장면 분류기 초기화 (관중석/클로즈업/리플레이 프레임 감지 스킵, 컷에서 tracker 리셋)
+        scene_detector = SceneChangeDetector() if scene_detection else None
 
-    # 윈도우 생성
-    cv2.namedWindow("Soccer Tracking", cv2.WINDOW_NORMAL)
+        # blobs 모드: 잔디가 아닌 영역에서 blob을 한 번만 추출한 뒤 팀 색상으로 일괄 분류
+        team_classifier = None
+        if team_mode == "blobs":
+            team_classifier = TeamClassifier(list(class_colors_bgr.values()), list(class_colors_bgr.keys()))
+
+        # 카메라 전역 이동 추정기 (팬/틸트를 선수 속도로 오인하지 않도록 tracker 위치 보정)
+        motion_estimator = CameraMotionEstimator() if camera_motion else None
+    
+        # 필드 경계 마스크 (관중석 영역에서는 선수/공 후보를 추출하지 않음, 샷 동안 재사용)
+        field_masker = FieldMask() if field_mask else None
+    
+        # 프레임 내 띠 병렬 처리 (마스크/모폴로지/후보 추출을 스레드 풀에서, 실시간 입력의 프레임당 지연 감소)
+        strip_extractor = StripExtractor(strips) if strips > 1 else None
+        if strip_extractor is not None:
+            setup.callback(strip_extractor.close)
+    
+        # 프레임별 감지 결과 기록 (--track-only로 감지 없이 추적만 다시 실행)
+        detection_log = None
+        if record_detections:
+            detection_log = DetectionLogWriter(record_detections, {
+                "frame_width": frame_width,
+                "frame_height": frame_height,
+                "fps": fps,
+                "grass_color": [int(c) for c in dominant_colors],
+                "class_ids": list(class_names),
+                "class_names": class_names,
+                "tracker_debug_mode": tracker_debug_mode,
+                "homography": calibration.homography.tolist() if calibration is not None else None,
+                "metadata": {
+                    "video_path": video_path,
+                    "fps": fps,
+                    "total_frames": total_frames,
+                    "frame_width": frame_width,
+                    "frame_height": frame_height,
+                    "team1_color": team1_color_rgb,
+                    "team2_color": team2_color_rgb,
+                    "extra_classes": {name: list(color_rgb) for name, color_rgb in (extra_classes or [])},
+                    "ball_color": ball_color_rgb if ball_color_rgb else [255, 255, 255],
+                    "tracker_debug_mode": tracker_debug_mode
+                }
+            })
+            setup.callback(detection_log.close)
+            print(f"Recording detections to: {record_detections}", file=sys.stderr)
+
+        # 점유 타임라인 (점유 구간이 끝날 때마다 파일에 순차 기록)
+        possession_output_path = os.path.join(json_output_dir, "possession_timeline.jsonl")
+        possession_timeline = PossessionTimeline(possession_output_path, fps)
+        setup.callback(possession_timeline.close)
+
+        # 경기 통계 온라인 집계 (점유율, 패스, 이동 거리, 히트맵)
+        summary_output_path = os.path.join(json_output_dir, "match_summary.json")
+        player_heatmaps = PlayerHeatmapAccumulator(frame_width, frame_height, fps,
+                                                   spill_path=os.path.join(json_output_dir, "player_heatmaps.spill"))
+        setup.callback(player_heatmaps.close)
+        match_stats = MatchStatsAggregator(frame_width, frame_height, fps, player_accumulator=player_heatmaps)
+
+        # 추적 모드 출력
+        mode_text = "추적 전용 모드 (첫 프레임만 등록)" if tracker_debug_mode else "일반 모드 (매 프레임 등록/업데이트)"
+        print(f"실행 모드: {mode_text}", file=sys.stderr)
+        print(f"출력 파일: {output_path}", file=sys.stderr)
+        print(f"JSON 파일: {json_output_path}", file=sys.stderr)
+
+        # 설정이 끝났으면 정리는 아래 처리 루프의 finally가 맡음
+        setup.pop_all()
 
-    # 첫 프레임 플래그 (tracker_debug_mode에서만 사용)
-    is_first_frame = True
     frame_count = 0
 
+    def finish_frame(result_frame, frame_data, captured_at=None):
+        """처리한 프레임 하나의 결과 전송, 영상 저장, 진행률 표시 (captured_at이 있으면 실시간 지연 기록)"""
+        nonlocal frame_count, latency_sum, latency_max, latency_count
+        # 프레임 데이터 전송 (Electron으로)
+        frame_sink(result_frame)
+        
+        # 실시간 입력: 프레임 수신부터 결과 전송까지의 지연 기록
+        if captured_at is not None and cap.is_live:
+            latency = time.monotonic() - captured_at
+            latency_sum += latency
+            latency_max = max(latency_max, latency)
+            latency_count += 1
+            frame_data["latency_ms"] = round(latency * 1000, 1)
+        if track_sink is not None:
+            track_sink(frame_data)
+        
+        # 결과 프레임 저장
+        out.write(result_frame)
+        
+        # 진행률 표시
+        if progress_sink is not None:
+            progress_sink(frame_count, total_frames)
+        if frame_count % 30 == 0:  # 30프레임마다 진행률 출력
+            report_progress(frame_count, total_frames, cap,
+                            latency_sum / latency_count if latency_count else None, latency_max)
+        
+        # 프레임 카운트 증가 (루프 시작의 증가와 합쳐 프레임 번호는 1, 3, 5...; 멀티캠 융합이 frame_step으로 사용)
+        frame_count += 1
+
     # JSON 데이터를 저장할 리스트
     tracking_data = []
+    completed = False  # 끝까지 처리했을 때만 결과를 캐시에 저장
 
     try:
-        # 비디오를 처음부터 다시 읽기 위해 재설정
-        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        # 비디오를 처음부터 다시 읽기 위해 재설정 (되감을 수 없는 실시간 입력은 첫 프레임부터 처리)
+        pending_frame = None if cap.rewind() else (first_frame_raw, first_captured_at)
         
         while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+            if pending_frame is not None:
+                frame, captured_at = pending_frame
+                pending_frame = None
+            else:
+                ret, frame, captured_at = cap.read()
+                if not ret:
+                    break
 
             frame_count += 1
             # 프레임 크기 조정
@@ -112,130 +304,135 @@ def process_video(video_path, team1_color_rgb, team2_color_rgb, ball_color_rgb=N
             
             # 잔디 색상 마스크 생성 (BGR)
             # dominant_colors는 이미 BGR 순서이므로 순서대로 사용
-            lower_green, upper_green = bgr_range(dominant_colors[0], dominant_colors[1], dominant_colors[2], tolerance=60)
-            mask_green = cv2.inRange(frame, lower_green, upper_green)
-            mask_not_green = cv2.bitwise_not(mask_green)
+            if stage_reader is not None:
+                mask_green = stage_reader.grass_mask()
+            else:
+                lower_green, upper_green = bgr_range(dominant_colors[0], dominant_colors[1], dominant_colors[2], tolerance=60)
+                mask_green = cv2.inRange(frame, lower_green, upper_green)
+            if stage_recorder is not None:
+                stage_recorder.add(frame, mask_green)
             
-            # 각 팀의 유니폼 마스크 생성 (BGR 색상 사용)
-            mask_team1 = create_uniform_mask(frame, team1_color_bgr)
-            mask_team2 = create_uniform_mask(frame, team2_color_bgr)
+            # 장면 분류: 컷이면 tracker 리셋 (세션 입력), 필드가 아닌 장면이면 감지/추적 생략 (tracker 동결)
+            scene_info = None
+            if scene_detector is not None:
+                scene_info = scene_detector.update(frame, mask_green, frame_count)
+                if scene_info['is_cut']:
+                    if motion_estimator is not None:
+                        motion_estimator.reset()
+                    print(f"Scene cut at frame {frame_count} (shot {scene_info['shot_index']})", file=sys.stderr)
             
-            # 잔디가 아니고 각 팀의 유니폼 색상인 부분만 마스킹
-            mask_team1_final = cv2.bitwise_and(mask_not_green, mask_team1)
-            mask_team2_final = cv2.bitwise_and(mask_not_green, mask_team2)
+            is_cut = bool(scene_info and scene_info['is_cut'])
+            if scene_info is not None and not scene_info['is_pitch']:
+                frame_data = session.step({"frame_number": frame_count, "is_cut": is_cut, "skipped": True,
+                                           "scene": scene_info})["frame_data"]
+                tracking_data.append(frame_data)
+                possession_timeline.update(frame_count, None)
+                match_stats.skip_frame()
+                if detection_log is not None:
+                    detection_log.write_frame(frame_count, scene_info=scene_info, is_cut=is_cut, skipped=True)
+                if motion_estimator is not None:
+                    motion_estimator.reset()
+                if field_masker is not None:
+                    field_masker.reset()
+                
+                result_frame = frame.copy()
+                cv2.putText(result_frame, f"Frame: {frame_count}/{total_display} | Non-pitch shot (detection skipped)", 
+                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                
+                finish_frame(result_frame, frame_data)
+                continue
             
-            # 노이즈 제거를 위한 모폴로지 연산
-            kernel = np.ones((5,5), np.uint8)
-            mask_team1_final = cv2.morphologyEx(mask_team1_final, cv2.MORPH_CLOSE, kernel)
-            mask_team2_final = cv2.morphologyEx(mask_team2_final, cv2.MORPH_CLOSE, kernel)
+            # 카메라 전역 이동 (세션이 할당 전에 모든 tracker 위치에 반영)
+            camera_shift = (0.0, 0.0)
+            if motion_estimator is not None:
+                camera_shift = motion_estimator.update(frame, mask_green)
             
-            # 각 팀의 바운딩 박스 감지
-            team1_detected_bboxes = get_bounding_boxes(frame, mask_team1_final, dominant_colors)
-            team2_detected_bboxes = get_bounding_boxes(frame, mask_team2_final, dominant_colors)
+            mask_not_green = cv2.bitwise_not(mask_green)
             
-            # 공 감지 (선수 bbox와 관중석 필터링 포함)
-            all_player_bboxes = team1_detected_bboxes + team2_detected_bboxes
-            detected_ball_bboxes = detect_ball(frame, mask_green, ball_color_bgr, player_bboxes=all_player_bboxes)
-            detected_ball_bboxes = filter_ball_by_field_position(detected_ball_bboxes, frame.shape)
+            # 필드 밖 (관중석)을 후보 마스크에서 제외 (경계는 컷이나 큰 카메라 이동 때만 다시 계산)
+            field = None
+            if field_masker is not None:
+                field = field_masker.update(mask_green, camera_shift, is_cut=is_cut)
+                mask_not_green = cv2.bitwise_and(mask_not_green, field)
             
-            # 공 추적 업데이트
-            ball_tracker_manager.update_ball_tracking(detected_ball_bboxes, tracker_manager, frame, frame_count)
+            # 잔디 마스크 적분 영상 (프레임당 한 번 계산, 잔디 비율 조회에 공유)
+            grass_integral = IntegralImage.from_mask(mask_green)
             
-            # 추적 모드에 따른 처리
-            if tracker_debug_mode:
-                # 추적 전용 모드: 첫 프레임에서만 등록, 나머지는 추적만
-                if is_first_frame:
-                    tracker_manager.initialize_trackers(team1_detected_bboxes, team2_detected_bboxes)
-                    is_first_frame = False
-                else:
-                    tracker_manager.update_trackers_only(team1_detected_bboxes, team2_detected_bboxes, frame)
+            # 선수 재식별용 외형 정보 (HSV 변환은 프레임당 한 번)
+            appearance = AppearanceFrame(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV), mask_green) if reid else None
+            
+            if team_classifier is not None:
+                # 잔디가 아닌 영역에서 선수 blob을 한 번만 추출 (전체 프레임 연산이 팀 수와 무관)
+                player_bboxes, = extract_player_boxes(frame, mask_not_green, None, dominant_colors, extractor,
+                                                      strip_extractor)
+                
+                # blob별 클래스 분류 (bbox 안의 픽셀만 사용, 미분류 blob은 제외)
+                class_labels = team_classifier.classify(frame, player_bboxes, mask_green).tolist()
+                detected_by_class = {class_id: [] for class_id in class_names}
+                for bbox, label in zip(player_bboxes, class_labels):
+                    if label in detected_by_class:
+                        detected_by_class[label].append(bbox)
             else:
-                # 일반 모드: 매 프레임 등록/업데이트
-                tracker_manager.update_trackers(team1_detected_bboxes, team2_detected_bboxes, frame)
+                # 잔디가 아니고 각 팀의 유니폼 색상인 부분에서 팀별 바운딩 박스 감지
+                team1_detected_bboxes, team2_detected_bboxes = extract_player_boxes(
+                    frame, mask_not_green, [team1_color_bgr, team2_color_bgr], dominant_colors, extractor,
+                    strip_extractor)
+                detected_by_class = {1: team1_detected_bboxes, 2: team2_detected_bboxes}
+            
+            # 공 감지 (선수 bbox와 관중석 필터링 포함)
+            all_player_bboxes = [bbox for bboxes in detected_by_class.values() for bbox in bboxes]
+            detected_ball_bboxes = detect_ball(frame, mask_green, ball_color_bgr, player_bboxes=all_player_bboxes,
+                                               grass_integral=grass_integral, field_mask=field)
+            detected_ball_bboxes = filter_ball_by_field_position(detected_ball_bboxes, frame.shape)
             
-            # 추적된 바운딩 박스들 가져오기
-            team1_tracked_bboxes, team2_tracked_bboxes = tracker_manager.get_all_bboxes()
+            # 감지 결과 기록 (track-only 재생용, tracker가 픽셀에서 참조하는 잔디 판정/외형 기술자 포함)
+            if detection_log is not None:
+                detection_log.write_frame(
+                    frame_count, detected_by_class, detected_ball_bboxes, camera_shift,
+                    grass_map=grass_map_from_frame(frame, dominant_colors),
+                    descriptors=appearance.descriptors(
+                        [bbox for bboxes in detected_by_class.values() for bbox in bboxes]) if appearance else None,
+                    scene_info=scene_info, is_cut=is_cut)
             
-            # 현재 프레임의 추적 데이터 수집
-            frame_data = {
+            # 공/선수 추적 업데이트 (잔디 판정과 외형 기술자는 프레임 픽셀에서 계산)
+            tracking = session.step({
                 "frame_number": frame_count,
-                "timestamp": frame_count / fps,  # 초 단위 타임스탬프
-                "players": {
-                    "team1": [],
-                    "team2": []
-                },
-                "ball": None
-            }
-
-            # 팀1 선수 데이터 수집
-            for bbox in team1_tracked_bboxes:
-                x, y, w, h = bbox
-                player_data = {
-                    "position": {
-                        "x": int(x + w/2),  # 중심점 x 좌표
-                        "y": int(y + h/2)   # 중심점 y 좌표
-                    },
-                    "bbox": {
-                        "x": int(x),
-                        "y": int(y),
-                        "width": int(w),
-                        "height": int(h)
-                    }
-                }
-                frame_data["players"]["team1"].append(player_data)
-
-            # 팀2 선수 데이터 수집
-            for bbox in team2_tracked_bboxes:
-                x, y, w, h = bbox
-                player_data = {
-                    "position": {
-                        "x": int(x + w/2),  # 중심점 x 좌표
-                        "y": int(y + h/2)   # 중심점 y 좌표
-                    },
-                    "bbox": {
-                        "x": int(x),
-                        "y": int(y),
-                        "width": int(w),
-                        "height": int(h)
-                    }
-                }
-                frame_data["players"]["team2"].append(player_data)
-
-            # 공 데이터 수집
-            ball_info = ball_tracker_manager.get_ball_info()
-            if ball_info['active']:
-                ball_bbox = ball_tracker_manager.get_ball_bbox()
-                if ball_bbox:
-                    x, y, w, h = ball_bbox
-                    frame_data["ball"] = {
-                        "position": {
-                            "x": int(x + w/2),  # 중심점 x 좌표
-                            "y": int(y + h/2)   # 중심점 y 좌표
-                        },
-                        "bbox": {
-                            "x": int(x),
-                            "y": int(y),
-                            "width": int(w),
-                            "height": int(h)
-                        },
-                        "possession": ball_info['possession']
-                    }
+                "is_cut": is_cut,
+                "skipped": False,
+                "camera_shift": camera_shift,
+                "detected_by_class": detected_by_class,
+                "ball_bboxes": detected_ball_bboxes,
+                "scene": scene_info
+            }, frame=frame, appearance=appearance)
+            
+            # 추적된 바운딩 박스들 (클래스별)과 현재 프레임의 추적 데이터
+            tracked_by_class = tracking["tracked_by_class"]
+            frame_data, ball_info = tracking["frame_data"], tracking["ball_info"]
 
             # 현재 프레임 데이터를 전체 데이터에 추가
             tracking_data.append(frame_data)
+            possession_timeline.update(frame_count, ball_info['possession'] if ball_info['active'] else None)
+            match_stats.update(tracking["player_snapshot"], tracking["ball_position"],
+                               ball_info['possession'] if ball_info['active'] else None)
             
             # 결과 그리기
             # 추적된 bbox로 그리기
             result_frame = frame.copy()
-            result_frame = draw_boxes_on_frame(result_frame, team1_tracked_bboxes, color=(0, 255, 255))  # 노란색
-            result_frame = draw_boxes_on_frame(result_frame, team2_tracked_bboxes, color=(255, 0, 255))  # 마젠타색
+            result_frame = draw_boxes_on_frame(result_frame, tracked_by_class.get(1, []), color=(0, 255, 255))  # 노란색
+            result_frame = draw_boxes_on_frame(result_frame, tracked_by_class.get(2, []), color=(255, 0, 255))  # 마젠타색
+            for class_id in list(class_names)[2:]:
+                # 추가 클래스는 유니폼 색상으로 표시
+                result_frame = draw_boxes_on_frame(result_frame, tracked_by_class.get(class_id, []),
+                                                   color=tuple(int(c) for c in class_colors_bgr[class_id]))
             
             # 공 감지 결과 그리기
             result_frame = draw_ball_detection(result_frame, detected_ball_bboxes, color=(0, 255, 0))  # 초록색
             
             # 추적 정보 표시
-            team1_count, team2_count = tracker_manager.get_tracker_count()
-            cv2.putText(result_frame, f"Frame: {frame_count}/{total_frames} | Team1: {team1_count}, Team2: {team2_count}", 
+            team1_count, team2_count = len(tracked_by_class.get(1, [])), len(tracked_by_class.get(2, []))
+            extra_counts = "".join(f", {class_names[class_id]}: {len(tracked_by_class.get(class_id, []))}"
+                                   for class_id in list(class_names)[2:])
+            cv2.putText(result_frame, f"Frame: {frame_count}/{total_display} | Team1: {team1_count}, Team2: {team2_count}{extra_counts}", 
                        (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
             
             # 추적 모드 표시
@@ -244,7 +441,6 @@ def process_video(video_path, team1_color_rgb, team2_color_rgb, ball_color_rgb=N
                        (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
             
             # 공 정보 표시
-            ball_info = ball_tracker_manager.get_ball_info()
             if ball_info['active']:
                 possession_info = ball_info['possession']
                 cv2.putText(result_frame, f"Ball Active | Frames Lost: {ball_info['frames_lost']}", 
@@ -253,42 +449,45 @@ def process_video(video_path, team1_color_rgb, team2_color_rgb, ball_color_rgb=N
                 if possession_info['in_possession']:
                     cv2.putText(result_frame, f"Possession: Team {possession_info['team']} (Player {possession_info['player_id']})", 
                                (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-                else:
+                elif possession_info['distance'] is not None:
                     cv2.putText(result_frame, f"Free Ball | Closest: Team {possession_info['team']} ({possession_info['distance']:.1f}px)", 
                                (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                else:
+                    cv2.putText(result_frame, f"Free Ball", 
+                               (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
             else:
                 cv2.putText(result_frame, f"Ball Not Tracked", 
                            (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
             
-            # 프레임 데이터 전송 (Electron으로)
-            frame_bytes = result_frame.tobytes()
-            frame_size = len(frame_bytes)
-            
-            # 프레임 크기와 데이터 전송
-            sys.stdout.buffer.write(struct.pack('<IHH', frame_size, frame_width, frame_height))
-            sys.stdout.buffer.write(frame_bytes)
-            sys.stdout.buffer.flush()
-            
-            # 결과 프레임 저장
-            out.write(result_frame)
-            
-            # 진행률 표시
-            if frame_count % 30 == 0:  # 30프레임마다 진행률 출력
-                progress = (frame_count / total_frames) * 100
-                print(f"Progress: {progress:.1f}% ({frame_count}/{total_frames})", file=sys.stderr)
-            
-            # 프레임 카운트 증가
-            frame_count += 1
+            finish_frame(result_frame, frame_data, captured_at)
 
-    except Exception as e:
-        print(f"Error occurred: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+        completed = True
     finally:
+        # 처리 중 예외는 호출자에게 전달하고, 그때까지의 결과 파일만 정리해 저장
         cap.release()
         out.release()
+        if strip_extractor is not None:
+            strip_extractor.close()
         print(f"Video saved to: {output_path}", file=sys.stderr)
         
+        if detection_log is not None:
+            detection_log.close(trailer={
+                "shots": scene_detector.get_shot_boundaries() if scene_detector is not None else []})
+            print(f"Detections saved to: {record_detections} ({detection_log.num_frames} frames)", file=sys.stderr)
+        
+        possession_timeline.close()
+        print(f"Possession timeline saved to: {possession_output_path}", file=sys.stderr)
+        
+        try:
+            match_stats.write_summary(summary_output_path)
+            print(f"Match summary saved to: {summary_output_path}", file=sys.stderr)
+            player_heatmaps.export_npy(json_output_dir)
+            print(f"Player heatmaps saved to: {json_output_dir}", file=sys.stderr)
+        except Exception as e:
+            print(f"Error saving match summary: {e}", file=sys.stderr)
+        finally:
+            player_heatmaps.close()
+        
         # JSON 파일 저장
         try:
             with open(json_output_path, 'w') as f:
@@ -301,14 +500,121 @@ def process_video(video_path, team1_color_rgb, team2_color_rgb, ball_color_rgb=N
                         "frame_height": frame_height,
                         "team1_color": team1_color_rgb,
                         "team2_color": team2_color_rgb,
+                        "extra_classes": {name: list(color_rgb) for name, color_rgb in (extra_classes or [])},
                         "ball_color": ball_color_rgb if ball_color_rgb else [255, 255, 255],
-                        "tracker_debug_mode": tracker_debug_mode
+                        "tracker_debug_mode": tracker_debug_mode,
+                        "live": {
+                            "dropped_frames": cap.dropped_frames,
+                            "mean_latency_ms": latency_sum / latency_count * 1000 if latency_count else None,
+                            "max_latency_ms": latency_max * 1000
+                        } if cap.is_live else None
                     },
+                    "shots": scene_detector.get_shot_boundaries() if scene_detector is not None else [],
                     "frames": tracking_data
                 }, f, indent=2)
             print(f"Tracking data saved to: {json_output_path}", file=sys.stderr)
         except Exception as e:
             print(f"Error saving JSON file: {e}", file=sys.stderr)
+            completed = False
+        
+        # 결과/단계 캐시 저장 (중단된 처리는 저장하지 않음)
+        try:
+            if stage_recorder is not None:
+                if completed:
+                    stage_recorder.finish(dominant_colors)
+                else:
+                    stage_recorder.discard()
+            if completed and job_cache is not None:
+                job_cache.store_outputs(job_key, job_outputs, info={"video_path": video_path})
+                print(f"Results cached in: {cache_dir}", file=sys.stderr)
+        except OSError as e:
+            print(f"Error saving cache: {e}", file=sys.stderr)
+    
+    # 끝까지 처리하지 못했으면 (JSON 저장 실패) 잘린 결과를 가리키지 않도록 None
+    return json_output_path if completed else None
+
+def extract_player_boxes(frame, mask_not_green, colors_bgr, dominant_colors, extractor, strip_extractor=None):
+    """잔디가 아닌 영역에서 유니폼 색상별 선수 bbox 목록 추출 (colors_bgr가 None이면 색상 구분 없이 하나)"""
+    kernel = np.ones((5,5), np.uint8)
+    
+    def build_masks(y0, y1):
+        # 잔디가 아니고 유니폼 색상인 부분만 마스킹 후 노이즈 제거를 위한 모폴로지 연산
+        not_green = mask_not_green[y0:y1]
+        if colors_bgr is None:
+            masks = [not_green]
+        else:
+            masks = [cv2.bitwise_and(not_green, create_uniform_mask(frame[y0:y1], color)) for color in colors_bgr]
+        return [cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel) for mask in masks]
+    
+    if strip_extractor is None:
+        return [get_bounding_boxes(frame, mask, dominant_colors, extractor=extractor)
+                for mask in build_masks(0, frame.shape[0])]
+    # 띠별로 병렬 추출 후 경계에서 합친 후보에 필드 위치 확인
+    return [boxes_on_field(frame, boxes, dominant_colors)
+            for boxes in strip_extractor.extract(frame.shape[0], build_masks)]
+
+def replay_detections(log_path, output_dir, tracker_params=None):
+    """기록된 감지 결과만으로 추적을 다시 실행해 tracking_data.json과 점유 타임라인 저장 (감지/디코딩 없음)"""
+    log = DetectionLogReader(log_path)
+    header = log.header
+    fps = header["fps"]
+    class_names = {int(class_id): name for class_id, name in header["class_names"].items()}
+    calibration = PitchCalibration(header["homography"]) if header.get("homography") else None
+    grass_color = tuple(header["grass_color"])
+
+    session = TrackingSession(log.frame_width, log.frame_height, grass_color, class_names, fps,
+                              calibration=calibration, tracker_debug_mode=header["tracker_debug_mode"],
+                              tracker_params=tracker_params)
+
+    os.makedirs(output_dir, exist_ok=True)
+    possession_timeline = PossessionTimeline(os.path.join(output_dir, "possession_timeline.jsonl"), fps)
+    tracking_data = []
+    start = time.perf_counter()
+
+    try:
+        # 잘린 기록 파일은 ValueError로 중단 (tracking_data.json을 일부 결과로 덮어쓰지 않음)
+        for record in log:
+            appearance = LoggedAppearance(record["descriptors"]) if record["descriptors"] is not None else None
+            tracking = session.step(record, appearance=appearance)
+            ball_info = tracking["ball_info"]
+            tracking_data.append(tracking["frame_data"])
+            possession_timeline.update(record["frame_number"], ball_info['possession'] if ball_info['active'] else None)
+    finally:
+        possession_timeline.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {len(tracking_data)} frames in {elapsed:.2f}s "
+          f"({len(tracking_data) / max(elapsed, 1e-9):.0f} FPS)", file=sys.stderr)
+
+    json_output_path = os.path.join(output_dir, "tracking_data.json")
+    with open(json_output_path, 'w') as f:
+        json.dump({
+            "metadata": dict(header["metadata"], track_only=True, detection_log=log_path,
+                             tracker_params=tracker_params or {}),
+            "shots": log.trailer.get("shots", []),
+            "frames": tracking_data
+        }, f, indent=2)
+    print(f"Tracking data saved to: {json_output_path}", file=sys.stderr)
+    return json_output_path
+
+def write_frame_to_stdout(frame):
+    """프레임 크기 헤더 (<IHH: 바이트 수, 가로, 세로)와 BGR 데이터를 stdout으로 전송"""
+    frame_bytes = frame.tobytes()
+    frame_height, frame_width = frame.shape[:2]
+    sys.stdout.buffer.write(struct.pack('<IHH', len(frame_bytes), frame_width, frame_height))
+    sys.stdout.buffer.write(frame_bytes)
+    sys.stdout.buffer.flush()
+
+def report_progress(frame_count, total_frames, cap, mean_latency=None, max_latency=0.0):
+    """진행률 출력 (총 프레임 수를 모르는 실시간 입력은 처리 수, 버린 프레임, 지연 출력)"""
+    if total_frames > 0:
+        progress = (frame_count / total_frames) * 100
+        print(f"Progress: {progress:.1f}% ({frame_count}/{total_frames})", file=sys.stderr)
+    elif mean_latency is not None:
+        print(f"Live: {frame_count} frames, {cap.dropped_frames} dropped, "
+              f"latency {mean_latency * 1000:.1f}ms avg / {max_latency * 1000:.1f}ms max", file=sys.stderr)
+    else:
+        print(f"Live: {frame_count} frames, {cap.dropped_frames} dropped", file=sys.stderr)
 
 def process_frame(frame, team1_color, team2_color):
     # 여기에 프레임 처리 로직 추가
@@ -333,27 +639,90 @@ def main():
         print("🚀 Python main() started", file=sys.stderr)
         sys.stderr.flush()
         
-        # 디버깅: 실행 환경 정보 출력
-        print(f"Python executable: {sys.executable}", file=sys.stderr)
-        print(f"Python version: {sys.version}", file=sys.stderr)
-        print(f"Current working directory: {os.getcwd()}", file=sys.stderr)
-        print(f"Script path: {__file__}", file=sys.stderr)
-        print(f"Arguments: {sys.argv}", file=sys.stderr)
+        # 상주 분석 서버 모드 (패키징된 실행 파일 하나로 Electron이 서버를 띄울 수 있도록)
+        if sys.argv[1:2] == ['--serve']:
+            import server
+            return server.main(sys.argv[2:])
         
-        parser = argparse.ArgumentParser(description='Soccer Player Tracking')
-        parser.add_argument('video_path', help='Path to input video file')
+        parser = argparse.ArgumentParser(description='Soccer Player Tracking',
+                                         epilog='Run "main.py --serve [server options]" to start the analysis server')
+        parser.add_argument('video_path', help='Input video file, camera index (e.g. 0), stream URL, or - for raw BGR24 frames on stdin')
         parser.add_argument('--team1-color', nargs=3, type=int, help='Team 1 color (RGB)')
         parser.add_argument('--team2-color', nargs=3, type=int, help='Team 2 color (RGB)')
         parser.add_argument('--output-dir', help='Output directory path', default='output')
+        parser.add_argument('--no-scene-detection', action='store_true',
+                            help='Disable non-pitch shot skipping and tracker reset on scene cuts')
+        parser.add_argument('--extractor', choices=EXTRACTORS, default='contours',
+                            help='Player blob extractor (contours or connected components)')
+        parser.add_argument('--calibration', help='Pitch calibration JSON (image_points/pitch_points or homography) for metric tracking')
+        parser.add_argument('--auto-calibrate', action='store_true',
+                            help='Estimate pitch calibration from the grass area of the first frame (whole pitch must be visible)')
+        parser.add_argument('--no-camera-motion', action='store_true',
+                            help='Disable camera pan compensation of tracker predictions')
+        parser.add_argument('--class-color', nargs=4, action='append', default=[], metavar=('NAME', 'R', 'G', 'B'),
+                            help='Extra color class to track (e.g. referee, goalkeeper); repeatable, implies --team-mode blobs')
+        parser.add_argument('--record-detections', metavar='PATH',
+                            help='Save per-frame raw detections to a binary log for --track-only replays')
+        parser.add_argument('--track-only', action='store_true',
+                            help='Treat video_path as a detection log and rerun only the trackers (no decoding or detection)')
+        parser.add_argument('--tracker-param', nargs=2, action='append', default=[], metavar=('NAME', 'VALUE'),
+                            help='Override a tracker parameter, e.g. players.max_assignment_distance 40, '
+                                 'player.max_lost_frames_in_bounds 30, ball.max_lost_frames 20; repeatable')
+        parser.add_argument('--cache-dir', default=default_cache_dir(),
+                            help='Result cache directory (reruns of the same video and parameters reuse earlier outputs)')
+        parser.add_argument('--cache-size-mb', type=int, default=2048, help='Maximum result cache size before LRU eviction')
+        parser.add_argument('--no-cache', action='store_true', help='Always reprocess the video without reading or writing the cache')
+        parser.add_argument('--debug', action='store_true', help='Print Python environment diagnostics at startup')
+        parser.add_argument('--realtime', action='store_true',
+                            help='Replay a video file at its native frame rate as a live feed (stale frames are dropped)')
+        parser.add_argument('--stdin-size', nargs=2, type=int, default=[640, 360], metavar=('WIDTH', 'HEIGHT'),
+                            help='Frame size of raw BGR24 frames read from stdin')
+        parser.add_argument('--stdin-fps', type=float, default=25, help='Frame rate of raw frames read from stdin')
+        parser.add_argument('--team-mode', choices=TEAM_MODES, default='masks',
+                            help='Player detection: per-team color masks, or one non-grass blob pass with per-blob team classification')
+        parser.add_argument('--no-reid', action='store_true',
+                            help='Disable appearance-based re-identification of players that leave and reappear')
+        parser.add_argument('--strips', type=int, default=1,
+                            help='Split each frame into this many horizontal strips and extract player masks on a thread pool (uses connected components)')
+        parser.add_argument('--no-field-mask', action='store_true',
+                            help='Search for players and ball in the whole frame instead of only below the stands boundary')
         args = parser.parse_args()
+        
+        # 디버깅: 실행 환경 정보 출력 (--debug일 때만)
+        if args.debug:
+            print(f"Python executable: {sys.executable}", file=sys.stderr)
+            print(f"Python version: {sys.version}", file=sys.stderr)
+            print(f"Current working directory: {os.getcwd()}", file=sys.stderr)
+            print(f"Script path: {__file__}", file=sys.stderr)
+            print(f"Arguments: {sys.argv}", file=sys.stderr)
 
         # 팀 색상 설정
         team1_color = tuple(args.team1_color) if args.team1_color else (255, 0, 0)
         team2_color = tuple(args.team2_color) if args.team2_color else (0, 0, 255)
+        
+        # 추가 색상 클래스 (이름, RGB)
+        extra_classes = []
+        for name, r, g, b in args.class_color:
+            if name in ('team1', 'team2') or name in [n for n, _ in extra_classes]:
+                parser.error(f"Duplicate class name: {name}")
+            extra_classes.append((name, (int(r), int(g), int(b))))
+
+        # 추적 파라미터 튜닝 값 (숫자/불리언은 JSON으로 해석)
+        tracker_params = {}
+        for name, value in args.tracker_param:
+            try:
+                tracker_params[name] = json.loads(value)
+            except ValueError:
+                tracker_params[name] = value
 
         # 출력 경로 설정 (인자로 받은 경로 사용)
         output_dir = Path(args.output_dir)
         output_dir.mkdir(exist_ok=True)
+        
+        if args.track_only:
+            # 기록된 감지 결과로 추적만 다시 실행 (프레임 전송/영상 저장 없음)
+            replay_detections(args.video_path, str(output_dir), tracker_params)
+            return 0
         output_path = output_dir / 'tracked_video.mp4'
 
         print(f"✓ Starting video processing...", file=sys.stderr)
@@ -368,12 +737,32 @@ def main():
         print("📡 Starting video processing (stdout reserved for binary data)", file=sys.stderr)
 
         # process_video 함수 호출하여 실제 축구 추적 수행
-        process_video(
+        json_path = process_video(
             video_path=args.video_path,
             team1_color_rgb=team1_color,
             team2_color_rgb=team2_color,
-            output_path=str(output_path)
+            output_path=str(output_path),
+            scene_detection=not args.no_scene_detection,
+            extractor=args.extractor,
+            calibration_path=args.calibration,
+            auto_calibrate=args.auto_calibrate,
+            camera_motion=not args.no_camera_motion,
+            reid=not args.no_reid,
+            field_mask=not args.no_field_mask,
+            strips=args.strips,
+            team_mode=args.team_mode,
+            extra_classes=extra_classes,
+            realtime=args.realtime,
+            stdin_size=tuple(args.stdin_size),
+            stdin_fps=args.stdin_fps,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            cache_max_bytes=args.cache_size_mb << 20,
+            record_detections=args.record_detections,
+            tracker_params=tracker_params
         )
+        if json_path is None:
+            print(f"❌ Video processing failed", file=sys.stderr)
+            return 1
         
         print(f"✓ Video processing completed successfully!", file=sys.stderr)
         return 0
@@ -381,6 +770,7 @@ def main():
         print(f"Error occurred: {e}", file=sys.stderr)
         import traceback
         traceback.print_exc()
+        return 1
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
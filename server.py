@@ -0,0 +1,289 @@
+"""상주형 분석 서버
+
+Python 인터프리터와 OpenCV/NumPy 임포트를 한 번만 하고, 로컬 Unix 소켓 또는 localhost TCP로
+분석 작업을 받아 진행률/프레임/추적 결과를 스트리밍합니다.
+
+프로토콜 (한 줄에 JSON 하나):
+    요청  {"type": "analyze", "video_path": "...", "output_dir": "...",
+           "team1_color": [r, g, b], "team2_color": [r, g, b],
+           "options": {...process_video 인자...}, "send_frames": false, "frame_stride": 1, "send_tracks": true,
+           "progress_interval": 0.5}
+          {"type": "status"} / {"type": "ping"}
+    응답  {"event": "queued" | "started" | "progress" | "track" | "frame" | "done" | "error", "job_id": n, ...}
+          frame 이벤트의 "jpeg"는 base64로 인코딩된 JPEG
+          같은 output_dir를 쓰는 작업이 대기/실행 중이면 새 작업은 바로 error
+    준비  서버가 연결을 받기 시작하면 stdout에 {"event": "listening", "socket": ...} 또는
+          {"event": "listening", "host": ..., "port": ...} 한 줄 (--port 0이면 실제 포트)
+
+    python server.py --socket /tmp/soccer.sock
+    python main.py --serve --port 0 --exit-on-stdin-close   # 패키징된 실행 파일 (Electron이 실행)
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import cv2
+from main import process_video
+from tools.job_cache import default_cache_dir
+
+# 요청 options로 넘길 수 있는 process_video 인자
+JOB_OPTIONS = ("ball_color_rgb", "tracker_debug_mode", "scene_detection", "extractor", "calibration_path",
+               "auto_calibrate", "camera_motion", "reid", "team_mode", "extra_classes", "field_mask", "strips",
+               "realtime", "cache_dir", "cache_max_bytes", "record_detections", "tracker_params")
+
+class AnalysisServer:
+    """분석 작업을 스레드 풀에서 동시에 실행하고 결과를 연결별로 스트리밍하는 서버"""
+
+    def __init__(self, max_concurrent_jobs: int = 2, queue_size: int = 64, cache_dir: str = None):
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.cache_dir = cache_dir  # options에 cache_dir가 없는 작업의 결과 캐시 폴더 (None이면 캐시 안 함)
+        self.queue_size = queue_size  # 연결별 전송 대기 이벤트 수 (가득 차면 작업 스레드가 기다림)
+        self.semaphore = None
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent_jobs)
+        self.next_job_id = 1
+        self.jobs = {}  # job_id -> 상태 ("queued", "running", "done", "error")
+        self.output_dirs = {}  # 대기/실행 중인 작업이 쓰는 출력 폴더 (실제 경로) -> job_id
+        self.connections = {}  # 연결 처리 task -> writer
+
+    async def start(self, socket_path: str = None, host: str = "127.0.0.1", port: int = 8765,
+                    exit_on_stdin_close: bool = False):
+        """Unix 소켓 (socket_path) 또는 localhost TCP로 서버 시작
+
+        exit_on_stdin_close면 stdin이 닫힐 때 (서버를 띄운 부모 프로세스 종료) 서버를 멈춥니다.
+        """
+        self.semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle_client, path=socket_path)
+            address = {"socket": socket_path}
+            print(f"Analysis server listening on {socket_path}", file=sys.stderr)
+        else:
+            server = await asyncio.start_server(self.handle_client, host=host, port=port)
+            address = {"host": host, "port": server.sockets[0].getsockname()[1]}
+            print(f"Analysis server listening on {host}:{address['port']}", file=sys.stderr)
+        # 서버를 띄운 프로세스에 준비 완료와 실제 주소 알림
+        print(json.dumps({"event": "listening", **address}), flush=True)
+
+        async with server:
+            if exit_on_stdin_close:
+                stopped = asyncio.get_running_loop().create_future()
+                threading.Thread(target=self._wait_stdin_close, args=(asyncio.get_running_loop(), stopped),
+                                 daemon=True).start()
+                await stopped
+                await self._close_connections(server)
+            else:
+                await server.serve_forever()
+
+    async def _close_connections(self, server: asyncio.AbstractServer):
+        """새 연결을 받지 않고 열린 연결을 끊은 뒤 연결 처리가 끝날 때까지 대기
+
+        연결을 끊으면 요청 읽기가 EOF로 끝나므로 asyncio.run이 남은 연결 처리를 취소하지 않고 정상 종료합니다.
+        """
+        server.close()
+        for writer in self.connections.values():
+            writer.transport.abort()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+
+    @staticmethod
+    def _wait_stdin_close(loop: asyncio.AbstractEventLoop, stopped: asyncio.Future):
+        """stdin EOF까지 기다린 뒤 서버 종료 요청 (별도 스레드)"""
+        sys.stdin.buffer.read()
+        loop.call_soon_threadsafe(lambda: stopped.done() or stopped.set_result(None))
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """연결 하나 처리 - 요청마다 작업을 만들고, 모든 이벤트는 전송 큐 하나로 순서대로 기록"""
+        outgoing = asyncio.Queue(maxsize=self.queue_size)
+        sender = asyncio.create_task(self._send_events(outgoing, writer))
+        job_tasks = []
+        connection = asyncio.current_task()
+        self.connections[connection] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+                    # 연결이 끊기거나 줄이 너무 길면 더 읽지 않고 진행 중인 작업만 마무리
+                    print(f"Client connection lost: {e!r}", file=sys.stderr)
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    await outgoing.put({"event": "error", "error": f"Invalid JSON: {e}"})
+                    continue
+
+                request_type = request.get("type", "analyze")
+                if request_type == "ping":
+                    await outgoing.put({"event": "pong"})
+                elif request_type == "status":
+                    await outgoing.put({"event": "status", "jobs": {str(k): v for k, v in self.jobs.items()},
+                                        "max_concurrent_jobs": self.max_concurrent_jobs})
+                elif request_type == "analyze":
+                    job_tasks.append(asyncio.create_task(self._run_job(request, outgoing)))
+                else:
+                    await outgoing.put({"event": "error", "error": f"Unknown request type: {request_type}"})
+        finally:
+            # 입력이 끝나거나 연결이 끊겨도 진행 중인 작업이 끝날 때까지 전송 큐를 비움
+            # (그 전에 전송을 멈추면 작업 스레드가 가득 찬 큐에서 영원히 기다림)
+            if job_tasks:
+                await asyncio.gather(*job_tasks, return_exceptions=True)
+            await outgoing.put(None)
+            await sender
+            writer.close()
+            del self.connections[connection]
+
+    async def _send_events(self, outgoing: asyncio.Queue, writer: asyncio.StreamWriter):
+        """전송 큐의 이벤트를 JSON 줄로 기록 (None이면 종료)"""
+        connected = True
+        while True:
+            event = await outgoing.get()
+            if event is None:
+                return
+            if not connected or writer.is_closing():
+                continue  # 연결이 끊겨도 작업은 끝까지 실행하고 이벤트는 버림
+            try:
+                writer.write(json.dumps(event).encode() + b"\n")
+                await writer.drain()
+            except (ConnectionError, RuntimeError):
+                connected = False
+
+    async def _run_job(self, request: dict, outgoing: asyncio.Queue):
+        """동시 실행 수 제한 안에서 process_video를 작업 스레드로 실행"""
+        job_id = self.next_job_id
+        self.next_job_id += 1
+        received_at = time.monotonic()
+        self.jobs[job_id] = "queued"
+        await outgoing.put({"event": "queued", "job_id": job_id})
+
+        try:
+            kwargs = self._build_job_kwargs(request)
+        except (KeyError, TypeError, ValueError) as e:
+            self.jobs[job_id] = "error"
+            await outgoing.put({"event": "error", "job_id": job_id, "error": f"Invalid request: {e}"})
+            return
+
+        # 결과 파일 이름이 고정이라 같은 출력 폴더를 쓰는 작업이 동시에 돌면 서로의 결과를 덮어씀
+        output_dir = os.path.realpath(os.path.dirname(kwargs["output_path"]))
+        owner = self.output_dirs.get(output_dir)
+        if owner is not None:
+            self.jobs[job_id] = "error"
+            await outgoing.put({"event": "error", "job_id": job_id,
+                                "error": f"Output directory is in use by job {owner}: {output_dir}"})
+            return
+        self.output_dirs[output_dir] = job_id
+        try:
+            await self._execute_job(job_id, kwargs, request, outgoing, received_at)
+        finally:
+            del self.output_dirs[output_dir]
+
+    async def _execute_job(self, job_id: int, kwargs: dict, request: dict, outgoing: asyncio.Queue,
+                           received_at: float):
+        """결과 이벤트를 보내며 process_video 실행 (출력 폴더는 이 작업이 점유한 상태)"""
+        loop = asyncio.get_running_loop()
+
+        def emit(event: dict):
+            """작업 스레드에서 이벤트 전송 (큐가 가득 차면 대기해 느린 클라이언트에 맞춤)"""
+            event["job_id"] = job_id
+            asyncio.run_coroutine_threadsafe(outgoing.put(event), loop).result()
+
+        send_frames = bool(request.get("send_frames", False))
+        send_tracks = bool(request.get("send_tracks", True))
+        frame_stride = max(1, int(request.get("frame_stride", 1)))
+        progress_interval = max(0.0, float(request.get("progress_interval", 0.5)))  # 진행률 전송 최소 간격 (초)
+        sent_frames = [0]
+        last_progress = [0.0]
+
+        def frame_sink(frame):
+            sent_frames[0] += 1
+            if send_frames and sent_frames[0] % frame_stride == 0:
+                ok, jpeg = cv2.imencode(".jpg", frame)
+                if ok:
+                    emit({"event": "frame", "index": sent_frames[0],
+                          "jpeg": base64.b64encode(jpeg.tobytes()).decode("ascii")})
+
+        def track_sink(frame_data):
+            if send_tracks:
+                emit({"event": "track", "frame": frame_data})
+
+        def progress_sink(frame_count, total_frames):
+            now = time.monotonic()
+            if now - last_progress[0] >= progress_interval:
+                last_progress[0] = now
+                emit({"event": "progress", "frame": frame_count, "total_frames": total_frames})
+
+        async with self.semaphore:
+            self.jobs[job_id] = "running"
+            startup_ms = (time.monotonic() - received_at) * 1000
+            await outgoing.put({"event": "started", "job_id": job_id, "startup_ms": round(startup_ms, 2)})
+            try:
+                json_path = await loop.run_in_executor(
+                    self.executor,
+                    lambda: process_video(frame_sink=frame_sink, track_sink=track_sink,
+                                          progress_sink=progress_sink, show_window=False, **kwargs))
+            except Exception as e:
+                # 처리 도중 실패한 작업 (잘린 결과 파일은 done으로 알리지 않음)
+                print(f"Job {job_id} failed: {e!r}", file=sys.stderr)
+                self.jobs[job_id] = "error"
+                await outgoing.put({"event": "error", "job_id": job_id, "error": str(e) or type(e).__name__})
+                return
+
+        if json_path is None:
+            self.jobs[job_id] = "error"
+            await outgoing.put({"event": "error", "job_id": job_id,
+                                "error": "Could not read the video or save the results"})
+            return
+        self.jobs[job_id] = "done"
+        await outgoing.put({"event": "done", "job_id": job_id, "tracking_data": json_path,
+                            "output_video": kwargs["output_path"],
+                            "elapsed_s": round(time.monotonic() - received_at, 3)})
+
+    def _build_job_kwargs(self, request: dict) -> dict:
+        """요청을 process_video 인자로 변환 (main.py CLI와 같은 기본값)"""
+        output_dir = Path(request.get("output_dir", "output"))
+        output_dir.mkdir(parents=True, exist_ok=True)
+        kwargs = {
+            "video_path": str(request["video_path"]),
+            "team1_color_rgb": tuple(int(c) for c in request.get("team1_color", (255, 0, 0))),
+            "team2_color_rgb": tuple(int(c) for c in request.get("team2_color", (0, 0, 255))),
+            "output_path": str(output_dir / "tracked_video.mp4"),
+        }
+        options = request.get("options", {})
+        unknown = set(options) - set(JOB_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown options: {sorted(unknown)}")
+        kwargs["cache_dir"] = self.cache_dir
+        kwargs.update(options)
+        return kwargs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Soccer tracking analysis server')
+    parser.add_argument('--socket', help='Unix socket path (default: localhost TCP)')
+    parser.add_argument('--host', default='127.0.0.1', help='TCP host (localhost only by default)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port (0 picks a free port)')
+    parser.add_argument('--max-jobs', type=int, default=2, help='Maximum number of concurrently running jobs')
+    parser.add_argument('--cache-dir', default=default_cache_dir(),
+                        help='Result cache directory for jobs that do not set options.cache_dir')
+    parser.add_argument('--no-cache', action='store_true', help='Do not cache results unless a job sets options.cache_dir')
+    parser.add_argument('--exit-on-stdin-close', action='store_true',
+                        help='Stop when stdin is closed (used when launched by the desktop app)')
+    args = parser.parse_args(argv)
+
+    server = AnalysisServer(max_concurrent_jobs=args.max_jobs, cache_dir=None if args.no_cache else args.cache_dir)
+    try:
+        asyncio.run(server.start(socket_path=args.socket, host=args.host, port=args.port,
+                                 exit_on_stdin_close=args.exit_on_stdin_close))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    main()
@@ -30,25 +30,49 @@ const VideoPlayer = () => {
       setIsPlaying(true);
     });
 
-    window.electron.ipcRenderer.on('frame-data', (frameData) => {
-      console.log('Frame received:', frameData.width, 'x', frameData.height);
+    // 캔버스 크기 조정 (최대 1280x720 안에서 비율 유지)
+    const fitCanvas = (frameWidth, frameHeight) => {
+      const aspectRatio = frameWidth / frameHeight;
+      const maxWidth = 1280;
+      const maxHeight = 720;
+      
+      let width = maxWidth;
+      let height = width / aspectRatio;
       
+      if (height > maxHeight) {
+        height = maxHeight;
+        width = height * aspectRatio;
+      }
+      
+      canvas.width = width;
+      canvas.height = height;
+      return { width, height };
+    };
+
+    // 분석 서버 프레임 (JPEG) - 디코딩이 비동기이므로 늦게 끝난 이전 프레임은 그리지 않음
+    let latestJpegFrame = 0;
+    const drawJpegFrame = async (jpeg) => {
+      const frameIndex = ++latestJpegFrame;
       try {
-        // 캔버스 크기 조정
-        const aspectRatio = frameData.width / frameData.height;
-        const maxWidth = 1280;
-        const maxHeight = 720;
-        
-        let width = maxWidth;
-        let height = width / aspectRatio;
-        
-        if (height > maxHeight) {
-          height = maxHeight;
-          width = height * aspectRatio;
+        const bitmap = await createImageBitmap(new Blob([jpeg], { type: 'image/jpeg' }));
+        if (frameIndex === latestJpegFrame) {
+          const { width, height } = fitCanvas(bitmap.width, bitmap.height);
+          ctx.drawImage(bitmap, 0, 0, width, height);
         }
-        
-        canvas.width = width;
-        canvas.height = height;
+        bitmap.close();
+      } catch (error) {
+        console.error('Error decoding frame:', error);
+      }
+    };
+
+    window.electron.ipcRenderer.on('frame-data', (frameData) => {
+      if (frameData.jpeg) {
+        drawJpegFrame(frameData.jpeg);
+        return;
+      }
+      
+      try {
+        const { width, height } = fitCanvas(frameData.width, frameData.height);
 
         // OpenCV BGR 데이터를 RGBA로 변환
         const bgrData = new Uint8Array(frameData.data);
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 저장소 루트의 tools 패키지와 main.py를 테스트에서 임포트
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,191 @@
+"""tools/kernels.py 커널이 대체한 이전 스칼라 구현과 같은 결과를 내는지 확인하는 테스트
+
+이전 구현 (is_near_player, filter_ball_by_field_position, _filter_candidates_near_players,
+_assign_candidates_to_trackers, 거리 행렬, examples/blur.py의 관중석 경계)을 참조 구현으로 그대로 두고,
+커널을 쓰는 공개 API 결과를 컴파일된 루프와 NumPy 두 백엔드 모두에서 비교합니다.
+"""
+import numpy as np
+import pytest
+
+from tools import kernels
+from tools.ball_detection import is_near_player, filter_ball_by_field_position
+from tools.ball_tracker import BallTracker, BallTrackerManager
+
+# --- 이전 스칼라 구현 (참조) ---
+
+def reference_is_near_player(ball_center, player_bboxes, distance_threshold=20):
+    if not player_bboxes:
+        return False
+    ball_x, ball_y = ball_center
+    for px, py, pw, ph in player_bboxes:
+        if px <= ball_x <= px + pw and py <= ball_y <= py + ph:
+            return True
+        if (px - distance_threshold <= ball_x <= px + pw + distance_threshold and
+                py - distance_threshold <= ball_y <= py + ph + distance_threshold):
+            return True
+    return False
+
+def reference_filter_ball_by_field_position(ball_bboxes, frame_shape):
+    if not ball_bboxes:
+        return ball_bboxes
+    height, width = frame_shape[:2]
+    margin_x = width // 10
+    margin_y = height // 10
+    filtered_balls = []
+    for x, y, w, h in ball_bboxes:
+        center_x = x + w // 2
+        center_y = y + h // 2
+        if margin_x < center_x < width - margin_x and margin_y < center_y < height - margin_y:
+            filtered_balls.append((x, y, w, h))
+    return filtered_balls
+
+def reference_filter_candidates_near_players(manager, ball_centers, player_positions):
+    filtered_centers = []
+    for ball_center in ball_centers:
+        too_close_to_player = False
+        for player_pos in player_positions:
+            if manager._calculate_distance(ball_center, player_pos) < manager.min_distance_to_player:
+                too_close_to_player = True
+                break
+        if not too_close_to_player:
+            filtered_centers.append(ball_center)
+    return filtered_centers
+
+def reference_distance_matrix(points_a, points_b):
+    diff = np.asarray(points_a)[:, None, :] - np.asarray(points_b)[None, :, :]
+    return np.sqrt(np.sum(diff * diff, axis=2).astype(np.float64))
+
+def reference_assign_candidates_to_trackers(manager, ball_centers):
+    assignments = {}
+    if not manager.trackers or not ball_centers:
+        return assignments
+    predicted = np.array([t.get_predicted_position() for t in manager.trackers], dtype=np.float64)
+    distances = reference_distance_matrix(predicted, np.array(ball_centers, dtype=np.float64))
+    best_indices = np.argmin(distances, axis=1)
+    best_distances = distances[np.arange(len(manager.trackers)), best_indices]
+    tracker_candidate_distances = [
+        (i, candidate_idx, distance)
+        for i, (candidate_idx, distance) in enumerate(zip(best_indices.tolist(), best_distances.tolist()))
+        if distance <= manager.distance_threshold
+    ]
+    tracker_candidate_distances.sort(key=lambda x: x[2])
+    used_candidates = set()
+    for tracker_idx, candidate_idx, distance in tracker_candidate_distances:
+        if candidate_idx not in used_candidates:
+            assignments[tracker_idx] = (candidate_idx, distance)
+            used_candidates.add(candidate_idx)
+    return assignments
+
+def reference_spectator_cutoffs(mask, n):
+    height, width = mask.shape
+    slice_width = width // n
+    cutoff_rows = []
+    for i in range(n):
+        start_col = i * slice_width
+        end_col = (i + 1) * slice_width if i < n - 1 else width
+        current_slice = mask[:, start_col:end_col]
+        white_threshold = int((end_col - start_col) * 0.3)
+        slice_cutoff = height
+        for row_idx in range(height):
+            if np.count_nonzero(current_slice[row_idx] == 255) <= white_threshold:
+                slice_cutoff = row_idx
+                break
+        cutoff_rows.append(slice_cutoff)
+    return cutoff_rows
+
+# --- 백엔드 선택 ---
+
+@pytest.fixture(params=["loop", "numpy"])
+def backend(request, monkeypatch):
+    """공개 커널 함수가 쓰는 구현을 스칼라 루프 (Numba가 있으면 컴파일본) 또는 NumPy로 교체"""
+    for name, (loop_func, numpy_func) in kernels.KERNELS.items():
+        if request.param == "numpy":
+            implementation = numpy_func
+        else:
+            implementation = kernels._select(loop_func, numpy_func) if kernels.USE_NUMBA else loop_func
+        monkeypatch.setattr(kernels, f"_{name}", implementation)
+    return request.param
+
+def random_bboxes(rng, count):
+    return [tuple(int(v) for v in (*rng.integers(-40, 680, 2), *rng.integers(0, 60, 2))) for _ in range(count)]
+
+# --- 테스트 ---
+
+def test_is_near_player_matches_reference(backend):
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        bboxes = random_bboxes(rng, int(rng.integers(0, 12)))
+        center = tuple(int(v) for v in rng.integers(-40, 680, 2))
+        threshold = int(rng.integers(0, 30))
+        assert is_near_player(center, bboxes, threshold) == reference_is_near_player(center, bboxes, threshold)
+
+def test_is_near_player_edges(backend):
+    bbox = [(100, 100, 20, 40)]
+    # 확장된 bbox 경계는 포함, 한 픽셀 밖은 제외
+    for center, expected in [((80, 100), True), ((79, 100), False), ((140, 160), True), ((141, 160), False),
+                             ((110, 120), True), ((110, 80), True), ((110, 79), False)]:
+        assert is_near_player(center, bbox, 20) == expected == reference_is_near_player(center, bbox, 20)
+    assert is_near_player((5, 5), [], 20) is False
+
+def test_filter_ball_by_field_position_matches_reference(backend):
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        bboxes = random_bboxes(rng, int(rng.integers(0, 20)))
+        assert (filter_ball_by_field_position(bboxes, (360, 640)) ==
+                reference_filter_ball_by_field_position(bboxes, (360, 640)))
+    # 중심이 마진 경계 (64, 36)와 (576, 324)에 정확히 걸리는 bbox는 제외
+    edges = [(62, 100, 4, 4), (63, 100, 4, 4), (574, 100, 4, 4), (573, 100, 4, 4), (300, 34, 4, 4), (300, 322, 4, 4)]
+    assert filter_ball_by_field_position(edges, (360, 640)) == reference_filter_ball_by_field_position(edges, (360, 640))
+    assert filter_ball_by_field_position([], (360, 640)) == []
+
+def test_filter_candidates_near_players_matches_reference(backend):
+    rng = np.random.default_rng(2)
+    manager = BallTrackerManager(640, 360, (40, 140, 40))
+    for _ in range(200):
+        balls = [tuple(int(v) for v in p) for p in rng.integers(0, 640, (int(rng.integers(0, 15)), 2))]
+        players = [tuple(int(v) for v in p) for p in rng.integers(0, 640, (int(rng.integers(0, 15)), 2))]
+        assert (manager._filter_candidates_near_players(balls, players) ==
+                reference_filter_candidates_near_players(manager, balls, players))
+    # 정확히 min_distance (25 = 15-20-25 삼각형) 떨어진 후보는 남김
+    balls = [(100, 100), (115, 120), (114, 120)]
+    assert (manager._filter_candidates_near_players(balls, [(100, 100 + 25), (130, 140)]) ==
+            reference_filter_candidates_near_players(manager, balls, [(100, 100 + 25), (130, 140)]))
+    assert manager._filter_candidates_near_players([(1, 1)], []) == [(1, 1)]
+    assert manager._filter_candidates_near_players([], [(1, 1)]) == []
+
+def test_assign_candidates_to_trackers_matches_reference(backend):
+    rng = np.random.default_rng(3)
+    manager = BallTrackerManager(640, 360, (40, 140, 40))
+    for _ in range(300):
+        # 좁은 격자 좌표로 같은 거리 (동점)가 자주 생기게 함
+        manager.trackers = []
+        for i in range(int(rng.integers(0, 8))):
+            tracker = BallTracker(tuple(int(v) for v in rng.integers(0, 12, 2) * 5), i)
+            tracker.dx, tracker.dy = (float(v) for v in rng.integers(-2, 3, 2))
+            manager.trackers.append(tracker)
+        balls = [tuple(int(v) for v in p) for p in rng.integers(0, 12, (int(rng.integers(0, 8)), 2)) * 5]
+        assert manager._assign_candidates_to_trackers(balls) == reference_assign_candidates_to_trackers(manager, balls)
+
+def test_pairwise_distances_matches_reference(backend):
+    rng = np.random.default_rng(4)
+    for _ in range(100):
+        a = rng.integers(-100, 700, (int(rng.integers(0, 20)), 2))
+        b = rng.integers(-100, 700, (int(rng.integers(0, 20)), 2))
+        assert np.array_equal(kernels.pairwise_distances(a, b), reference_distance_matrix(a, b))
+        af, bf = a + rng.random(a.shape), b + rng.random(b.shape)
+        assert np.array_equal(kernels.pairwise_distances(af, bf), reference_distance_matrix(af, bf))
+
+def test_greedy_assign_empty(backend):
+    rows, cols, distances = kernels.greedy_assign(np.zeros((0, 3)), 10)
+    assert rows.size == cols.size == distances.size == 0
+    rows, cols, distances = kernels.greedy_assign(np.zeros((3, 0)), 10)
+    assert rows.size == cols.size == distances.size == 0
+
+def test_spectator_cutoffs_matches_reference(backend):
+    rng = np.random.default_rng(5)
+    for _ in range(50):
+        mask = np.where(rng.random((90, 160)) < rng.random(), 255, 0).astype(np.uint8)
+        mask[:int(rng.integers(0, 90))] = 255  # 위쪽 관중석 영역
+        n = int(rng.integers(1, 8))
+        assert kernels.spectator_cutoffs(mask, n).tolist() == reference_spectator_cutoffs(mask, n)
+    assert kernels.spectator_cutoffs(np.full((20, 30), 255, np.uint8), 3).tolist() == [20, 20, 20]
@@ -0,0 +1,64 @@
+"""TrackingSession 동시 실행 테스트
+
+세션끼리 공유 상태가 없어 여러 세션을 스레드 풀에서 동시에 실행해도 순차 실행과 결과가 비트 단위로 같은지 확인합니다.
+"""
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.tracker_bench import synthetic_stream, CLASS_NAMES, FPS, FRAME_HEIGHT, FRAME_WIDTH, GRASS_COLOR
+from tools.tracking_session import TrackingSession
+
+def varied_stream(seed: int, num_frames: int = 80) -> list:
+    """합성 감지 스트림에 장면 전환, 건너뛴 프레임, 카메라 이동을 섞은 스트림"""
+    rng = np.random.default_rng(seed + 1000)
+    records = list(synthetic_stream(num_players=22, num_frames=num_frames, seed=seed))
+    for record in records:
+        record["camera_shift"] = tuple(float(v) for v in rng.normal(0, 1.5, 2).round(2))
+        record["is_cut"] = record["frame_number"] % 37 == 0
+        record["skipped"] = record["frame_number"] % 29 == 0
+    return records
+
+def session_digest(records, tracker_debug_mode: bool = False) -> str:
+    """세션 하나를 끝까지 실행한 결과 스냅샷 (프레임 JSON + tracker bbox 배열)의 해시"""
+    session = TrackingSession(FRAME_WIDTH, FRAME_HEIGHT, GRASS_COLOR, CLASS_NAMES, FPS,
+                              tracker_debug_mode=tracker_debug_mode)
+    digest = hashlib.blake2b(digest_size=16)
+    for record in records:
+        tracking = session.step(record)
+        digest.update(json.dumps(tracking["frame_data"], sort_keys=True).encode())
+        if tracking["player_snapshot"] is not None:
+            digest.update(tracking["player_snapshot"]["tracker_ids"].tobytes())
+            digest.update(tracking["player_snapshot"]["bboxes"].tobytes())
+    return digest.hexdigest()
+
+def test_concurrent_sessions_match_sequential():
+    streams = [varied_stream(seed) for seed in range(4)]
+    expected = [session_digest(stream) for stream in streams]
+    assert len(set(expected)) == len(streams)  # 스트림마다 다른 결과여야 비교가 의미 있음
+
+    # 같은 스트림 (같은 레코드 객체)을 두 세션이 동시에 읽도록 두 번씩 실행
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(session_digest, streams + streams))
+    assert results == expected + expected
+
+def test_concurrent_debug_mode_sessions_match_sequential():
+    streams = [varied_stream(seed, num_frames=40) for seed in range(2)]
+    expected = [session_digest(stream, True) for stream in streams]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda stream: session_digest(stream, True), streams + streams))
+    assert results == expected + expected
+
+def test_interleaved_sessions_are_independent():
+    # 한 스레드에서 두 세션을 번갈아 진행해도 각자 따로 실행한 결과와 같음
+    streams = [varied_stream(seed, num_frames=50) for seed in (7, 8)]
+    sessions = [TrackingSession(FRAME_WIDTH, FRAME_HEIGHT, GRASS_COLOR, CLASS_NAMES, FPS) for _ in streams]
+    interleaved = [[], []]
+    for records in zip(*streams):
+        for index, (session, record) in enumerate(zip(sessions, records)):
+            interleaved[index].append(session.step(record)["frame_data"])
+    for stream, frames in zip(streams, interleaved):
+        session = TrackingSession(FRAME_WIDTH, FRAME_HEIGHT, GRASS_COLOR, CLASS_NAMES, FPS)
+        assert [session.step(record)["frame_data"] for record in stream] == frames
@@ -0,0 +1,139 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+APPEARANCE_BINS = (8, 4, 4)  # H, S, V 양자화 단계 (총 128 bin)
+
+def gather_box_pixels(bboxes, frame_width: int, frame_height: int):
+    """여러 bbox 내부 픽셀의 (bbox 번호, 평탄화된 픽셀 인덱스)를 한 번에 생성"""
+    bboxes = np.asarray(bboxes, dtype=np.int64).reshape(-1, 4)
+    x1 = np.clip(bboxes[:, 0], 0, frame_width)
+    y1 = np.clip(bboxes[:, 1], 0, frame_height)
+    x2 = np.clip(bboxes[:, 0] + bboxes[:, 2], 0, frame_width)
+    y2 = np.clip(bboxes[:, 1] + bboxes[:, 3], 0, frame_height)
+    widths = np.maximum(x2 - x1, 0)
+    counts = widths * np.maximum(y2 - y1, 0)
+
+    labels = np.repeat(np.arange(len(bboxes)), counts)
+    # bbox마다 0부터 시작하는 픽셀 순번을 가로 길이로 나눠 행/열 계산
+    starts = np.cumsum(counts) - counts
+    local = np.arange(counts.sum()) - np.repeat(starts, counts)
+    row_widths = np.repeat(widths, counts)
+    ys = np.repeat(y1, counts) + local // np.maximum(row_widths, 1)
+    xs = np.repeat(x1, counts) + local % np.maximum(row_widths, 1)
+    return labels, ys * frame_width + xs
+
+def quantize_hsv(hsv_pixels: np.ndarray, bins: Tuple[int, int, int] = APPEARANCE_BINS) -> np.ndarray:
+    """OpenCV HSV 픽셀 (N, 3)을 색상 bin 번호로 양자화 (H는 0~179)"""
+    hsv_pixels = hsv_pixels.astype(np.int64)
+    h_bins, s_bins, v_bins = bins
+    h = np.minimum(hsv_pixels[:, 0] * h_bins // 180, h_bins - 1)
+    s = hsv_pixels[:, 1] * s_bins // 256
+    v = hsv_pixels[:, 2] * v_bins // 256
+    return (h * s_bins + s) * v_bins + v
+
+class AppearanceFrame:
+    """프레임당 한 번 변환한 HSV 영상과 잔디 마스크로 bbox들의 외형 기술자를 일괄 계산하는 클래스"""
+
+    def __init__(self, frame_hsv: np.ndarray, grass_mask: np.ndarray,
+                 bins: Tuple[int, int, int] = APPEARANCE_BINS):
+        self.frame_height, self.frame_width = frame_hsv.shape[:2]
+        self.hsv_pixels = frame_hsv.reshape(-1, 3)
+        self.grass_pixels = grass_mask.reshape(-1)
+        self.bins = bins
+        self.num_bins = bins[0] * bins[1] * bins[2]
+
+    def descriptors(self, bboxes) -> np.ndarray:
+        """bbox 안의 잔디가 아닌 픽셀로 정규화된 색상 히스토그램 (N, num_bins) 계산"""
+        num_boxes = len(bboxes)
+        if num_boxes == 0:
+            return np.zeros((0, self.num_bins), dtype=np.float32)
+
+        labels, flat_indices = gather_box_pixels(bboxes, self.frame_width, self.frame_height)
+        keep = self.grass_pixels[flat_indices] == 0
+        labels = labels[keep]
+        colors = quantize_hsv(self.hsv_pixels[flat_indices[keep]], self.bins)
+
+        # 모든 bbox의 히스토그램을 bincount 한 번으로 계산
+        hist = np.bincount(labels * self.num_bins + colors, minlength=num_boxes * self.num_bins)
+        hist = hist.reshape(num_boxes, self.num_bins).astype(np.float32)
+        return hist / np.maximum(hist.sum(axis=1, keepdims=True), 1)
+
+def histogram_distances(queries: np.ndarray, gallery: np.ndarray) -> np.ndarray:
+    """정규화된 히스토그램 사이의 Hellinger 거리 행렬 (Q, G) 계산 (0: 같음, 1: 겹치지 않음)"""
+    coefficients = np.sqrt(queries) @ np.sqrt(gallery).T  # Bhattacharyya 계수
+    return np.sqrt(np.maximum(1.0 - coefficients, 0.0))
+
+class AppearanceGallery:
+    """최근에 사라진 tracker의 외형 기술자를 고정 크기 배열에 보관하고 재등장 시 ID를 되찾는 LRU 갤러리
+
+    가득 차면 가장 오래 전에 사라진 항목을 덮어씁니다. 같은 팀, 마지막 위치에서 이동 가능한 거리,
+    히스토그램 거리 조건을 모두 만족하는 항목 중 가까운 순서로 한 번씩만 매칭합니다.
+    """
+
+    def __init__(self, num_bins: int, max_size: int = 32, max_distance: float = 0.35,
+                 max_age_frames: int = 250, max_speed: float = 8.0):
+        self.max_size = max_size
+        self.max_distance = max_distance  # 이보다 히스토그램 거리가 멀면 다른 선수로 판단
+        self.max_age_frames = max_age_frames  # 이보다 오래 전에 사라진 항목은 매칭하지 않음
+        self.max_speed = max_speed  # 사라진 동안 이동할 수 있는 최대 속도 (픽셀/프레임)
+
+        self.descriptors = np.zeros((max_size, num_bins), dtype=np.float32)
+        self.tracker_ids = np.full(max_size, -1, dtype=np.int64)  # -1은 빈 슬롯
+        self.team_ids = np.zeros(max_size, dtype=np.int64)
+        self.positions = np.zeros((max_size, 2), dtype=np.float64)
+        self.lost_frames = np.zeros(max_size, dtype=np.int64)  # 사라진 시점 (프레임 인덱스)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.tracker_ids >= 0))
+
+    def add(self, tracker_id: int, team_id: int, descriptor: np.ndarray,
+            position: Tuple[float, float], frame_index: int):
+        """사라진 tracker 등록 (빈 슬롯이 없으면 가장 오래된 항목 교체)"""
+        empty = np.flatnonzero(self.tracker_ids < 0)
+        if len(empty) > 0:
+            slot = empty[0]
+        else:
+            slot = int(np.argmin(self.lost_frames))
+        self.descriptors[slot] = descriptor
+        self.tracker_ids[slot] = tracker_id
+        self.team_ids[slot] = team_id
+        self.positions[slot] = position
+        self.lost_frames[slot] = frame_index
+
+    def shift_positions(self, dx: int, dy: int):
+        """카메라 이동만큼 저장된 마지막 위치 이동"""
+        self.positions += (dx, dy)
+
+    def match(self, descriptors: np.ndarray, team_ids, centers, frame_index: int) -> List[Optional[int]]:
+        """새 bbox들에 대해 되찾을 tracker ID 반환 (매칭되지 않으면 None), 매칭된 항목은 갤러리에서 제거"""
+        num_queries = len(descriptors)
+        matched = [None] * num_queries
+        if num_queries == 0 or len(self) == 0:
+            return matched
+
+        team_ids = np.asarray(team_ids, dtype=np.int64)
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        ages = frame_index - self.lost_frames
+
+        distances = histogram_distances(descriptors, self.descriptors)
+        travel = np.hypot(centers[:, None, 0] - self.positions[None, :, 0],
+                          centers[:, None, 1] - self.positions[None, :, 1])
+        invalid = ((self.tracker_ids < 0) | (ages > self.max_age_frames))[None, :]
+        invalid = invalid | (team_ids[:, None] != self.team_ids[None, :])
+        invalid = invalid | (travel > self.max_speed * np.maximum(ages, 1)[None, :])
+        distances[invalid] = np.inf
+
+        # 가까운 쌍부터 한 번씩만 매칭
+        query_idx, slot_idx = np.nonzero(distances < self.max_distance)
+        order = np.argsort(distances[query_idx, slot_idx], kind='stable')
+        used_queries, used_slots = set(), set()
+        for q, s in zip(query_idx[order].tolist(), slot_idx[order].tolist()):
+            if q in used_queries or s in used_slots:
+                continue
+            matched[q] = int(self.tracker_ids[s])
+            used_queries.add(q)
+            used_slots.add(s)
+
+        for s in used_slots:
+            self.tracker_ids[s] = -1
+        return matched
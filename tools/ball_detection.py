@@ -3,6 +3,8 @@ import numpy as np
 from typing import List, Tuple, Optional
 import math
 from .color_utils import create_uniform_mask, bgr_range
+from .integral_image import IntegralImage
+from .kernels import near_boxes, centers_inside_margin
 
 def calculate_compactness(contour) -> float:
     """윤곽선의 compactness 계산 (1에 가까울수록 원형)"""
@@ -59,44 +61,33 @@ def is_ball_candidate(contour, min_area: int = 4, max_area: int = 64,
 
 def is_near_player(ball_center: Tuple[int, int], player_bboxes: List[Tuple[int, int, int, int]], 
                    distance_threshold: int = 20) -> bool:
-    """공 중심점이 선수 bbox 안에 있거나 너무 가까운지 확인"""
+    """공 중심점이 선수 bbox 안에 있거나 너무 가까운지 확인 (bbox를 distance_threshold만큼 확장)"""
     if not player_bboxes:
         return False
-    
-    ball_x, ball_y = ball_center
-    
-    for bbox in player_bboxes:
-        px, py, pw, ph = bbox
-        
-        # bbox 안에 있는지 확인
-        if px <= ball_x <= px + pw and py <= ball_y <= py + ph:
-            return True
-        
-        # bbox 근처에 있는지 확인 (확장된 영역)
-        expanded_x1 = px - distance_threshold
-        expanded_y1 = py - distance_threshold
-        expanded_x2 = px + pw + distance_threshold
-        expanded_y2 = py + ph + distance_threshold
-        
-        if expanded_x1 <= ball_x <= expanded_x2 and expanded_y1 <= ball_y <= expanded_y2:
-            return True
-    
-    return False
+    return bool(near_boxes([ball_center], player_bboxes, distance_threshold)[0])
 
 
 def is_on_field(ball_center: Tuple[int, int], grass_mask: np.ndarray, 
-                surrounding_radius: int = 15) -> bool:
-    """공 위치 주변이 잔디(필드)인지 확인"""
-    if grass_mask is None:
+                surrounding_radius: int = 15, grass_integral: IntegralImage = None) -> bool:
+    """공 위치 주변이 잔디(필드)인지 확인 (grass_integral이 있으면 O(1) 조회)"""
+    if grass_mask is None and grass_integral is None:
         return True  # 잔디 마스크가 없으면 모든 위치 허용
     
     ball_x, ball_y = ball_center
-    height, width = grass_mask.shape
+    if grass_integral is not None:
+        height, width = grass_integral.height, grass_integral.width
+    else:
+        height, width = grass_mask.shape
     
     # 경계 체크
     if ball_x < 0 or ball_x >= width or ball_y < 0 or ball_y >= height:
         return False
     
+    if grass_integral is not None:
+        # 적분 영상으로 주변 영역의 잔디 픽셀 비율 계산
+        grass_ratio = grass_integral.window_ratios(ball_x, ball_y, surrounding_radius)
+        return bool(grass_ratio > 0.6)
+    
     # 주변 영역 정의
     x1 = max(0, ball_x - surrounding_radius)
     y1 = max(0, ball_y - surrounding_radius)
@@ -116,8 +107,10 @@ def is_on_field(ball_center: Tuple[int, int], grass_mask: np.ndarray,
 
 def detect_ball(frame: np.ndarray, grass_mask: np.ndarray = None, 
                 ball_color: Tuple[int, int, int] = None, debug: bool = False,
-                player_bboxes: List[Tuple[int, int, int, int]] = None) -> List[Tuple[int, int, int, int]]:
-    """프레임에서 축구공 감지 (SimpleBlobDetector 기반으로 고립된 흰색 원 감지)"""
+                player_bboxes: List[Tuple[int, int, int, int]] = None,
+                grass_integral: IntegralImage = None,
+                field_mask: np.ndarray = None) -> List[Tuple[int, int, int, int]]:
+    """프레임에서 축구공 감지 (SimpleBlobDetector 기반으로 고립된 흰색 원 감지, field_mask 밖은 제외)"""
     
     ball_candidates = []
     
@@ -136,7 +129,8 @@ def detect_ball(frame: np.ndarray, grass_mask: np.ndarray = None,
         not_grass_mask = np.ones_like(gray) * 255  # 전체 영역 사용
 
     gray = cv2.bitwise_or(ball_mask, not_grass_mask)
-
+    if field_mask is not None:
+        gray = cv2.bitwise_and(gray, field_mask)  # 관중석 영역에서는 blob을 찾지 않음
     
     # 2단계: SimpleBlobDetector 설정
     params = cv2.SimpleBlobDetector_Params()
@@ -173,8 +167,13 @@ def detect_ball(frame: np.ndarray, grass_mask: np.ndarray = None,
         cv2.imshow("Detected Blobs", im_with_keypoints)
         print(f"Found {len(keypoints)} blob candidates")
     
+    # 선수 근처 여부를 모든 keypoint에 대해 한 번에 계산
+    near_player = np.zeros(len(keypoints), dtype=bool)
+    if player_bboxes and keypoints:
+        near_player = near_boxes([(int(k.pt[0]), int(k.pt[1])) for k in keypoints], player_bboxes, 20)
+    
     # 4단계: Keypoint를 바운딩 박스로 변환
-    for keypoint in keypoints:
+    for keypoint, is_near in zip(keypoints, near_player):
         x, y = keypoint.pt
         size = keypoint.size
         
@@ -190,13 +189,13 @@ def detect_ball(frame: np.ndarray, grass_mask: np.ndarray = None,
             
             # 선수 근처인지 확인
             ball_center = (int(x), int(y))
-            if player_bboxes and is_near_player(ball_center, player_bboxes):
+            if is_near:
                 if debug:
                     print(f"Ball candidate rejected (near player): center=({int(x)},{int(y)})")
                 continue
             
             # 필드 위에 있는지 확인 (관중석 제거)
-            if not is_on_field(ball_center, grass_mask):
+            if not is_on_field(ball_center, grass_mask, grass_integral=grass_integral):
                 if debug:
                     print(f"Ball candidate rejected (not on field): center=({int(x)},{int(y)})")
                 continue
@@ -252,16 +251,6 @@ def filter_ball_by_field_position(ball_bboxes: List[Tuple[int, int, int, int]],
     margin_x = width // 10
     margin_y = height // 10
     
-    filtered_balls = []
-    
-    for bbox in ball_bboxes:
-        x, y, w, h = bbox
-        center_x = x + w // 2
-        center_y = y + h // 2
-        
-        # 화면 중앙 영역에 있는 공만 유효
-        if (margin_x < center_x < width - margin_x and 
-            margin_y < center_y < height - margin_y):
-            filtered_balls.append(bbox)
-    
-    return filtered_balls 
\ No newline at end of file
+    # 화면 중앙 영역에 있는 공만 유효
+    inside = centers_inside_margin(ball_bboxes, width, height, margin_x, margin_y)
+    return [bbox for bbox, keep in zip(ball_bboxes, inside) if keep] 
\ No newline at end of file
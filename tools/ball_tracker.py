@@ -1,6 +1,8 @@
 import numpy as np
 import cv2
 from typing import List, Tuple, Optional
+from .pitch_calibration import PitchCalibration
+from .kernels import pairwise_distances, within_distance, greedy_assign
 
 class BallTracker:
     """개별 공을 추적하는 클래스"""
@@ -79,10 +81,13 @@ class BallTracker:
 class BallTrackerManager:
     """BallTracker들을 관리하는 클래스"""
     
-    def __init__(self, frame_width: int, frame_height: int, grass_color: Tuple[int, int, int]):
+    def __init__(self, frame_width: int, frame_height: int, grass_color: Tuple[int, int, int],
+                 calibration: PitchCalibration = None):
         self.trackers = []  # BallTracker 객체들의 리스트
         self.next_tracker_id = 0
         self.distance_threshold = 30  # blob 할당 거리 임계값
+        self.distance_threshold_m = 3.0  # 보정이 있을 때 경기장 좌표 기준 할당 거리 임계값 (미터)
+        self.calibration = calibration  # 영상-경기장 호모그래피 (있으면 미터 단위로 할당)
         self.min_distance_to_player = 25  # 선수와의 최소 거리 (이보다 가까우면 tracker 생성 안함)
         self.frame_width = frame_width
         self.frame_height = frame_height
@@ -96,6 +101,49 @@ class BallTrackerManager:
         # 이전 최고 점수 tracker의 위치 기억
         self.last_best_position = None
         
+        # 점유 판정 (히스테리시스: 가까워지면 획득, 더 멀어져야 해제)
+        self.possession_distance = 30  # 선수 bbox와 이 거리 이내면 점유 후보 (선수 근처 20px 이내 공 후보는 감지 단계에서 제거됨)
+        self.possession_release_distance = 45  # 점유자가 이 거리보다 멀어지면 해제 후보
+        self.possession_switch_frames = 3  # 점유 획득/해제에 필요한 연속 프레임 수
+        self.possession_team_ids = (1, 2)  # 점유 판정 대상 클래스 (심판 등 추가 클래스 제외)
+        self._reset_possession()
+        self.camera_residual = np.zeros(2)  # 정수 좌표에 반영하지 못한 카메라 이동 소수부
+        
+    def reset(self):
+        """장면 전환 시 모든 tracker와 공 상태 초기화 (ID는 계속 증가)"""
+        self.trackers = []
+        self.current_ball_bbox = None
+        self.frames_lost = 0
+        self.last_best_position = None
+        self._reset_possession()
+        self.camera_residual = np.zeros(2)
+    
+    def apply_camera_motion(self, dx: float, dy: float):
+        """카메라 이동만큼 모든 공 tracker 위치를 한 번에 이동 (속도에서 카메라 이동 제외)"""
+        self.camera_residual += (dx, dy)
+        shift = np.round(self.camera_residual).astype(np.int64)
+        self.camera_residual -= shift
+        if not shift.any():
+            return
+        
+        if self.trackers:
+            positions = np.array([t.position for t in self.trackers], dtype=np.int64).reshape(-1, 2) + shift
+            for tracker, position in zip(self.trackers, positions.tolist()):
+                tracker.position = tuple(position)
+        if self.last_best_position is not None:
+            self.last_best_position = (self.last_best_position[0] + int(shift[0]),
+                                       self.last_best_position[1] + int(shift[1]))
+    
+    def _reset_possession(self):
+        """점유 상태 초기화"""
+        self.possession_tracker_id = None  # 현재 점유 선수 tracker ID
+        self.possession_team = None
+        self.possession_holder_distance = None  # 점유 선수와 공 사이 거리
+        self.possession_candidate_id = None  # 점유 획득 대기 중인 선수
+        self.possession_candidate_frames = 0
+        self.possession_release_frames = 0
+        self.nearest_player = None  # (team_id, tracker_id, distance)
+        
     def update_trackers(self, ball_candidates: List[Tuple[int, int, int, int]], 
                        player_positions: List[Tuple[int, int]]):
         """새로운 공 후보들로 tracker들 업데이트"""
@@ -131,21 +179,10 @@ class BallTrackerManager:
     def _filter_candidates_near_players(self, ball_centers: List[Tuple[int, int]], 
                                       player_positions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
         """선수와 너무 가까운 공 후보들 제거 (새 tracker 생성 방지용, 기존 tracker 업데이트에는 사용 가능)"""
-        filtered_centers = []
-        
-        for ball_center in ball_centers:
-            too_close_to_player = False
-            
-            for player_pos in player_positions:
-                distance = self._calculate_distance(ball_center, player_pos)
-                if distance < self.min_distance_to_player:
-                    too_close_to_player = True
-                    break
-            
-            if not too_close_to_player:
-                filtered_centers.append(ball_center)
-        
-        return filtered_centers
+        if not ball_centers:
+            return []
+        too_close_to_player = within_distance(ball_centers, player_positions, self.min_distance_to_player)
+        return [center for center, too_close in zip(ball_centers, too_close_to_player) if not too_close]
     
 
     
@@ -168,39 +205,33 @@ class BallTrackerManager:
                 self.trackers.append(new_tracker)
                 self.next_tracker_id += 1
     
+    def _predicted_distance_matrix(self, ball_centers: List[Tuple[int, int]]) -> np.ndarray:
+        """모든 tracker 예측 위치와 모든 후보 사이의 거리 행렬 (T, C) 계산 (보정이 있으면 미터)"""
+        if not self.trackers or not ball_centers:
+            return np.zeros((len(self.trackers), len(ball_centers)))
+        
+        predicted = np.array([t.get_predicted_position() for t in self.trackers], dtype=np.float64)
+        candidates = np.array(ball_centers, dtype=np.float64)
+        if self.calibration is not None:
+            predicted = self.calibration.to_pitch(predicted)
+            candidates = self.calibration.to_pitch(candidates)
+        
+        return pairwise_distances(predicted, candidates)
+    
     def _assign_candidates_to_trackers(self, ball_centers: List[Tuple[int, int]]) -> dict:
         """각 tracker에 가장 가까운 공 후보 할당 (거리 임계값 30)"""
         assignments = {}
-        used_candidates = set()
+        if not self.trackers or not ball_centers:
+            return assignments
         
-        # 각 tracker별로 가장 가까운 후보 찾기
-        tracker_candidate_distances = []
-        
-        for i, tracker in enumerate(self.trackers):
-            best_candidate = None
-            best_distance = float('inf')
-            best_candidate_idx = -1
-            
-            for j, candidate in enumerate(ball_centers):
-                if j in used_candidates:
-                    continue
-                
-                distance = tracker.calculate_predicted_distance_to_position(candidate)
-                if distance <= self.distance_threshold and distance < best_distance:
-                    best_distance = distance
-                    best_candidate = candidate
-                    best_candidate_idx = j
-            
-            if best_candidate is not None:
-                tracker_candidate_distances.append((i, best_candidate_idx, best_distance))
+        distances = self._predicted_distance_matrix(ball_centers)
+        threshold = self.distance_threshold_m if self.calibration is not None else self.distance_threshold
         
-        # 거리 순으로 정렬하여 충돌 해결 (가장 가까운 것부터 우선 할당)
-        tracker_candidate_distances.sort(key=lambda x: x[2])
-        
-        for tracker_idx, candidate_idx, distance in tracker_candidate_distances:
-            if candidate_idx not in used_candidates:
-                assignments[tracker_idx] = (candidate_idx, distance)
-                used_candidates.add(candidate_idx)
+        # 각 tracker별로 가장 가까운 후보를 찾고, 거리 순으로 충돌 해결 (가장 가까운 것부터 우선 할당)
+        tracker_indices, candidate_indices, best_distances = greedy_assign(distances, threshold)
+        for tracker_idx, candidate_idx, distance in zip(tracker_indices.tolist(), candidate_indices.tolist(),
+                                                        best_distances.tolist()):
+            assignments[tracker_idx] = (candidate_idx, distance)
         
         return assignments
     
@@ -212,6 +243,9 @@ class BallTrackerManager:
                 candidate_idx, distance = assignments[i]
                 new_position = ball_centers[candidate_idx]
                 tracker.update_position(new_position)
+                if self.calibration is not None:
+                    # 점수 공식은 픽셀 거리 기준이므로 임계값 비율로 환산
+                    distance = distance / self.distance_threshold_m * self.distance_threshold
                 tracker.update_score_success(distance)
             else:
                 # 선택되지 않은 tracker: 점수 5 감소만
@@ -274,15 +308,12 @@ class BallTrackerManager:
         """현재 tracker 개수 반환"""
         return len(self.trackers)
     
-    def update_ball_tracking(self, ball_candidates: List[Tuple[int, int, int, int]], 
-                           player_tracker_manager, frame: np.ndarray, frame_count: int):
-        """기존 인터페이스 호환성을 위한 메소드"""
-        # PlayerTrackerManager에서 모든 플레이어 위치 가져오기
-        team1_bboxes, team2_bboxes = player_tracker_manager.get_all_bboxes()
-        
+    def update_ball_tracking(self, ball_candidates: List[Tuple[int, int, int, int]], player_snapshot: dict):
+        """공 후보와 선수 tracker 스냅샷 (PlayerTrackerManager.get_tracker_snapshot, 심판/골키퍼 등 추가 클래스 포함)으로
+        공 tracker와 점유 상태 갱신"""
         # bbox를 중심점으로 변환
         player_positions = []
-        for bbox in team1_bboxes + team2_bboxes:
+        for bbox in player_snapshot['bboxes'].astype(np.int64).tolist():
             x, y, w, h = bbox
             center_x = x + w // 2
             center_y = y + h // 2
@@ -301,6 +332,92 @@ class BallTrackerManager:
         else:
             self.current_ball_bbox = None
             self.frames_lost += 1
+        
+        # 가장 가까운 선수 기준으로 점유 상태 갱신
+        self._update_possession(best_position, player_snapshot)
+    
+    def _update_possession(self, ball_position: Optional[Tuple[int, int]], player_snapshot: dict):
+        """공과 모든 선수 bbox 사이 거리를 한 번에 계산해 점유 상태 갱신 (히스테리시스 적용)"""
+        is_player = np.isin(player_snapshot['team_ids'], self.possession_team_ids)
+        tracker_ids = player_snapshot['tracker_ids'][is_player]
+        team_ids = player_snapshot['team_ids'][is_player]
+        if ball_position is None or len(tracker_ids) == 0:
+            self._reset_possession()
+            return
+        
+        # 공 중심에서 각 선수 bbox까지의 거리 (bbox 안이면 0)
+        bboxes = player_snapshot['bboxes'][is_player]
+        ball_x, ball_y = ball_position
+        dx = np.maximum(np.maximum(bboxes[:, 0] - ball_x, 0), ball_x - (bboxes[:, 0] + bboxes[:, 2]))
+        dy = np.maximum(np.maximum(bboxes[:, 1] - ball_y, 0), ball_y - (bboxes[:, 1] + bboxes[:, 3]))
+        distances = np.sqrt(dx * dx + dy * dy)
+        
+        nearest_idx = int(np.argmin(distances))
+        nearest_id = int(tracker_ids[nearest_idx])
+        nearest_distance = float(distances[nearest_idx])
+        self.nearest_player = (int(team_ids[nearest_idx]), nearest_id, nearest_distance)
+        
+        # 현재 점유자가 멀어졌거나 사라졌으면 해제 카운트 증가
+        if self.possession_tracker_id is not None:
+            holder_idx = np.flatnonzero(tracker_ids == self.possession_tracker_id)
+            self.possession_holder_distance = float(distances[holder_idx[0]]) if len(holder_idx) > 0 else None
+            if self.possession_holder_distance is None or self.possession_holder_distance > self.possession_release_distance:
+                self.possession_release_frames += 1
+                if self.possession_release_frames >= self.possession_switch_frames:
+                    self.possession_tracker_id = None
+                    self.possession_team = None
+                    self.possession_holder_distance = None
+                    self.possession_release_frames = 0
+            else:
+                self.possession_release_frames = 0
+        
+        # 다른 선수가 연속으로 가장 가까우면 점유 이전
+        if nearest_distance <= self.possession_distance and nearest_id != self.possession_tracker_id:
+            if nearest_id == self.possession_candidate_id:
+                self.possession_candidate_frames += 1
+            else:
+                self.possession_candidate_id = nearest_id
+                self.possession_candidate_frames = 1
+            
+            if self.possession_candidate_frames >= self.possession_switch_frames:
+                self.possession_tracker_id = nearest_id
+                self.possession_team = self.nearest_player[0]
+                self.possession_holder_distance = nearest_distance
+                self.possession_candidate_id = None
+                self.possession_candidate_frames = 0
+                self.possession_release_frames = 0
+        else:
+            self.possession_candidate_id = None
+            self.possession_candidate_frames = 0
+    
+    def get_possession_info(self) -> dict:
+        """점유 정보 반환 (점유 중이 아니면 가장 가까운 선수 정보)"""
+        if self.possession_tracker_id is not None:
+            return {
+                'in_possession': True,
+                'team': self.possession_team,
+                'player_id': self.possession_tracker_id,
+                'tracker_id': self.possession_tracker_id,
+                'distance': self.possession_holder_distance
+            }
+        
+        if self.nearest_player is None:
+            return {
+                'in_possession': False,
+                'team': None,
+                'player_id': None,
+                'tracker_id': None,
+                'distance': None
+            }
+        
+        team_id, tracker_id, distance = self.nearest_player
+        return {
+            'in_possession': False,
+            'team': team_id,
+            'player_id': tracker_id,
+            'tracker_id': tracker_id,
+            'distance': distance
+        }
     
     def get_ball_bbox(self) -> Optional[Tuple[int, int, int, int]]:
         """현재 추적 중인 공의 bbox 반환"""
@@ -311,18 +428,10 @@ class BallTrackerManager:
         best_position = self.get_best_ball_position()
         is_active = best_position is not None
         
-        # 간단한 possession 정보 (더 정교한 구현 가능)
-        possession_info = {
-            'in_possession': False,
-            'team': 1,
-            'player_id': 0,
-            'distance': 0.0
-        }
-        
         return {
             'active': is_active,
             'frames_lost': self.frames_lost,
-            'possession': possession_info
+            'possession': self.get_possession_info()
         }
     
     def draw_all_trackers(self, frame: np.ndarray, show_window: bool = True) -> np.ndarray:
@@ -0,0 +1,59 @@
+import cv2
+import numpy as np
+from typing import Tuple
+
+class CameraMotionEstimator:
+    """축소한 잔디 영역 프레임에 위상 상관(phase correlation)을 적용해 카메라 전역 이동을 추정하는 클래스"""
+
+    def __init__(self, downscale: int = 4, min_response: float = 0.2, min_texture: float = 4.0,
+                 max_shift: float = 80):
+        self.downscale = downscale  # 추정용 축소 배율
+        self.min_response = min_response  # 이보다 상관 응답이 약하면 이동 없음으로 처리
+        self.min_texture = min_texture  # 잔디 밝기 표준편차가 이보다 작으면 (무늬 없는 잔디) 추정하지 않음
+        self.max_shift = max_shift  # 이보다 큰 이동(원본 픽셀)은 오검출로 간주
+        self.previous = None
+        self.window = None
+
+    def reset(self):
+        """장면 전환 시 이전 프레임 제거"""
+        self.previous = None
+
+    def _prepare(self, frame: np.ndarray, grass_mask: np.ndarray = None) -> np.ndarray:
+        """그레이스케일 축소 + 잔디 영역만 남긴 float32 영상"""
+        height, width = frame.shape[:2]
+        size = (width // self.downscale, height // self.downscale)
+        gray = cv2.cvtColor(cv2.resize(frame, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        gray = gray.astype(np.float32)
+        if grass_mask is not None:
+            # 선수 등 독립적으로 움직이는 물체를 제외하고 배경(잔디)만 사용 (잔디 평균을 0으로 맞춰 경계 대비 제거)
+            small_mask = cv2.resize(grass_mask, size, interpolation=cv2.INTER_NEAREST) > 0
+            if small_mask.any():
+                gray -= np.median(gray[small_mask])
+            gray[~small_mask] = 0
+        return gray
+
+    def _has_texture(self, gray: np.ndarray) -> bool:
+        """위상 상관에 쓸 만한 잔디 무늬(잔디 깎은 줄, 라인 등)가 있는지 확인"""
+        return float(gray.std()) >= self.min_texture
+
+    def update(self, frame: np.ndarray, grass_mask: np.ndarray = None) -> Tuple[float, float]:
+        """이전 프레임 대비 화면 내용의 이동량 (dx, dy)을 원본 픽셀 단위로 반환"""
+        current = self._prepare(frame, grass_mask)
+        if not self._has_texture(current):
+            # 평평한 잔디에서는 움직이는 선수만 상관되어 잘못된 이동이 나오므로 보정하지 않음
+            self.previous = None
+            return 0.0, 0.0
+        previous = self.previous
+        self.previous = current
+        if previous is None or previous.shape != current.shape:
+            return 0.0, 0.0
+
+        if self.window is None or self.window.shape != current.shape[::-1]:
+            self.window = cv2.createHanningWindow(current.shape[::-1], cv2.CV_32F)
+
+        (shift_x, shift_y), response = cv2.phaseCorrelate(previous, current, self.window)
+        dx = shift_x * self.downscale
+        dy = shift_y * self.downscale
+        if response < self.min_response or np.hypot(dx, dy) > self.max_shift:
+            return 0.0, 0.0
+        return float(dx), float(dy)
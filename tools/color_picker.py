@@ -1,6 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
 import cv2
 
 def get_dominant_colors(image, mask, n_colors=3, color_space="hsv"):
@@ -79,68 +77,6 @@ def create_color_bar_numpy(color_info, width=400, height=100):
     
     return color_bar
 
-class RealTimeColorDisplay:
-    def __init__(self):
-        plt.ion()  # 인터랙티브 모드 활성화
-        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(10, 6))
-        
-        # 색상 막대 표시용
-        self.ax1.set_title('Top 3 Dominant Colors')
-        self.ax1.set_xlim(0, 400)
-        self.ax1.set_ylim(0, 100)
-        self.ax1.axis('off')
-        
-        # 색상 정보 텍스트 표시용
-        self.ax2.set_xlim(0, 1)
-        self.ax2.set_ylim(0, 1)
-        self.ax2.axis('off')
-        
-    def update_display(self, color_info, color_space="hsv"):
-        # 이전 플롯 지우기
-        self.ax1.clear()
-        self.ax2.clear()
-        
-        # 축 설정 재적용
-        self.ax1.set_title(f'Top 3 Dominant Colors (Real-time) - {color_space.upper()}')
-        self.ax1.set_xlim(0, 400)
-        self.ax1.set_ylim(0, 100)
-        self.ax1.axis('off')
-        
-        self.ax2.set_xlim(0, 1)
-        self.ax2.set_ylim(0, 1)
-        self.ax2.axis('off')
-        
-        if color_info:
-            # 색상 막대 생성
-            color_bar = create_color_bar_numpy(color_info)
-            
-            # matplotlib에서 표시 (RGB 형태로 변환)
-            color_bar_rgb = color_bar / 255.0  # 0-1 범위로 정규화
-            self.ax1.imshow(color_bar_rgb, aspect='auto', extent=[0, 400, 0, 100])
-            
-            # 색상 정보 텍스트 표시 (color_space에 따라)
-            text_info = ""
-            for i, info in enumerate(color_info):
-                if color_space.lower() == "rgb":
-                    color_val = info['color_rgb']
-                    text_info += f"Color {i+1}: RGB{color_val} - {info['percentage']:.1%}\n"
-                elif color_space.lower() == "bgr":
-                    color_val = info['color_bgr']
-                    text_info += f"Color {i+1}: BGR{color_val} - {info['percentage']:.1%}\n"
-                elif color_space.lower() == "hsv":
-                    color_val = info.get('color_hsv', info['color_bgr'])
-                    text_info += f"Color {i+1}: HSV{color_val} - {info['percentage']:.1%}\n"
-                else:
-                    color_val = info['color_bgr']
-                    text_info += f"Color {i+1}: BGR{color_val} - {info['percentage']:.1%}\n"
-            
-            self.ax2.text(0.05, 0.8, text_info, fontsize=12, 
-                         verticalalignment='top', fontfamily='monospace')
-        
-        # 화면 업데이트
-        self.fig.canvas.draw()
-        self.fig.canvas.flush_events()
-
 def integrate_realtime_colors(frame, combined_mask, color_space="hsv"):
     """
     기존 process_video 함수에 추가할 수 있는 함수.
@@ -198,7 +134,8 @@ def integrate_realtime_colors(frame, combined_mask, color_space="hsv"):
 
 # 사용 예제
 if __name__ == "__main__":
-    # 실시간 색상 display 객체 생성
+    # 실시간 색상 display 객체 생성 (matplotlib은 시각화할 때만 불러옴)
+    from tools.color_display import RealTimeColorDisplay
     color_display = RealTimeColorDisplay()
     
     # 기존 process_video 함수에서 다음과 같이 사용:
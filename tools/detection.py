@@ -1,24 +1,153 @@
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
-def get_bounding_boxes(frame, mask, grass_color, min_area=10, tolerance=30):
+EXTRACTORS = ("contours", "components")
+
+def get_bounding_boxes(frame, mask, grass_color, min_area=10, tolerance=30, extractor="contours",
+                       min_aspect_ratio=None, max_width=None, max_height=None):
     """마스크에서 바운딩 박스들을 찾아 반환합니다."""
-    # 윤곽선 검출
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # 후보 박스 추출 (윤곽선 또는 연결 요소)
+    candidate_boxes = extract_candidate_boxes(mask, min_area, extractor,
+                                              min_aspect_ratio, max_width, max_height)
+    
+    return boxes_on_field(frame, candidate_boxes, grass_color, tolerance)
+
+def boxes_on_field(frame, candidate_boxes, grass_color, tolerance=30):
+    """후보 박스 (N, 4) 중 필드 위에 있는 것만 튜플 목록으로 반환"""
+    if len(candidate_boxes) == 0:
+        return []
+    
+    # 모든 후보 박스가 필드 위에 있는지 한 번에 확인
+    on_field = is_on_field_batch(frame, candidate_boxes, grass_color, tolerance)
+    
+    return [tuple(box) for box in candidate_boxes[on_field].tolist()]
+
+def extract_candidate_boxes(mask, min_area=10, extractor="contours",
+                            min_aspect_ratio=None, max_width=None, max_height=None):
+    """마스크에서 후보 바운딩 박스를 (N, 4) 배열로 추출
+    
+    Args:
+        mask: 이진 마스크
+        min_area: 최소 면적 (이하 노이즈로 제거)
+        extractor: "contours" (findContours) 또는 "components" (connectedComponentsWithStats)
+        min_aspect_ratio: 최소 세로/가로 비율 (None이면 필터링 안함)
+        max_width: 최대 가로 길이 (None이면 필터링 안함)
+        max_height: 최대 세로 길이 (None이면 필터링 안함)
     
-    bounding_boxes = []
+    Returns:
+        (N, 4) int 배열 [(x, y, w, h), ...]
+    """
+    if extractor == "contours":
+        # 윤곽선 검출 (윤곽선마다 면적/박스 계산)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        boxes = [cv2.boundingRect(cnt) for cnt in contours if cv2.contourArea(cnt) > min_area]
+        boxes = np.array(boxes, dtype=np.int64).reshape(-1, 4)
+    elif extractor == "components":
+        # Connected Components 라벨링 (면적과 박스를 한 번에 계산, 0은 배경)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        stats = stats[1:]
+        boxes = stats[stats[:, cv2.CC_STAT_AREA] > min_area, :4].astype(np.int64)
+    else:
+        raise ValueError(f"Unknown extractor: {extractor} (expected one of {EXTRACTORS})")
     
-    # 각 윤곽선에 대해 바운딩 박스 추출
-    for cnt in contours:
-        area = cv2.contourArea(cnt)
-        if area > min_area:  # 작은 노이즈 제거
-            x, y, w, h = cv2.boundingRect(cnt)
-            
-            # 바운딩 박스가 필드 위에 있는지 확인
-            if is_on_field(frame, x, y, w, h, grass_color, tolerance):
-                bounding_boxes.append((x, y, w, h))
+    # 배열 기반 비율/크기 필터링
+    w, h = boxes[:, 2], boxes[:, 3]
+    keep = np.ones(len(boxes), dtype=bool)
+    if min_aspect_ratio is not None:
+        keep &= h >= w * min_aspect_ratio
+    if max_width is not None:
+        keep &= w <= max_width
+    if max_height is not None:
+        keep &= h <= max_height
     
-    return bounding_boxes
+    return boxes[keep]
+
+class StripExtractor:
+    """프레임을 가로 띠로 나눠 마스크 생성/모폴로지/후보 추출을 스레드 풀에서 병렬 실행하는 클래스
+
+    띠마다 위아래 halo 행을 더한 영역에서 마스크를 만들고 (모폴로지 결과가 전체 프레임과 같도록),
+    halo를 잘라낸 띠에서 연결 요소를 라벨링합니다. 띠 경계에서 8방향으로 맞닿은 요소는 하나로 합치므로
+    결과 박스 (순서 포함)는 전체 프레임에 extract_candidate_boxes(extractor="components")를 적용한 것과 같습니다.
+    OpenCV 함수는 실행 중 GIL을 놓기 때문에 스레드만으로 띠들이 동시에 처리됩니다.
+    """
+
+    def __init__(self, num_strips: int = 4, halo: int = 4, max_workers: int = None):
+        self.num_strips = num_strips
+        self.halo = halo  # 5x5 닫힘 연산 (팽창 + 침식) 결과가 띠 경계에서 정확하려면 4행
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or num_strips)
+
+    def strip_ranges(self, height: int):
+        """띠별 (halo 포함 시작, 끝, 띠 시작, 끝) 행 범위"""
+        # 기본 라벨링 알고리즘은 2x2 블록 단위로 번호를 매기므로 띠 시작 행을 짝수로 맞춰야 순서가 같음
+        bounds = np.linspace(0, height, self.num_strips + 1).astype(int) // 2 * 2
+        bounds[-1] = height
+        return [(max(0, y0 - self.halo), min(height, y1 + self.halo), y0, y1)
+                for y0, y1 in zip(bounds[:-1], bounds[1:]) if y1 > y0]
+
+    def _label_strip(self, build_masks, padded_y0, padded_y1, y0, y1):
+        """띠 하나의 마스크들을 만들고 halo를 제외한 영역을 라벨링 [(labels, stats), ...]"""
+        results = []
+        for mask in build_masks(padded_y0, padded_y1):
+            core = np.ascontiguousarray(mask[y0 - padded_y0:y1 - padded_y0])
+            _, labels, stats, _ = cv2.connectedComponentsWithStats(core, connectivity=8)
+            stats = stats.astype(np.int64)
+            stats[:, cv2.CC_STAT_TOP] += y0
+            results.append((labels, stats))
+        return results
+
+    def extract(self, height: int, build_masks, min_area: int = 10):
+        """build_masks(y0, y1) -> [y0, y1) 행의 마스크 목록을 띠별로 병렬 실행해 마스크별 후보 박스 (N, 4) 목록 반환"""
+        ranges = self.strip_ranges(height)
+        futures = [self.executor.submit(self._label_strip, build_masks, *r) for r in ranges]
+        strips = [future.result() for future in futures]
+        return [self._merge([strip[i] for strip in strips], min_area) for i in range(len(strips[0]))]
+
+    @staticmethod
+    def _merge(strips, min_area: int):
+        """띠별 (labels, stats)를 경계에서 합쳐 면적이 min_area보다 큰 요소의 박스 반환 (전체 프레임 라벨 순서)"""
+        # 띠별 요소에 전체 번호 부여 (배경 0 제외)
+        offsets = np.cumsum([0] + [len(stats) - 1 for _, stats in strips])
+        stats = np.concatenate([s[1:] for _, s in strips]).reshape(-1, 5)
+        parent = np.arange(len(stats))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # 위 띠의 마지막 행과 아래 띠의 첫 행에서 8방향으로 맞닿은 요소 합치기
+        for k in range(len(strips) - 1):
+            upper, lower = strips[k][0][-1], strips[k + 1][0][0]
+            for shift in (-1, 0, 1):
+                a = upper[max(0, -shift):len(upper) - max(0, shift)]
+                b = lower[max(0, shift):len(lower) - max(0, -shift)]
+                touching = (a > 0) & (b > 0)
+                for la, lb in set(zip(a[touching].tolist(), b[touching].tolist())):
+                    ra, rb = find(offsets[k] + la - 1), find(offsets[k + 1] + lb - 1)
+                    if ra != rb:
+                        parent[max(ra, rb)] = min(ra, rb)  # 가장 먼저 나온 조각을 대표로 (래스터 순서 유지)
+
+        roots = np.array([find(i) for i in range(len(stats))], dtype=np.int64)
+        x1, y1 = stats[:, cv2.CC_STAT_LEFT], stats[:, cv2.CC_STAT_TOP]
+        x2, y2 = x1 + stats[:, cv2.CC_STAT_WIDTH], y1 + stats[:, cv2.CC_STAT_HEIGHT]
+        unique_roots, groups = np.unique(roots, return_inverse=True)
+        count = len(unique_roots)
+        left = np.full(count, np.iinfo(np.int64).max)
+        top = np.full(count, np.iinfo(np.int64).max)
+        right = np.zeros(count, dtype=np.int64)
+        bottom = np.zeros(count, dtype=np.int64)
+        np.minimum.at(left, groups, x1)
+        np.minimum.at(top, groups, y1)
+        np.maximum.at(right, groups, x2)
+        np.maximum.at(bottom, groups, y2)
+        area = np.bincount(groups, weights=stats[:, cv2.CC_STAT_AREA], minlength=count)
+        boxes = np.stack([left, top, right - left, bottom - top], axis=1)
+        return boxes[area > min_area].reshape(-1, 4)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
 
 def draw_boxes_on_frame(frame, bounding_boxes, color=(0, 255, 0)):
     """프레임에 바운딩 박스들을 그려서 반환합니다."""
@@ -67,4 +196,40 @@ def is_on_field(frame, x, y, w, h, grass_color, tolerance):
     
     # 잔디 색상과의 유사도 계산 (BGR 순서)
     color_diff = np.abs(avg_color - grass_color)
-    return np.all(color_diff <= tolerance) 
\ No newline at end of file
+    return np.all(color_diff <= tolerance)
+
+def is_on_field_batch(frame, boxes, grass_color, tolerance):
+    """여러 바운딩 박스가 필드 위에 있는지 한 번에 확인 (is_on_field의 벡터화 버전)
+    
+    Args:
+        frame: 원본 프레임 (BGR)
+        boxes: (N, 4) 배열 [(x, y, w, h), ...]
+        grass_color: 잔디 색상 (BGR)
+        tolerance: 채널별 허용 오차
+    
+    Returns:
+        (N,) bool 배열
+    """
+    boxes = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+    height, width = frame.shape[:2]
+    x, y, w, h = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    
+    # 박스 좌우 각 3개 점의 샘플 좌표 (N, 6)
+    sample_y = y[:, None] + (h[:, None] * np.array([1, 2, 3])) // 4
+    sample_y = np.concatenate([sample_y, sample_y], axis=1)
+    left_x = np.maximum(0, x - 10)
+    right_x = np.minimum(width - 1, x + w + 10)
+    sample_x = np.concatenate([np.repeat(left_x[:, None], 3, axis=1),
+                               np.repeat(right_x[:, None], 3, axis=1)], axis=1)
+    
+    # 프레임 밖 샘플은 평균에서 제외
+    valid = (sample_y >= 0) & (sample_y < height)
+    samples = frame[np.clip(sample_y, 0, height - 1), sample_x].astype(np.float64)
+    samples[~valid] = 0
+    
+    valid_counts = valid.sum(axis=1)
+    avg_colors = samples.sum(axis=1) / np.maximum(valid_counts, 1)[:, None]
+    
+    # 잔디 색상과의 유사도 계산 (BGR 순서)
+    color_diff = np.abs(avg_colors - np.asarray(grass_color, dtype=np.float64))
+    return np.all(color_diff <= tolerance, axis=1) & (valid_counts > 0)
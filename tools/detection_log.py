@@ -0,0 +1,152 @@
+import json
+import zlib
+import struct
+import numpy as np
+from typing import Iterator, Tuple
+
+MAGIC = b"SSDDET1\0"
+# 프레임 레코드 헤더: 프레임 번호, 플래그, 카메라 이동 dx/dy, 선수 bbox 수, 공 후보 수,
+# 잔디 판정 맵 / 외형 기술자 / 장면 정보 바이트 수
+RECORD_HEADER = struct.Struct("<IBddHHIII")
+FLAG_CUT = 1  # 장면 전환 (tracker 리셋)
+FLAG_SKIPPED = 2  # 필드가 아닌 장면 (감지/추적 생략)
+FLAG_TRAILER = 4  # 마지막 레코드 (처리가 끝난 뒤에만 알 수 있는 정보, 예: 샷 경계)
+
+class DetectionLogWriter:
+    """프레임별 감지 결과를 압축 바이너리 파일에 순서대로 기록하는 클래스
+
+    tracker가 프레임 픽셀에서 참조하는 정보 (유실 tracker의 잔디 판정, 재식별 외형 기술자)도 함께 저장해
+    track-only 재생이 전체 실행과 같은 추적 결과를 내도록 합니다.
+      - 선수 bbox: (클래스 ID, x, y, w, h) int16
+      - 공 후보 bbox: (x, y, w, h) int16
+      - 잔디 판정 맵: grass_map_from_frame 결과를 비트 압축 후 zlib
+      - 외형 기술자: 감지된 선수 bbox 순서대로 float32, zlib
+    """
+
+    def __init__(self, path: str, header: dict):
+        self.path = path
+        self.file = open(path, "wb")
+        header_bytes = json.dumps(header).encode()
+        self.file.write(MAGIC)
+        self.file.write(struct.pack("<I", len(header_bytes)))
+        self.file.write(header_bytes)
+        self.num_frames = 0
+
+    def write_frame(self, frame_number: int, detected_by_class: dict = None, ball_bboxes=None,
+                    camera_shift: Tuple[float, float] = (0.0, 0.0), grass_map: np.ndarray = None,
+                    descriptors: np.ndarray = None, scene_info: dict = None, is_cut: bool = False,
+                    skipped: bool = False):
+        """프레임 하나의 감지 결과 기록 (skipped 프레임은 장면 정보만)"""
+        player_rows = [(class_id, *bbox) for class_id, bboxes in (detected_by_class or {}).items() for bbox in bboxes]
+        players = np.array(player_rows, dtype=np.int16).reshape(-1, 5)
+        balls = np.array(list(ball_bboxes or []), dtype=np.int16).reshape(-1, 4)
+        grass_bytes = b"" if grass_map is None else zlib.compress(np.packbits(grass_map.reshape(-1)).tobytes(), 6)
+        descriptor_bytes = b"" if descriptors is None else zlib.compress(
+            np.ascontiguousarray(descriptors, dtype=np.float32).tobytes(), 6)
+        scene_bytes = b"" if scene_info is None else json.dumps(scene_info).encode()
+
+        flags = (FLAG_CUT if is_cut else 0) | (FLAG_SKIPPED if skipped else 0)
+        self.file.write(RECORD_HEADER.pack(frame_number, flags, camera_shift[0], camera_shift[1],
+                                           len(players), len(balls), len(grass_bytes),
+                                           len(descriptor_bytes), len(scene_bytes)))
+        self.file.write(players.tobytes())
+        self.file.write(balls.tobytes())
+        self.file.write(grass_bytes)
+        self.file.write(descriptor_bytes)
+        self.file.write(scene_bytes)
+        self.num_frames += 1
+
+    def close(self, trailer: dict = None):
+        """trailer (JSON으로 저장할 정보)를 마지막 레코드로 기록하고 닫기"""
+        if trailer is not None:
+            trailer_bytes = json.dumps(trailer).encode()
+            self.file.write(RECORD_HEADER.pack(0, FLAG_TRAILER, 0.0, 0.0, 0, 0, 0, 0, len(trailer_bytes)))
+            self.file.write(trailer_bytes)
+        self.file.close()
+
+def _read_exact(f, size: int) -> bytes:
+    """size 바이트를 정확히 읽음 (파일이 레코드 중간에서 끝나면 ValueError)"""
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError(f"Truncated detection log: {f.name}")
+    return data
+
+class DetectionLogReader:
+    """DetectionLogWriter로 기록한 파일을 프레임 순서대로 읽는 클래스
+
+    trailer 레코드 전에 끝나거나 레코드 중간에서 잘린 파일 (기록 중 중단된 실행)은 ValueError로 알립니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a detection log: {path}")
+            (header_size,) = struct.unpack("<I", _read_exact(f, 4))
+            self.header = json.loads(_read_exact(f, header_size))
+            self.data_offset = f.tell()
+        self.frame_width = self.header["frame_width"]
+        self.frame_height = self.header["frame_height"]
+        self.class_ids = self.header["class_ids"]
+        self.trailer = {}  # 끝까지 읽은 뒤 채워짐
+
+    def __iter__(self) -> Iterator[dict]:
+        """프레임별 {frame_number, is_cut, skipped, camera_shift, detected_by_class, ball_bboxes,
+        grass_map, descriptors, scene} 생성 (trailer 없이 끝나면 ValueError)"""
+        num_pixels = self.frame_width * self.frame_height
+        with open(self.path, "rb") as f:
+            f.seek(self.data_offset)
+            while True:
+                record_header = f.read(RECORD_HEADER.size)
+                if not record_header:
+                    raise ValueError(f"Detection log ends without a trailer (recording was interrupted): {self.path}")
+                if len(record_header) < RECORD_HEADER.size:
+                    raise ValueError(f"Truncated detection log: {self.path}")
+                (frame_number, flags, dx, dy, num_players, num_balls,
+                 grass_size, descriptor_size, scene_size) = RECORD_HEADER.unpack(record_header)
+                players = np.frombuffer(_read_exact(f, num_players * 10), dtype=np.int16).reshape(-1, 5).tolist()
+                balls = np.frombuffer(_read_exact(f, num_balls * 8), dtype=np.int16).reshape(-1, 4).tolist()
+                grass_bytes = _read_exact(f, grass_size)
+                descriptor_bytes = _read_exact(f, descriptor_size)
+                scene_bytes = _read_exact(f, scene_size)
+                if flags & FLAG_TRAILER:
+                    self.trailer = json.loads(scene_bytes)
+                    return
+
+                # 기록 시 클래스 순서를 유지해야 tracker의 bbox 순서 (외형 기술자 행 순서)가 같아짐
+                detected_by_class = {class_id: [] for class_id in self.class_ids}
+                for class_id, x, y, w, h in players:
+                    detected_by_class[class_id].append((x, y, w, h))
+
+                grass_map = None
+                if grass_bytes:
+                    bits = np.frombuffer(zlib.decompress(grass_bytes), dtype=np.uint8)
+                    grass_map = np.unpackbits(bits, count=num_pixels).astype(bool).reshape(
+                        self.frame_height, self.frame_width)
+                descriptors = None
+                if descriptor_bytes:
+                    descriptors = np.frombuffer(zlib.decompress(descriptor_bytes), dtype=np.float32).reshape(
+                        num_players, -1)
+
+                yield {
+                    "frame_number": frame_number,
+                    "is_cut": bool(flags & FLAG_CUT),
+                    "skipped": bool(flags & FLAG_SKIPPED),
+                    "camera_shift": (dx, dy),
+                    "detected_by_class": detected_by_class,
+                    "ball_bboxes": [tuple(bbox) for bbox in balls],
+                    "grass_map": grass_map,
+                    "descriptors": descriptors,
+                    "scene": json.loads(scene_bytes) if scene_bytes else None,
+                }
+
+class LoggedAppearance:
+    """기록된 외형 기술자를 AppearanceFrame 대신 tracker에 넘기는 클래스 (감지된 bbox 순서와 같음)"""
+
+    def __init__(self, descriptors: np.ndarray):
+        self._descriptors = descriptors
+
+    def descriptors(self, bboxes) -> np.ndarray:
+        if len(bboxes) != len(self._descriptors):
+            raise ValueError(f"Logged descriptors for {len(self._descriptors)} boxes, got {len(bboxes)}")
+        return self._descriptors
@@ -0,0 +1,58 @@
+import cv2
+import numpy as np
+from typing import Tuple
+
+class FieldMask:
+    """잔디 마스크의 열별 누적 잔디 비율로 필드 위쪽 경계 (관중석과의 경계)를 찾아 샷 동안 재사용하는 클래스
+
+    열마다 경계 행 y를 "y 위쪽은 잔디가 아니고 y 아래쪽은 잔디"에 가장 잘 맞는 행으로 고릅니다.
+    위쪽 누적 잔디 수 C(y)에 대해 점수 = (y - C(y)) + (전체 - C(y))를 최대화하므로 열 하나가 누적합 한 번입니다.
+    경계는 장면 전환, 누적 카메라 이동이 max_shift를 넘을 때, 또는 max_age 프레임마다 다시 계산합니다.
+    """
+
+    def __init__(self, column_smoothing: int = 41, margin: int = 30, max_shift: float = 20.0, max_age: int = 250):
+        self.column_smoothing = column_smoothing  # 선수에 가려진 열을 보정하는 가로 평균 폭 (픽셀)
+        self.margin = margin  # 경계 위로 남겨두는 행 수 (먼 쪽 터치라인 선수의 상체, 작은 카메라 이동 허용)
+        self.max_shift = max_shift  # 이보다 많이 누적 이동하면 경계 재계산 (픽셀)
+        self.max_age = max_age  # 이동 추정이 못 잡는 줌 변화 등을 위해 이 프레임 수마다 재계산
+        self.reset()
+
+    def reset(self):
+        """캐시된 경계 제거 (장면 전환, 필드가 아닌 장면 후)"""
+        self.cutoff_rows = None
+        self.mask = None
+        self.shift = (0.0, 0.0)
+        self.age = 0
+        self.recomputed = 0  # 경계 계산 횟수 (통계용)
+
+    def compute_cutoffs(self, grass_mask: np.ndarray) -> np.ndarray:
+        """열별 필드 시작 행 (W,) int 배열 (잔디가 거의 없는 열은 H)"""
+        height = grass_mask.shape[0]
+        grass = (grass_mask > 0).astype(np.float32)
+        if self.column_smoothing > 1:
+            grass = cv2.blur(grass, (self.column_smoothing, 1), borderType=cv2.BORDER_REPLICATE)
+
+        # above[y] = y행 위쪽의 잔디 수 (y = 0..H)
+        above = np.zeros((height + 1, grass.shape[1]), dtype=np.float32)
+        np.cumsum(grass, axis=0, out=above[1:])
+        rows = np.arange(height + 1, dtype=np.float32)[:, None]
+        score = rows + above[-1] - 2 * above
+        return np.argmax(score, axis=0)
+
+    def update(self, grass_mask: np.ndarray, camera_shift: Tuple[float, float] = (0.0, 0.0),
+               is_cut: bool = False) -> np.ndarray:
+        """현재 프레임의 필드 마스크 (0/255 uint8) 반환 (필요할 때만 다시 계산)"""
+        dx = self.shift[0] + camera_shift[0]
+        dy = self.shift[1] + camera_shift[1]
+        self.shift = (dx, dy)
+        self.age += 1
+        if (self.mask is None or is_cut or self.age > self.max_age or
+                np.hypot(dx, dy) > self.max_shift or self.mask.shape != grass_mask.shape):
+            self.cutoff_rows = np.maximum(self.compute_cutoffs(grass_mask) - self.margin, 0)
+            rows = np.arange(grass_mask.shape[0])[:, None]
+            self.mask = np.where(rows >= self.cutoff_rows[None, :], 255, 0).astype(np.uint8)
+            self.shift = (0.0, 0.0)
+            self.age = 0
+            self.recomputed += 1
+        return self.mask
+
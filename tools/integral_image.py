@@ -0,0 +1,49 @@
+import cv2
+import numpy as np
+
+class IntegralImage:
+    """적분 영상을 프레임당 한 번 계산해 임의 사각형 영역의 합/평균을 O(1)로 조회하는 클래스"""
+
+    def __init__(self, image: np.ndarray):
+        self.height, self.width = image.shape[:2]
+        # 합계가 커져도 정확하도록 float64 적분 영상 사용 ((H+1, W+1) 또는 (H+1, W+1, C))
+        self.integral = cv2.integral(image, sdepth=cv2.CV_64F)
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> 'IntegralImage':
+        """이진 마스크의 적분 영상 생성 (영역 합 = 0이 아닌 픽셀 수)"""
+        return cls((mask > 0).astype(np.uint8))
+
+    def _clip_boxes(self, x1, y1, x2, y2):
+        """[x1, x2) x [y1, y2) 영역을 영상 범위로 클리핑"""
+        x1 = np.clip(np.asarray(x1, dtype=np.int64), 0, self.width)
+        y1 = np.clip(np.asarray(y1, dtype=np.int64), 0, self.height)
+        x2 = np.clip(np.asarray(x2, dtype=np.int64), 0, self.width)
+        y2 = np.clip(np.asarray(y2, dtype=np.int64), 0, self.height)
+        x2 = np.maximum(x1, x2)
+        y2 = np.maximum(y1, y2)
+        return x1, y1, x2, y2
+
+    def box_sums(self, x1, y1, x2, y2):
+        """사각형 영역들의 합과 (클리핑된) 픽셀 수 반환"""
+        x1, y1, x2, y2 = self._clip_boxes(x1, y1, x2, y2)
+        ii = self.integral
+        sums = ii[y2, x2] - ii[y1, x2] - ii[y2, x1] + ii[y1, x1]
+        areas = (x2 - x1) * (y2 - y1)
+        return sums, areas
+
+    def box_means(self, x1, y1, x2, y2):
+        """사각형 영역들의 평균 반환 (빈 영역은 NaN)"""
+        sums, areas = self.box_sums(x1, y1, x2, y2)
+        areas = np.asarray(areas, dtype=np.float64)
+        if np.ndim(sums) > np.ndim(areas):
+            areas = areas[..., None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(areas > 0, sums / np.maximum(areas, 1), np.nan)
+
+    def window_ratios(self, center_x, center_y, radius: int):
+        """중심점 주변 (2r+1)x(2r+1) 창에서 0이 아닌 픽셀 비율 (마스크 적분 영상용)"""
+        center_x = np.asarray(center_x, dtype=np.int64)
+        center_y = np.asarray(center_y, dtype=np.int64)
+        return self.box_means(center_x - radius, center_y - radius,
+                              center_x + radius + 1, center_y + radius + 1)
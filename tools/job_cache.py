@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+CACHE_VERSION = 2  # 추적 결과가 달라지는 변경을 하면 올려서 이전 캐시 무효화
+HASH_SAMPLE_SIZE = 1 << 20  # 빠른 해시에서 읽는 구간 크기 (앞/중간/뒤)
+MANIFEST_NAME = "manifest.json"
+
+def default_cache_dir() -> str:
+    """사용자 캐시 폴더 (~/.cache/soccer_detector, Windows는 LOCALAPPDATA)"""
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "soccer_detector")
+
+def fast_file_hash(path: str, sample_size: int = HASH_SAMPLE_SIZE) -> str:
+    """파일 크기와 앞/중간/뒤 구간만 읽는 빠른 내용 해시 (작은 파일은 전체)"""
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, "rb") as f:
+        if size <= sample_size * 3:
+            digest.update(f.read())
+        else:
+            for offset in (0, (size - sample_size) // 2, size - sample_size):
+                f.seek(offset)
+                digest.update(f.read(sample_size))
+    return digest.hexdigest()
+
+def params_key(*parts) -> str:
+    """JSON으로 직렬화한 파라미터들의 해시 (캐시 키)"""
+    payload = json.dumps([CACHE_VERSION, *parts], sort_keys=True, default=list)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+class JobCache:
+    """영상 해시 + 추적 파라미터를 키로 분석 결과 파일을 보관하는 내용 주소 캐시
+
+    cache_dir/jobs/<key>/에 결과 파일을, cache_dir/stages/<key>/에 단계 캐시(StageRecorder)를 저장합니다.
+    항목은 manifest가 마지막에 기록된 것만 유효하며, 사용할 때마다 manifest 수정 시각을 갱신해
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 << 30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(cache_dir, "jobs"), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, "stages"), exist_ok=True)
+
+    def entry_dir(self, kind: str, key: str) -> str:
+        return os.path.join(self.cache_dir, kind, key)
+
+    def _read_manifest(self, kind: str, key: str) -> Optional[dict]:
+        """완성된 항목의 manifest 반환 후 사용 시각 갱신 (없거나 손상되면 None)"""
+        manifest_path = os.path.join(self.entry_dir(kind, key), MANIFEST_NAME)
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            os.utime(manifest_path)
+        except (OSError, ValueError):
+            return None
+        return manifest
+
+    def _commit(self, kind: str, key: str, staging_dir: str, manifest: dict):
+        """임시 폴더에 manifest를 기록하고 항목 폴더로 이름 변경 (동시에 같은 항목을 만들면 먼저 끝난 쪽 유지)"""
+        with open(os.path.join(staging_dir, MANIFEST_NAME), "w") as f:
+            json.dump(manifest, f)
+        target = self.entry_dir(kind, key)
+        shutil.rmtree(target, ignore_errors=True)  # manifest 없는 (중단된) 항목
+        try:
+            os.rename(staging_dir, target)
+        except OSError:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self.evict()
+
+    def staging_dir(self, kind: str, key: str) -> str:
+        """항목을 기록할 임시 폴더 생성"""
+        path = os.path.join(self.cache_dir, kind, f".{key}.tmp-{os.getpid()}-{time.monotonic_ns()}")
+        os.makedirs(path)
+        return path
+
+    def lookup_outputs(self, key: str) -> Optional[Dict[str, str]]:
+        """캐시된 결과 파일 {이름: 캐시 내 경로} 반환 (없으면 None)"""
+        manifest = self._read_manifest("jobs", key)
+        if manifest is None:
+            return None
+        entry = self.entry_dir("jobs", key)
+        files = {name: os.path.join(entry, name) for name in manifest["files"]}
+        if not all(os.path.exists(path) for path in files.values()):
+            return None
+        return files
+
+    def restore_outputs(self, key: str, outputs: Dict[str, str]) -> bool:
+        """캐시 적중 시 결과 파일을 outputs {이름: 출력 경로}로 복사 (캐시에 없는 이름은 무시)"""
+        files = self.lookup_outputs(key)
+        if files is None:
+            return False
+        for name, destination in outputs.items():
+            if name in files:
+                os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+                shutil.copyfile(files[name], destination)
+        return True
+
+    def store_outputs(self, key: str, outputs: Dict[str, str], info: dict = None):
+        """분석이 끝난 결과 파일 {이름: 경로}를 캐시에 복사 (존재하는 파일만)"""
+        staging = self.staging_dir("jobs", key)
+        stored = []
+        for name, path in outputs.items():
+            if os.path.exists(path):
+                shutil.copyfile(path, os.path.join(staging, name))
+                stored.append(name)
+        self._commit("jobs", key, staging, {"files": stored, "info": info or {}, "created": time.time()})
+
+    def open_stage(self, key: str) -> Optional["StageReader"]:
+        """단계 캐시 (축소 프레임 + 잔디 마스크) 열기 (없으면 None)"""
+        manifest = self._read_manifest("stages", key)
+        if manifest is None:
+            return None
+        try:
+            return StageReader(self.entry_dir("stages", key), manifest)
+        except (OSError, ValueError):
+            return None
+
+    def record_stage(self, key: str, frame_size: Tuple[int, int], fps: float) -> "StageRecorder":
+        """단계 캐시 기록 시작"""
+        return StageRecorder(self, key, frame_size, fps)
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(마지막 사용 시각, 크기, 경로) 목록 (manifest 없는 임시 폴더는 제외)"""
+        entries = []
+        for kind in ("jobs", "stages"):
+            root = os.path.join(self.cache_dir, kind)
+            for name in os.listdir(root):
+                entry = os.path.join(root, name)
+                manifest_path = os.path.join(entry, MANIFEST_NAME)
+                if name.startswith(".") or not os.path.exists(manifest_path):
+                    continue
+                size = sum(entry_file.stat().st_size for entry_file in os.scandir(entry))
+                entries.append((os.path.getmtime(manifest_path), size, entry))
+        return entries
+
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목 삭제"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+class StageRecorder:
+    """처리 중인 축소 프레임과 잔디 마스크(비트 압축)를 원시 파일에 순서대로 기록하는 클래스
+
+    모든 프레임을 기록한 뒤 finish()를 호출해야 캐시 항목이 됩니다 (중단되면 discard()).
+    """
+
+    def __init__(self, cache: JobCache, key: str, frame_size: Tuple[int, int], fps: float):
+        self.cache = cache
+        self.key = key
+        self.frame_width, self.frame_height = frame_size
+        self.fps = fps
+        self.num_frames = 0
+        self.staging = cache.staging_dir("stages", key)
+        self.frames_file = open(os.path.join(self.staging, "frames.u8"), "wb")
+        self.masks_file = open(os.path.join(self.staging, "grass.bits"), "wb")
+
+    def add(self, frame: np.ndarray, grass_mask: np.ndarray):
+        """프레임 (H, W, 3) uint8과 잔디 마스크 (H, W) 기록"""
+        self.frames_file.write(np.ascontiguousarray(frame).tobytes())
+        self.masks_file.write(np.packbits(grass_mask.reshape(-1) > 0).tobytes())
+        self.num_frames += 1
+
+    def finish(self, dominant_colors):
+        """기록 완료 후 캐시 항목으로 등록"""
+        self.frames_file.close()
+        self.masks_file.close()
+        if self.num_frames == 0:
+            self.discard()
+            return
+        self.cache._commit("stages", self.key, self.staging, {
+            "num_frames": self.num_frames,
+            "frame_width": self.frame_width,
+            "frame_height": self.frame_height,
+            "fps": self.fps,
+            "dominant_colors": [int(c) for c in dominant_colors],
+        })
+
+    def discard(self):
+        """기록 중단 (임시 폴더 삭제)"""
+        self.frames_file.close()
+        self.masks_file.close()
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+class StageReader:
+    """단계 캐시를 VideoSource처럼 읽는 입력 소스 (디코딩/축소 없이 memmap에서 프레임과 잔디 마스크 제공)"""
+
+    is_live = False
+    dropped_frames = 0
+
+    def __init__(self, entry_dir: str, manifest: dict):
+        self.num_frames = manifest["num_frames"]
+        self.frame_width = manifest["frame_width"]
+        self.frame_height = manifest["frame_height"]
+        self.fps = manifest["fps"]
+        self.total_frames = self.num_frames
+        self.dominant_colors = tuple(manifest["dominant_colors"])
+        pixels = self.frame_width * self.frame_height
+        self.frames = np.memmap(os.path.join(entry_dir, "frames.u8"), dtype=np.uint8, mode="r",
+                                shape=(self.num_frames, self.frame_height, self.frame_width, 3))
+        self.masks = np.memmap(os.path.join(entry_dir, "grass.bits"), dtype=np.uint8, mode="r",
+                               shape=(self.num_frames, (pixels + 7) // 8))
+        self.position = 0
+
+    def is_opened(self) -> bool:
+        return True
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """다음 프레임 (복사본)과 읽은 시각 반환"""
+        if self.position >= self.num_frames:
+            return False, None, time.monotonic()
+        frame = np.array(self.frames[self.position])
+        self.position += 1
+        return True, frame, time.monotonic()
+
+    def grass_mask(self) -> np.ndarray:
+        """마지막으로 읽은 프레임의 잔디 마스크 (0/255 uint8)"""
+        bits = np.unpackbits(self.masks[self.position - 1], count=self.frame_width * self.frame_height)
+        return (bits * 255).reshape(self.frame_height, self.frame_width)
+
+    def rewind(self) -> bool:
+        self.position = 0
+        return True
+
+    def release(self):
+        self.frames = None
+        self.masks = None
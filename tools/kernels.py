@@ -0,0 +1,292 @@
+"""추적/필터 내부 루프용 커널 (Numba가 설치되어 있으면 JIT 컴파일, 없으면 NumPy 구현)
+
+각 커널은 같은 동작의 두 구현을 가집니다:
+  - _*_loop: 스칼라 루프 (Numba nopython 모드로 컴파일)
+  - _*_numpy: 벡터화 NumPy 구현 (Numba가 없을 때 사용)
+SOCCER_KERNELS=numpy 환경 변수로 NumPy 구현을 강제할 수 있습니다.
+`python -m pytest tests/test_kernels.py`는 두 구현 모두 이전 스칼라 구현과 결과가 같은지,
+`python -m tools.kernels`는 두 구현끼리 결과가 같은지 확인합니다.
+Numba 임포트(~0.3초)와 컴파일은 시작 시간에 포함되지 않도록 커널을 처음 호출할 때 수행합니다.
+"""
+import os
+import threading
+import importlib.util
+import numpy as np
+
+USE_NUMBA = (importlib.util.find_spec("numba") is not None
+             and os.environ.get("SOCCER_KERNELS", "").lower() != "numpy")
+BACKEND = "numba" if USE_NUMBA else "numpy"
+
+def _jit(loop_func):
+    """스칼라 루프를 Numba로 컴파일 (컴파일 결과는 __pycache__에 캐시)"""
+    import numba
+    return numba.njit(cache=True)(loop_func)
+
+def _select(loop_func, numpy_func):
+    """Numba 사용 가능하면 첫 호출 때 스칼라 루프를 컴파일해 쓰는 함수, 아니면 NumPy 구현 반환"""
+    if not USE_NUMBA:
+        return numpy_func
+    compiled = []
+    lock = threading.Lock()  # 여러 추적 세션이 동시에 첫 호출해도 한 번만 컴파일
+
+    def dispatch(*args):
+        if not compiled:
+            with lock:
+                if not compiled:
+                    compiled.append(_jit(loop_func))
+        return compiled[0](*args)
+
+    return dispatch
+
+# --- 점 집합 사이 거리 행렬 ---
+
+def _pairwise_distances_loop(a, b):
+    out = np.empty((a.shape[0], b.shape[0]), dtype=np.float64)
+    for i in range(a.shape[0]):
+        for j in range(b.shape[0]):
+            dx = a[i, 0] - b[j, 0]
+            dy = a[i, 1] - b[j, 1]
+            out[i, j] = np.sqrt(dx * dx + dy * dy)
+    return out
+
+def _pairwise_distances_numpy(a, b):
+    diff = a[:, None, :] - b[None, :, :]
+    return np.sqrt(diff[..., 0] * diff[..., 0] + diff[..., 1] * diff[..., 1])
+
+_pairwise_distances = _select(_pairwise_distances_loop, _pairwise_distances_numpy)
+
+def pairwise_distances(a, b) -> np.ndarray:
+    """점 (N, 2)와 점 (M, 2) 사이의 유클리드 거리 행렬 (N, M)"""
+    a = np.ascontiguousarray(a, dtype=np.float64).reshape(-1, 2)
+    b = np.ascontiguousarray(b, dtype=np.float64).reshape(-1, 2)
+    return _pairwise_distances(a, b)
+
+# --- 다른 점과 min_distance보다 가까운 점 ---
+
+def _within_distance_loop(points, others, min_distance):
+    out = np.zeros(points.shape[0], dtype=np.bool_)
+    for i in range(points.shape[0]):
+        for j in range(others.shape[0]):
+            dx = points[i, 0] - others[j, 0]
+            dy = points[i, 1] - others[j, 1]
+            if np.sqrt(dx * dx + dy * dy) < min_distance:
+                out[i] = True
+                break
+    return out
+
+def _within_distance_numpy(points, others, min_distance):
+    if others.shape[0] == 0:
+        return np.zeros(points.shape[0], dtype=bool)
+    return (_pairwise_distances_numpy(points, others) < min_distance).any(axis=1)
+
+_within_distance = _select(_within_distance_loop, _within_distance_numpy)
+
+def within_distance(points, others, min_distance: float) -> np.ndarray:
+    """points (N, 2) 중 others (M, 2)의 어느 점과 min_distance 미만으로 가까운 점 (N,) bool"""
+    points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
+    others = np.ascontiguousarray(others, dtype=np.float64).reshape(-1, 2)
+    return _within_distance(points, others, float(min_distance))
+
+# --- 선수 bbox 안 또는 근처 (bbox를 threshold만큼 확장) ---
+
+def _near_boxes_loop(points, bboxes, threshold):
+    out = np.zeros(points.shape[0], dtype=np.bool_)
+    for i in range(points.shape[0]):
+        x, y = points[i, 0], points[i, 1]
+        for j in range(bboxes.shape[0]):
+            px, py, pw, ph = bboxes[j, 0], bboxes[j, 1], bboxes[j, 2], bboxes[j, 3]
+            inside = px <= x <= px + pw and py <= y <= py + ph
+            near = (px - threshold <= x <= px + pw + threshold and
+                    py - threshold <= y <= py + ph + threshold)
+            if inside or near:
+                out[i] = True
+                break
+    return out
+
+def _near_boxes_numpy(points, bboxes, threshold):
+    x, y = points[:, 0:1], points[:, 1:2]
+    px, py = bboxes[None, :, 0], bboxes[None, :, 1]
+    px2, py2 = px + bboxes[None, :, 2], py + bboxes[None, :, 3]
+    inside = (px <= x) & (x <= px2) & (py <= y) & (y <= py2)
+    near = ((px - threshold <= x) & (x <= px2 + threshold) &
+            (py - threshold <= y) & (y <= py2 + threshold))
+    return (inside | near).any(axis=1)
+
+_near_boxes = _select(_near_boxes_loop, _near_boxes_numpy)
+
+def near_boxes(points, bboxes, threshold: int) -> np.ndarray:
+    """points (N, 2) 중 bbox (M, 4) 안에 있거나 threshold 픽셀 이내인 점 (N,) bool"""
+    points = np.ascontiguousarray(points, dtype=np.int64).reshape(-1, 2)
+    bboxes = np.ascontiguousarray(bboxes, dtype=np.int64).reshape(-1, 4)
+    return _near_boxes(points, bboxes, int(threshold))
+
+# --- bbox 중심이 화면 가장자리 마진 안쪽인지 ---
+
+def _centers_inside_margin_loop(bboxes, width, height, margin_x, margin_y):
+    out = np.zeros(bboxes.shape[0], dtype=np.bool_)
+    for i in range(bboxes.shape[0]):
+        center_x = bboxes[i, 0] + bboxes[i, 2] // 2
+        center_y = bboxes[i, 1] + bboxes[i, 3] // 2
+        out[i] = margin_x < center_x < width - margin_x and margin_y < center_y < height - margin_y
+    return out
+
+def _centers_inside_margin_numpy(bboxes, width, height, margin_x, margin_y):
+    center_x = bboxes[:, 0] + bboxes[:, 2] // 2
+    center_y = bboxes[:, 1] + bboxes[:, 3] // 2
+    return ((margin_x < center_x) & (center_x < width - margin_x) &
+            (margin_y < center_y) & (center_y < height - margin_y))
+
+_centers_inside_margin = _select(_centers_inside_margin_loop, _centers_inside_margin_numpy)
+
+def centers_inside_margin(bboxes, width: int, height: int, margin_x: int, margin_y: int) -> np.ndarray:
+    """bbox (N, 4) 중심이 가장자리 마진을 뺀 화면 안쪽에 있는지 (N,) bool"""
+    bboxes = np.ascontiguousarray(bboxes, dtype=np.int64).reshape(-1, 4)
+    return _centers_inside_margin(bboxes, int(width), int(height), int(margin_x), int(margin_y))
+
+# --- 행별 최근접 후보의 탐욕적 1:1 할당 ---
+
+def _greedy_assign_loop(distances, threshold):
+    num_rows, num_cols = distances.shape
+    best_cols = np.empty(num_rows, dtype=np.int64)
+    best_distances = np.empty(num_rows, dtype=np.float64)
+    for i in range(num_rows):
+        best = 0
+        for j in range(1, num_cols):
+            if distances[i, j] < distances[i, best]:
+                best = j
+        best_cols[i] = best
+        best_distances[i] = distances[i, best]
+
+    # 임계값 이내인 행을 거리 순 (같으면 행 순서)으로 정렬한 뒤 후보마다 처음 행만 할당
+    candidates = np.flatnonzero(best_distances <= threshold)
+    order = candidates[np.argsort(best_distances[candidates], kind="mergesort")]
+    used = np.zeros(num_cols, dtype=np.bool_)
+    rows = np.empty(order.shape[0], dtype=np.int64)
+    count = 0
+    for i in order:
+        if not used[best_cols[i]]:
+            used[best_cols[i]] = True
+            rows[count] = i
+            count += 1
+    rows = rows[:count]
+    return rows, best_cols[rows], best_distances[rows]
+
+def _greedy_assign_numpy(distances, threshold):
+    best_cols = np.argmin(distances, axis=1)
+    best_distances = distances[np.arange(distances.shape[0]), best_cols]
+    candidates = np.flatnonzero(best_distances <= threshold)
+    order = candidates[np.argsort(best_distances[candidates], kind="stable")]
+    # 정렬 순서에서 각 후보가 처음 나온 행만 할당 (가까운 tracker 우선)
+    _, first = np.unique(best_cols[order], return_index=True)
+    rows = order[np.sort(first)]
+    return rows, best_cols[rows], best_distances[rows]
+
+_greedy_assign = _select(_greedy_assign_loop, _greedy_assign_numpy)
+
+def greedy_assign(distances, threshold: float):
+    """거리 행렬 (T, C)에서 각 행의 최근접 열을 임계값 이내, 가까운 순으로 열마다 한 번씩 할당
+
+    (행 인덱스, 열 인덱스, 거리) 배열을 할당 순서대로 반환
+    """
+    distances = np.ascontiguousarray(distances, dtype=np.float64)
+    if distances.shape[0] == 0 or distances.shape[1] == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float64)
+    return _greedy_assign(distances, float(threshold))
+
+# --- 슬라이스별 위쪽 관중석 영역 경계 ---
+
+def _spectator_cutoffs_loop(mask, n):
+    height, width = mask.shape
+    slice_width = width // n
+    cutoffs = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        start_col = i * slice_width
+        end_col = (i + 1) * slice_width if i < n - 1 else width
+        white_threshold = int((end_col - start_col) * 0.3)
+        cutoff = height
+        for row in range(height):
+            white_count = 0
+            for col in range(start_col, end_col):
+                if mask[row, col] == 255:
+                    white_count += 1
+            if white_count <= white_threshold:
+                cutoff = row
+                break
+        cutoffs[i] = cutoff
+    return cutoffs
+
+def _spectator_cutoffs_numpy(mask, n):
+    height, width = mask.shape
+    slice_width = width // n
+    cutoffs = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        start_col = i * slice_width
+        end_col = (i + 1) * slice_width if i < n - 1 else width
+        white_threshold = int((end_col - start_col) * 0.3)
+        white_counts = np.count_nonzero(mask[:, start_col:end_col] == 255, axis=1)
+        below = np.flatnonzero(white_counts <= white_threshold)
+        cutoffs[i] = below[0] if len(below) > 0 else height
+    return cutoffs
+
+_spectator_cutoffs = _select(_spectator_cutoffs_loop, _spectator_cutoffs_numpy)
+
+def spectator_cutoffs(mask, n: int) -> np.ndarray:
+    """마스크를 n개 세로 슬라이스로 나눠 위에서부터 흰 픽셀이 폭의 30% 이하가 되는 첫 행 (n,) 반환"""
+    return _spectator_cutoffs(np.ascontiguousarray(mask), int(n))
+
+KERNELS = {
+    "pairwise_distances": (_pairwise_distances_loop, _pairwise_distances_numpy),
+    "within_distance": (_within_distance_loop, _within_distance_numpy),
+    "near_boxes": (_near_boxes_loop, _near_boxes_numpy),
+    "centers_inside_margin": (_centers_inside_margin_loop, _centers_inside_margin_numpy),
+    "greedy_assign": (_greedy_assign_loop, _greedy_assign_numpy),
+    "spectator_cutoffs": (_spectator_cutoffs_loop, _spectator_cutoffs_numpy),
+}
+
+def _parity_cases(rng: np.random.Generator):
+    """커널별 무작위 입력 (빈 입력, 동점 거리 포함)"""
+    for _ in range(200):
+        n, m = rng.integers(0, 30), rng.integers(0, 30)
+        points = rng.integers(-50, 700, size=(n, 2)).astype(np.float64)
+        others = rng.integers(-50, 700, size=(m, 2)).astype(np.float64)
+        bboxes = np.concatenate([rng.integers(-50, 700, size=(m, 2)), rng.integers(0, 60, size=(m, 2))], axis=1)
+        distances = rng.integers(0, 40, size=(n, max(m, 1))).astype(np.float64)  # 정수 거리로 동점 유도
+        mask = np.where(rng.random((90, 160)) < rng.random(), 255, 0).astype(np.uint8)
+        mask[:rng.integers(0, 90)] = 255  # 위쪽 관중석 영역
+        yield "pairwise_distances", (points, others)
+        yield "within_distance", (points, others, float(rng.integers(1, 60)))
+        yield "near_boxes", (points.astype(np.int64), bboxes, int(rng.integers(0, 30)))
+        yield "centers_inside_margin", (bboxes, 640, 360, 64, 36)
+        yield "greedy_assign", (distances, float(rng.integers(0, 40)))
+        yield "spectator_cutoffs", (mask, int(rng.integers(1, 8)))
+
+def check_parity(seed: int = 0) -> int:
+    """스칼라 루프 (Numba가 있으면 컴파일본)와 NumPy 구현 결과 비교, 불일치 수 반환"""
+    rng = np.random.default_rng(seed)
+    compiled = {}
+    mismatches = 0
+    counts = {}
+    for name, args in _parity_cases(rng):
+        loop_func, numpy_func = KERNELS[name]
+        if USE_NUMBA:
+            if name not in compiled:
+                compiled[name] = _jit(loop_func)
+            loop_func = compiled[name]
+        expected = numpy_func(*args)
+        actual = loop_func(*args)
+        expected = expected if isinstance(expected, tuple) else (expected,)
+        actual = actual if isinstance(actual, tuple) else (actual,)
+        same = all(np.array_equal(np.asarray(e), np.asarray(a)) for e, a in zip(expected, actual))
+        counts[name] = counts.get(name, 0) + 1
+        if not same:
+            mismatches += 1
+            print(f"Mismatch in {name}")
+    print(f"Kernel parity ({'numba' if USE_NUMBA else 'python loops'} vs numpy): "
+          f"{sum(counts.values())} cases, {mismatches} mismatches")
+    return mismatches
+
+if __name__ == "__main__":
+    import sys
+    print(f"Backend: {BACKEND}")
+    sys.exit(1 if check_parity() else 0)
@@ -0,0 +1,151 @@
+import json
+import numpy as np
+from typing import Optional, Tuple
+from .player_heatmaps import PlayerHeatmapAccumulator
+
+class MatchStatsAggregator:
+    """추적 중에 프레임별 상태를 받아 점유율, 패스, 이동 거리, 히트맵을 누적 계산하는 클래스
+
+    모든 통계는 프레임당 O(선수 수)로 갱신되며, 선수별 히트맵/거리는 PlayerHeatmapAccumulator의
+    고정 크기 슬롯에 누적됩니다.
+    """
+
+    def __init__(self, frame_width: int, frame_height: int, fps: float, grid_size: Tuple[int, int] = (32, 18),
+                 player_accumulator: PlayerHeatmapAccumulator = None):
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.fps = fps if fps else 1
+        self.grid_size = grid_size  # 히트맵 격자 크기 (가로, 세로)
+
+        self.processed_frames = 0
+        self.skipped_frames = 0
+
+        # 점유 통계
+        self.possession_frames = {}  # team_id -> 점유 프레임 수
+        self.free_ball_frames = 0
+        self.last_holder = None  # 마지막 점유자 (team_id, tracker_id)
+        self.passes = {}  # team_id -> 같은 팀 내 점유 이전 횟수
+        self.turnovers = {}  # team_id -> 상대 팀에 점유를 뺏긴 횟수
+
+        # 공 이동 통계
+        self.last_ball_position = None
+        self.ball_distance = 0.0
+        self.ball_speed_sum = 0.0
+        self.ball_speed_samples = 0
+        self.ball_max_speed = 0.0
+        self.ball_heatmap = np.zeros((grid_size[1], grid_size[0]), dtype=np.int64)
+
+        # 선수 이동 통계 및 팀 히트맵 (고정 크기 슬롯 누적기)
+        if player_accumulator is None:
+            player_accumulator = PlayerHeatmapAccumulator(frame_width, frame_height, fps, grid_size)
+        self.player_accumulator = player_accumulator
+
+    def _grid_indices(self, positions: np.ndarray):
+        """픽셀 좌표를 히트맵 격자 인덱스로 변환"""
+        grid_w, grid_h = self.grid_size
+        cols = np.clip((positions[:, 0] * grid_w / self.frame_width).astype(np.int64), 0, grid_w - 1)
+        rows = np.clip((positions[:, 1] * grid_h / self.frame_height).astype(np.int64), 0, grid_h - 1)
+        return rows, cols
+
+    def skip_frame(self):
+        """감지를 생략한 프레임 (관중석 장면 등) - 이동 거리가 이어지지 않도록 끊음"""
+        self.skipped_frames += 1
+        self.last_ball_position = None
+        self.player_accumulator.skip_frame()
+
+    def update(self, player_snapshot: dict, ball_position: Optional[Tuple[int, int]],
+               possession_info: Optional[dict]):
+        """한 프레임의 추적 결과 반영"""
+        self.processed_frames += 1
+        self._update_possession(possession_info)
+        self._update_ball(ball_position)
+        self.player_accumulator.update(player_snapshot)
+
+    def _update_possession(self, possession_info: Optional[dict]):
+        """점유 시간과 패스/턴오버 누적"""
+        if possession_info is None or not possession_info['in_possession']:
+            self.free_ball_frames += 1
+            return
+
+        team_id = possession_info['team']
+        holder = (team_id, possession_info['tracker_id'])
+        self.possession_frames[team_id] = self.possession_frames.get(team_id, 0) + 1
+
+        if self.last_holder is not None and holder != self.last_holder:
+            last_team = self.last_holder[0]
+            if last_team == team_id:
+                self.passes[team_id] = self.passes.get(team_id, 0) + 1
+            else:
+                self.turnovers[last_team] = self.turnovers.get(last_team, 0) + 1
+        self.last_holder = holder
+
+    def _update_ball(self, ball_position: Optional[Tuple[int, int]]):
+        """공 이동 거리, 속도, 히트맵 누적"""
+        if ball_position is None:
+            self.last_ball_position = None
+            return
+
+        if self.last_ball_position is not None:
+            dx = ball_position[0] - self.last_ball_position[0]
+            dy = ball_position[1] - self.last_ball_position[1]
+            step = float(np.sqrt(dx * dx + dy * dy))
+            speed = step * self.fps  # 픽셀/초
+            self.ball_distance += step
+            self.ball_speed_sum += speed
+            self.ball_speed_samples += 1
+            self.ball_max_speed = max(self.ball_max_speed, speed)
+        self.last_ball_position = ball_position
+
+        rows, cols = self._grid_indices(np.array([ball_position], dtype=np.float64))
+        self.ball_heatmap[rows[0], cols[0]] += 1
+
+    def get_summary(self) -> dict:
+        """누적 통계 요약 반환"""
+        total_possession = sum(self.possession_frames.values())
+        possession_percentage = {
+            str(team_id): (frames / total_possession * 100 if total_possession else 0.0)
+            for team_id, frames in sorted(self.possession_frames.items())
+        }
+
+        # 재식별로 같은 tracker_id가 여러 레코드에 나뉠 수 있으므로 ID별로 합산
+        players = {}
+        for record in np.sort(self.player_accumulator.get_player_stats(), order='tracker_id'):
+            key = str(record['tracker_id'])
+            player = players.setdefault(key, {'team': int(record['team']), 'distance': 0.0,
+                                              'frames': 0, 'average_speed': 0.0, 'max_speed': 0.0})
+            player['distance'] += float(record['distance'])
+            player['frames'] += int(record['frames'])
+            player['max_speed'] = max(player['max_speed'], float(record['max_speed']))
+            seconds = player['frames'] / self.fps
+            player['average_speed'] = player['distance'] / seconds if seconds > 0 else 0.0
+
+        return {
+            'fps': self.fps,
+            'units': 'pixels',
+            'processed_frames': self.processed_frames,
+            'skipped_frames': self.skipped_frames,
+            'possession': {
+                'frames': {str(team_id): frames for team_id, frames in sorted(self.possession_frames.items())},
+                'seconds': {str(team_id): frames / self.fps for team_id, frames in sorted(self.possession_frames.items())},
+                'percentage': possession_percentage,
+                'free_ball_frames': self.free_ball_frames,
+                'passes': {str(team_id): count for team_id, count in sorted(self.passes.items())},
+                'turnovers': {str(team_id): count for team_id, count in sorted(self.turnovers.items())}
+            },
+            'ball': {
+                'distance': self.ball_distance,
+                'average_speed': self.ball_speed_sum / self.ball_speed_samples if self.ball_speed_samples else 0.0,
+                'max_speed': self.ball_max_speed,
+                'heatmap': self.ball_heatmap.tolist()
+            },
+            'teams': {
+                str(team_id): {'heatmap': heatmap.tolist()}
+                for team_id, heatmap in sorted(self.player_accumulator.get_team_heatmaps().items())
+            },
+            'players': players
+        }
+
+    def write_summary(self, output_path: str):
+        """요약 통계를 JSON 파일로 저장"""
+        with open(output_path, 'w') as f:
+            json.dump(self.get_summary(), f, indent=2)
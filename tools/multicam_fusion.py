@@ -0,0 +1,204 @@
+import json
+import numpy as np
+from typing import Dict, List, Tuple
+from .pitch_calibration import PitchCalibration, bbox_foot_points
+from .kernels import pairwise_distances, greedy_assign
+
+class CameraTracks:
+    """카메라 하나의 추적 결과 (tracking_data.json)를 프레임별 경기장 좌표 관측으로 읽는 클래스
+
+    선수 bbox의 발 위치 (하단 중앙)를 카메라 보정으로 경기장 미터 좌표에 투영합니다.
+    frame_offset은 이 카메라가 다른 카메라보다 늦게 시작한 영상 프레임 수입니다. tracking_data.json의
+    frame_number는 영상 프레임마다 frame_step (현재 파이프라인은 2)씩 증가하므로 frame_offset * frame_step만큼
+    프레임 번호를 옮겨 기준 카메라에 맞춥니다.
+    """
+
+    def __init__(self, name: str, tracking_path: str, calibration: PitchCalibration, frame_offset: int = 0):
+        self.name = name
+        self.calibration = calibration
+        with open(tracking_path) as f:
+            data = json.load(f)
+        self.metadata = data["metadata"]
+        self.fps = self.metadata["fps"]
+        frame_numbers = np.array([frame["frame_number"] for frame in data["frames"]], dtype=np.int64)
+        # 영상 프레임 하나당 frame_number 증가량 (연속한 프레임 번호 차이의 최대공약수)
+        self.frame_step = int(np.gcd.reduce(np.diff(frame_numbers))) if len(frame_numbers) > 1 else 1
+        self.frame_step = max(self.frame_step, 1)
+        shift = frame_offset * self.frame_step
+        self.frames = {frame["frame_number"] + shift: frame for frame in data["frames"]}
+
+    def observations(self, frame_number: int) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """프레임의 (카메라 track ID (N,), 클래스 이름 목록, 경기장 좌표 (N, 2)) - 프레임이 없으면 빈 배열"""
+        frame = self.frames.get(frame_number)
+        local_ids, classes, bboxes = [], [], []
+        for class_name, players in (frame["players"] if frame else {}).items():
+            for player in players:
+                bbox = player["bbox"]
+                local_ids.append(player["id"])
+                classes.append(class_name)
+                bboxes.append((bbox["x"], bbox["y"], bbox["width"], bbox["height"]))
+        points = self.calibration.to_pitch(bbox_foot_points(bboxes))
+        return np.array(local_ids, dtype=np.int64), classes, points
+
+class MultiCameraFusion:
+    """여러 카메라의 선수 track을 경기장 좌표에서 하나의 전역 track 집합으로 합치는 클래스
+
+    프레임마다
+      1. 모든 카메라 관측 사이 거리 행렬을 한 번에 계산하고, 다른 카메라 + 같은 클래스 + gate_m 이내인 쌍만 남김
+      2. 가까운 쌍부터 묶되 한 그룹에는 카메라마다 관측 하나만, 그룹 안 모든 쌍이 gate 이내일 때만 합침
+      3. 그룹 구성원의 (카메라, track ID)가 이전에 연결된 전역 ID를 이어받고, 처음 보는 그룹은 최근 사라진
+         전역 track과 handoff_gate_m 이내면 연결 (카메라 사이 이동), 아니면 새 전역 ID
+    """
+
+    def __init__(self, camera_names: List[str], gate_m: float = 1.5, handoff_gate_m: float = 3.0,
+                 max_lost_frames: int = 50):
+        self.camera_names = list(camera_names)
+        self.gate_m = gate_m  # 같은 선수로 볼 카메라 간 관측 거리 (미터, 보정 오차 포함)
+        self.handoff_gate_m = handoff_gate_m  # 사라진 전역 track을 이어받을 최대 거리 (미터)
+        self.max_lost_frames = max_lost_frames  # 이 프레임 수보다 오래 사라진 전역 track은 이어받지 않음
+        self.id_map: Dict[Tuple[int, int], int] = {}  # (카메라 번호, 카메라 track ID) -> 전역 ID
+        self.tracks: Dict[int, dict] = {}  # 전역 ID -> {class, position, first_frame, last_frame, frames, sources}
+        self.next_global_id = 0
+
+    def _group_observations(self, cameras: np.ndarray, class_codes: np.ndarray, points: np.ndarray,
+                            linked: np.ndarray) -> List[List[int]]:
+        """관측을 같은 선수 그룹 (관측 인덱스 목록)으로 묶기"""
+        count = len(points)
+        distances = pairwise_distances(points, points)
+        gate = ((cameras[:, None] != cameras[None, :]) & (class_codes[:, None] == class_codes[None, :])
+                & (distances <= self.gate_m))
+
+        # 후보 쌍을 (이미 같은 전역 ID로 연결된 쌍 우선, 거리) 순으로 정렬
+        rows, cols = np.nonzero(np.triu(gate, k=1))
+        same_track = (linked[rows] >= 0) & (linked[rows] == linked[cols])
+        order = np.lexsort((distances[rows, cols], ~same_track))
+
+        group_of = list(range(count))
+        members = {i: [i] for i in range(count)}
+        for a, b in zip(rows[order].tolist(), cols[order].tolist()):
+            ga, gb = group_of[a], group_of[b]
+            if ga == gb:
+                continue
+            merged = members[ga] + members[gb]
+            # 카메라당 관측 하나, 그룹 안 모든 쌍이 gate 이내
+            if len(set(cameras[merged].tolist())) < len(merged) or not gate[np.ix_(merged, merged)][
+                    ~np.eye(len(merged), dtype=bool)].all():
+                continue
+            keep, drop = min(ga, gb), max(ga, gb)
+            for i in members.pop(drop):
+                group_of[i] = keep
+            members[keep] = merged
+        return [sorted(group) for _, group in sorted(members.items())]
+
+    def update(self, frame_number: int, observations: List[Tuple[np.ndarray, List[str], np.ndarray]]) -> List[dict]:
+        """카메라별 (track ID, 클래스 이름, 경기장 좌표) 관측으로 전역 track 갱신 후 이 프레임의 전역 선수 목록 반환"""
+        cameras = np.concatenate([np.full(len(ids), index, dtype=np.int64)
+                                  for index, (ids, _, _) in enumerate(observations)] or [np.zeros(0, np.int64)])
+        local_ids = np.concatenate([ids for ids, _, _ in observations] or [np.zeros(0, np.int64)])
+        classes = [name for _, names, _ in observations for name in names]
+        points = np.concatenate([pts for _, _, pts in observations] or [np.zeros((0, 2))]).reshape(-1, 2)
+        if len(points) == 0:
+            return []
+
+        class_names = sorted(set(classes))
+        class_codes = np.array([class_names.index(name) for name in classes], dtype=np.int64)
+        keys = list(zip(cameras.tolist(), local_ids.tolist()))
+        linked = np.array([self.id_map.get(key, -1) for key in keys], dtype=np.int64)
+        groups = self._group_observations(cameras, class_codes, points, linked)
+
+        # 이전에 연결된 전역 ID 이어받기 (한 프레임에 같은 전역 ID는 한 그룹만, 구성원이 많이 가리키는 ID 우선)
+        assigned = {}
+        used = set()
+        for group_index, group in enumerate(groups):
+            candidates = [int(linked[i]) for i in group if linked[i] >= 0]
+            for global_id in sorted(set(candidates), key=lambda g: (-candidates.count(g), g)):
+                if global_id not in used and self.tracks[global_id]["class"] == classes[group[0]]:
+                    assigned[group_index] = global_id
+                    used.add(global_id)
+                    break
+
+        # 처음 보는 그룹은 최근 사라진 전역 track과 거리로 연결 (카메라 사이 이동)
+        new_groups = [index for index in range(len(groups)) if index not in assigned]
+        lost_ids = [global_id for global_id, track in self.tracks.items()
+                    if global_id not in used and frame_number - track["last_frame"] <= self.max_lost_frames]
+        if new_groups and lost_ids:
+            group_points = np.array([points[groups[index]].mean(axis=0) for index in new_groups])
+            lost_points = np.array([self.tracks[global_id]["position"] for global_id in lost_ids])
+            distances = pairwise_distances(group_points, lost_points)
+            same_class = (np.array([classes[groups[index][0]] for index in new_groups])[:, None]
+                          == np.array([self.tracks[global_id]["class"] for global_id in lost_ids])[None, :])
+            distances[~same_class] = np.inf
+            rows, cols, _ = greedy_assign(distances, self.handoff_gate_m)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                assigned[new_groups[row]] = lost_ids[col]
+                used.add(lost_ids[col])
+
+        fused = []
+        for group_index, group in enumerate(groups):
+            global_id = assigned.get(group_index)
+            if global_id is None:
+                global_id = self.next_global_id
+                self.next_global_id += 1
+                self.tracks[global_id] = {"class": classes[group[0]], "first_frame": frame_number, "frames": 0,
+                                          "sources": set()}
+            position = points[group].mean(axis=0)
+            track = self.tracks[global_id]
+            track["position"] = position
+            track["last_frame"] = frame_number
+            track["frames"] += 1
+            sources = []
+            for i in group:
+                self.id_map[keys[i]] = global_id
+                track["sources"].add(keys[i])
+                sources.append({"camera": self.camera_names[keys[i][0]], "id": keys[i][1]})
+            fused.append({
+                "id": global_id,
+                "class": track["class"],
+                "position_m": {"x": round(float(position[0]), 2), "y": round(float(position[1]), 2)},
+                "sources": sources
+            })
+        return sorted(fused, key=lambda player: player["id"])
+
+    def track_summary(self) -> Dict[int, dict]:
+        """전역 track별 클래스, 처음/마지막 프레임, 관측 프레임 수, 연결된 (카메라, track ID) 목록"""
+        return {global_id: {
+            "class": track["class"],
+            "first_frame": track["first_frame"],
+            "last_frame": track["last_frame"],
+            "frames": track["frames"],
+            "sources": [{"camera": self.camera_names[camera], "id": local_id}
+                        for camera, local_id in sorted(track["sources"])]
+        } for global_id, track in sorted(self.tracks.items())}
+
+def fuse_camera_tracks(cameras: List[CameraTracks], gate_m: float = 1.5, handoff_gate_m: float = 3.0,
+                       max_lost_frames: int = 50) -> dict:
+    """카메라별 추적 결과를 프레임 번호 순서대로 합쳐 전역 track 결과 (JSON으로 저장할 dict) 반환
+
+    카메라마다 프레임 번호 간격이나 시작 위치가 달라 같은 프레임 번호가 생길 수 없으면 ValueError
+    """
+    steps = {camera.frame_step for camera in cameras}
+    if len(steps) > 1:
+        raise ValueError(f"Cameras number their frames with different steps: "
+                         f"{', '.join(f'{camera.name}={camera.frame_step}' for camera in cameras)}")
+    step = steps.pop() if steps else 1
+    phases = {min(camera.frames) % step for camera in cameras if camera.frames}
+    if len(phases) > 1:
+        raise ValueError(f"Camera frame numbers never coincide (frame step {step}); "
+                         f"check that the cameras were analyzed with the same settings")
+    fusion = MultiCameraFusion([camera.name for camera in cameras], gate_m, handoff_gate_m, max_lost_frames)
+    fps = cameras[0].fps if cameras else 25
+    frames = []
+    for frame_number in sorted(set().union(*(camera.frames for camera in cameras))):
+        players = fusion.update(frame_number, [camera.observations(frame_number) for camera in cameras])
+        frames.append({"frame_number": frame_number, "timestamp": frame_number / fps, "players": players})
+    return {
+        "metadata": {
+            "cameras": [{"name": camera.name, "video_path": camera.metadata.get("video_path")} for camera in cameras],
+            "fps": fps,
+            "gate_m": gate_m,
+            "handoff_gate_m": handoff_gate_m,
+            "max_lost_frames": max_lost_frames
+        },
+        "tracks": {str(global_id): track for global_id, track in fusion.track_summary().items()},
+        "frames": frames
+    }
@@ -0,0 +1,101 @@
+import json
+import cv2
+import numpy as np
+from typing import Optional
+
+class PitchCalibration:
+    """처리 해상도(640x360) 영상 좌표와 경기장 미터 좌표 사이의 호모그래피
+
+    calibration JSON 형식:
+        {"image_points": [[x, y], ...], "pitch_points": [[X, Y], ...]}  # 4개 이상의 대응점
+        또는 {"homography": [[...], [...], [...]]}
+    """
+
+    def __init__(self, homography: np.ndarray):
+        self.homography = np.asarray(homography, dtype=np.float64).reshape(3, 3)
+        self.inverse = np.linalg.inv(self.homography)
+
+    @classmethod
+    def from_points(cls, image_points, pitch_points) -> 'PitchCalibration':
+        """영상-경기장 대응점으로 호모그래피 계산 (4점이면 정확히, 그 이상이면 최소제곱)"""
+        image_points = np.asarray(image_points, dtype=np.float32).reshape(-1, 2)
+        pitch_points = np.asarray(pitch_points, dtype=np.float32).reshape(-1, 2)
+        if len(image_points) < 4 or len(image_points) != len(pitch_points):
+            raise ValueError("At least 4 matching image/pitch points are required")
+
+        if len(image_points) == 4:
+            homography = cv2.getPerspectiveTransform(image_points, pitch_points)
+        else:
+            homography, _ = cv2.findHomography(image_points, pitch_points)
+            if homography is None:
+                raise ValueError("Could not estimate homography from the given points")
+        return cls(homography)
+
+    @classmethod
+    def from_grass_mask(cls, grass_mask: np.ndarray, pitch_length: float = 105.0,
+                        pitch_width: float = 68.0) -> Optional['PitchCalibration']:
+        """잔디 마스크의 가장 큰 영역을 사각형으로 근사해 경기장 전체에 대응 (고정 광각 카메라용)
+
+        경기장 전체가 화면에 보인다고 가정하므로, 일부만 보이는 방송 화면에서는 수동 보정을 사용해야 합니다.
+        사각형을 찾지 못하면 None 반환.
+        """
+        kernel = np.ones((15, 15), np.uint8)
+        closed = cv2.morphologyEx(grass_mask, cv2.MORPH_CLOSE, kernel)
+        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return None
+
+        field_contour = cv2.convexHull(max(contours, key=cv2.contourArea))
+        perimeter = cv2.arcLength(field_contour, True)
+
+        # epsilon을 늘려가며 꼭짓점 4개인 다각형 찾기
+        quad = None
+        for ratio in (0.01, 0.02, 0.03, 0.05, 0.08):
+            approx = cv2.approxPolyDP(field_contour, ratio * perimeter, True)
+            if len(approx) == 4:
+                quad = approx.reshape(4, 2).astype(np.float32)
+                break
+        if quad is None:
+            return None
+
+        # 꼭짓점 순서 정렬 (좌상, 우상, 우하, 좌하)
+        sums = quad.sum(axis=1)
+        diffs = quad[:, 1] - quad[:, 0]
+        ordered = np.array([quad[np.argmin(sums)], quad[np.argmin(diffs)],
+                            quad[np.argmax(sums)], quad[np.argmax(diffs)]], dtype=np.float32)
+        pitch_corners = np.array([[0, 0], [pitch_length, 0],
+                                  [pitch_length, pitch_width], [0, pitch_width]], dtype=np.float32)
+        return cls.from_points(ordered, pitch_corners)
+
+    @classmethod
+    def load(cls, path: str) -> 'PitchCalibration':
+        """JSON 파일에서 보정 정보 불러오기"""
+        with open(path) as f:
+            data = json.load(f)
+        if 'homography' in data:
+            return cls(data['homography'])
+        return cls.from_points(data['image_points'], data['pitch_points'])
+
+    def save(self, path: str):
+        """호모그래피를 JSON 파일로 저장"""
+        with open(path, 'w') as f:
+            json.dump({'homography': self.homography.tolist()}, f, indent=2)
+
+    def to_pitch(self, points) -> np.ndarray:
+        """영상 좌표 배열 (N, 2)를 경기장 미터 좌표로 일괄 변환"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 1, 2)
+        if len(points) == 0:
+            return np.zeros((0, 2), dtype=np.float64)
+        return cv2.perspectiveTransform(points, self.homography).reshape(-1, 2)
+
+    def to_image(self, points) -> np.ndarray:
+        """경기장 미터 좌표 배열 (N, 2)를 영상 좌표로 일괄 변환"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 1, 2)
+        if len(points) == 0:
+            return np.zeros((0, 2), dtype=np.float64)
+        return cv2.perspectiveTransform(points, self.inverse).reshape(-1, 2)
+
+def bbox_foot_points(bboxes) -> np.ndarray:
+    """bbox (N, 4) 배열의 발 위치 (하단 중앙) 반환 - 선수가 지면에 닿는 점"""
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    return np.stack([bboxes[:, 0] + bboxes[:, 2] / 2, bboxes[:, 1] + bboxes[:, 3]], axis=1)
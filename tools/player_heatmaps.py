@@ -0,0 +1,198 @@
+import os
+import numpy as np
+from typing import Optional, Tuple
+
+# 선수별 통계 레코드 형식 (player_stats.npy)
+PLAYER_STATS_DTYPE = np.dtype([
+    ('tracker_id', np.int64),
+    ('team', np.int64),
+    ('distance', np.float64),
+    ('frames', np.int64),
+    ('max_speed', np.float64),
+    ('heatmap_index', np.int64)  # player_heatmaps.npy의 행 번호 (-1이면 히트맵 없음)
+])
+
+class PlayerHeatmapAccumulator:
+    """tracker_id별 히트맵과 이동 거리를 미리 할당된 NumPy 슬롯에 누적하는 클래스
+
+    사라진 tracker의 슬롯은 팀 히트맵에 합산한 뒤 재사용하므로 히트맵 메모리는 경기 길이와 무관하게
+    동시에 추적된 tracker 수의 최댓값만큼입니다 (initial_slots개에서 시작해 모자라면 두 배로 늘림).
+    spill_path가 있으면 충분히 오래 추적된 선수의 히트맵은 디스크에 순차 기록해 내보내기에 포함합니다.
+    """
+
+    def __init__(self, frame_width: int, frame_height: int, fps: float,
+                 grid_size: Tuple[int, int] = (32, 18), initial_slots: int = 64,
+                 spill_path: Optional[str] = None, min_spill_frames: int = 25):
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.fps = fps if fps else 1
+        self.grid_size = grid_size  # 히트맵 격자 크기 (가로, 세로)
+        self.spill_path = spill_path
+        self.min_spill_frames = min_spill_frames  # 이보다 짧게 추적된 tracker는 히트맵을 저장하지 않음
+
+        grid_w, grid_h = grid_size
+        self.heatmaps = np.zeros((initial_slots, grid_h, grid_w), dtype=np.int32)
+        self.distances = np.zeros(initial_slots, dtype=np.float64)
+        self.frames = np.zeros(initial_slots, dtype=np.int64)
+        self.max_speeds = np.zeros(initial_slots, dtype=np.float64)
+        self.last_positions = np.full((initial_slots, 2), np.nan, dtype=np.float64)
+        self.slot_teams = np.zeros(initial_slots, dtype=np.int64)
+
+        self.slot_by_tracker = {}  # tracker_id -> slot
+        self.free_slots = list(range(initial_slots - 1, -1, -1))
+
+        self.team_heatmaps = {}  # team_id -> 사라진 tracker들의 누적 히트맵
+        self.finished_players = []  # 사라진 tracker들의 통계 레코드 (튜플)
+        self.spilled_count = 0
+        self.spill_file = open(spill_path, 'wb') if spill_path else None
+
+    def _grid_indices(self, positions: np.ndarray):
+        """픽셀 좌표를 히트맵 격자 인덱스로 변환"""
+        grid_w, grid_h = self.grid_size
+        cols = np.clip((positions[:, 0] * grid_w / self.frame_width).astype(np.int64), 0, grid_w - 1)
+        rows = np.clip((positions[:, 1] * grid_h / self.frame_height).astype(np.int64), 0, grid_h - 1)
+        return rows, cols
+
+    def _team_heatmap(self, team_id: int) -> np.ndarray:
+        """팀 누적 히트맵 반환 (없으면 생성)"""
+        if team_id not in self.team_heatmaps:
+            grid_w, grid_h = self.grid_size
+            self.team_heatmaps[team_id] = np.zeros((grid_h, grid_w), dtype=np.int64)
+        return self.team_heatmaps[team_id]
+
+    def _grow_slots(self):
+        """빈 슬롯이 없을 때 슬롯 배열을 두 배로 늘림 (기존 슬롯 번호와 누적값은 그대로)"""
+        num_slots = len(self.frames)
+        new_slots = max(1, num_slots)
+        self.heatmaps = np.concatenate([self.heatmaps, np.zeros((new_slots, *self.heatmaps.shape[1:]),
+                                                                dtype=self.heatmaps.dtype)])
+        self.distances = np.concatenate([self.distances, np.zeros(new_slots, dtype=np.float64)])
+        self.frames = np.concatenate([self.frames, np.zeros(new_slots, dtype=np.int64)])
+        self.max_speeds = np.concatenate([self.max_speeds, np.zeros(new_slots, dtype=np.float64)])
+        self.last_positions = np.concatenate([self.last_positions, np.full((new_slots, 2), np.nan, dtype=np.float64)])
+        self.slot_teams = np.concatenate([self.slot_teams, np.zeros(new_slots, dtype=np.int64)])
+        self.free_slots = list(range(num_slots + new_slots - 1, num_slots - 1, -1))
+
+    def _release_slot(self, tracker_id: int):
+        """사라진 tracker의 슬롯을 팀 히트맵에 합산하고 재사용 목록에 반환"""
+        slot = self.slot_by_tracker.pop(tracker_id)
+        team_id = int(self.slot_teams[slot])
+        self._team_heatmap(team_id)[:] += self.heatmaps[slot]
+
+        heatmap_index = -1
+        if self.spill_file is not None and self.frames[slot] >= self.min_spill_frames:
+            self.spill_file.write(self.heatmaps[slot].tobytes())
+            heatmap_index = self.spilled_count
+            self.spilled_count += 1
+
+        self.finished_players.append((tracker_id, team_id, float(self.distances[slot]),
+                                      int(self.frames[slot]), float(self.max_speeds[slot]), heatmap_index))
+
+        self.heatmaps[slot] = 0
+        self.distances[slot] = 0
+        self.frames[slot] = 0
+        self.max_speeds[slot] = 0
+        self.last_positions[slot] = np.nan
+        self.free_slots.append(slot)
+
+    def skip_frame(self):
+        """감지를 생략한 프레임 - 이동 거리가 이어지지 않도록 끊음"""
+        self.last_positions[:] = np.nan
+
+    def update(self, player_snapshot: dict):
+        """한 프레임의 tracker 상태로 히트맵과 이동 거리 누적"""
+        tracker_ids = player_snapshot['tracker_ids'].tolist()
+        team_ids = player_snapshot['team_ids'].tolist()
+
+        # 스냅샷에 없는 tracker는 제거된 것이므로 슬롯 반환
+        current_ids = set(tracker_ids)
+        for tracker_id in [t for t in self.slot_by_tracker if t not in current_ids]:
+            self._release_slot(tracker_id)
+
+        # 새 tracker에 슬롯 할당
+        slots = []
+        rows_selected = []
+        for i, (tracker_id, team_id) in enumerate(zip(tracker_ids, team_ids)):
+            slot = self.slot_by_tracker.get(tracker_id)
+            if slot is None:
+                if not self.free_slots:
+                    self._grow_slots()
+                slot = self.free_slots.pop()
+                self.slot_by_tracker[tracker_id] = slot
+                self.slot_teams[slot] = team_id
+            slots.append(slot)
+            rows_selected.append(i)
+
+        if not slots:
+            return
+
+        slots = np.array(slots, dtype=np.int64)
+        bboxes = player_snapshot['bboxes'][rows_selected]
+        centers = bboxes[:, :2] + bboxes[:, 2:] / 2
+
+        # 히트맵 누적 (슬롯은 서로 다르므로 한 번에 더함)
+        rows, cols = self._grid_indices(centers)
+        self.heatmaps[slots, rows, cols] += 1
+
+        # 이전 위치와 비교해 이동 거리/속도 누적 (첫 프레임은 NaN이라 제외)
+        steps = np.hypot(centers[:, 0] - self.last_positions[slots, 0],
+                         centers[:, 1] - self.last_positions[slots, 1])
+        valid = ~np.isnan(steps)
+        self.distances[slots[valid]] += steps[valid]
+        self.max_speeds[slots[valid]] = np.maximum(self.max_speeds[slots[valid]], steps[valid] * self.fps)
+
+        self.last_positions[slots] = centers
+        self.frames[slots] += 1
+
+    def get_team_heatmaps(self) -> dict:
+        """팀별 전체 히트맵 (사라진 tracker + 현재 tracker) 반환"""
+        team_heatmaps = {team_id: heatmap.copy() for team_id, heatmap in self.team_heatmaps.items()}
+        for slot in self.slot_by_tracker.values():
+            team_id = int(self.slot_teams[slot])
+            if team_id not in team_heatmaps:
+                team_heatmaps[team_id] = np.zeros_like(self.heatmaps[slot], dtype=np.int64)
+            team_heatmaps[team_id] += self.heatmaps[slot]
+        return team_heatmaps
+
+    def get_player_stats(self) -> np.ndarray:
+        """사라진 선수와 현재 선수의 통계를 구조화 배열로 반환"""
+        records = list(self.finished_players)
+        for active_index, (tracker_id, slot) in enumerate(sorted(self.slot_by_tracker.items())):
+            records.append((tracker_id, int(self.slot_teams[slot]), float(self.distances[slot]),
+                            int(self.frames[slot]), float(self.max_speeds[slot]),
+                            self.spilled_count + active_index))
+        return np.array(records, dtype=PLAYER_STATS_DTYPE)
+
+    def export_npy(self, output_dir: str):
+        """player_stats.npy, player_heatmaps.npy, team_heatmaps.npy로 내보내기
+
+        player_heatmaps.npy의 행 순서는 player_stats.npy의 heatmap_index와 같고,
+        team_heatmaps.npy는 팀 ID를 첫 번째 인덱스로 사용합니다.
+        """
+        grid_w, grid_h = self.grid_size
+        player_stats = self.get_player_stats()
+
+        # 디스크에 기록된 히트맵 + 현재 슬롯 히트맵
+        if self.spill_file is not None:
+            self.spill_file.flush()
+            spilled = np.fromfile(self.spill_path, dtype=np.int32).reshape(-1, grid_h, grid_w)
+        else:
+            spilled = np.zeros((0, grid_h, grid_w), dtype=np.int32)
+        active_slots = [slot for _, slot in sorted(self.slot_by_tracker.items())]
+        player_heatmaps = np.concatenate([spilled, self.heatmaps[active_slots]], axis=0)
+
+        team_heatmaps = self.get_team_heatmaps()
+        num_teams = max(team_heatmaps) + 1 if team_heatmaps else 0
+        team_array = np.zeros((num_teams, grid_h, grid_w), dtype=np.int64)
+        for team_id, heatmap in team_heatmaps.items():
+            team_array[team_id] = heatmap
+
+        np.save(os.path.join(output_dir, 'player_stats.npy'), player_stats)
+        np.save(os.path.join(output_dir, 'player_heatmaps.npy'), player_heatmaps)
+        np.save(os.path.join(output_dir, 'team_heatmaps.npy'), team_array)
+
+    def close(self):
+        """디스크 기록 파일 정리"""
+        if self.spill_file is not None and not self.spill_file.closed:
+            self.spill_file.close()
+            os.remove(self.spill_path)
@@ -1,11 +1,72 @@
+import cv2
 import numpy as np
 from typing import List, Tuple, Optional
+from .pitch_calibration import PitchCalibration, bbox_foot_points
+from .appearance import APPEARANCE_BINS, AppearanceFrame, AppearanceGallery
+from .kernels import pairwise_distances
+
+def grass_map_from_frame(frame: np.ndarray, grass_color: Tuple[int, int, int], sample_size: int = 2,
+                         grass_threshold: float = 50) -> np.ndarray:
+    """모든 픽셀에 대해 bboxes_on_grass와 같은 판정 (중심점 주변 평균이 잔디색인지)을 미리 계산한 (H, W) bool 맵"""
+    # 프레임 밖은 0으로 채운 박스 합 / 프레임 안 픽셀 수 (정수 합이라 bboxes_on_grass의 평균과 정확히 같음)
+    window = (2 * sample_size + 1, 2 * sample_size + 1)
+    sums = cv2.boxFilter(frame, cv2.CV_64F, window, normalize=False, borderType=cv2.BORDER_CONSTANT)
+    counts = cv2.boxFilter(np.ones(frame.shape[:2], dtype=np.float64), -1, window, normalize=False,
+                           borderType=cv2.BORDER_CONSTANT)
+    grass = np.empty(frame.shape, dtype=np.float64)
+    grass[:] = grass_color
+    diff = cv2.subtract(cv2.divide(sums, cv2.merge([counts] * 3)), grass)
+    diff = cv2.multiply(diff, diff)
+    grass_color_distance = np.sqrt(diff[..., 0] + diff[..., 1] + diff[..., 2])
+    return grass_color_distance < grass_threshold
+
+def bboxes_on_grass(bboxes, grass_color: Tuple[int, int, int], frame: np.ndarray = None, sample_size: int = 2,
+                    grass_threshold: float = 50, grass_map: np.ndarray = None) -> np.ndarray:
+    """여러 bbox가 잔디색 영역에 있는지 한 번에 확인 (PlayerTracker.is_bbox_on_grass의 벡터화 버전)
+    
+    grass_map (grass_map_from_frame 결과)이 있으면 중심점 조회만, 없으면 fancy indexing으로 중심점 주변 영역 평균을 계산
+    """
+    bboxes = np.asarray(bboxes, dtype=np.int64).reshape(-1, 4)
+    if len(bboxes) == 0 or (frame is None and grass_map is None):
+        return np.zeros(len(bboxes), dtype=bool)
+    
+    if grass_map is not None:
+        frame_height, frame_width = grass_map.shape
+    else:
+        frame_height, frame_width = frame.shape[:2]
+    
+    # bbox가 프레임 경계를 벗어나지 않도록 클리핑
+    x = np.clip(bboxes[:, 0], 0, frame_width - 1)
+    y = np.clip(bboxes[:, 1], 0, frame_height - 1)
+    w = np.maximum(1, np.minimum(bboxes[:, 2], frame_width - x))
+    h = np.maximum(1, np.minimum(bboxes[:, 3], frame_height - y))
+    center_x = x + w // 2
+    center_y = y + h // 2
+    
+    if grass_map is not None:
+        return grass_map[center_y, center_x]
+    
+    # 중심점 주변 (2s+1)x(2s+1) 영역을 한 번에 샘플링 (프레임 밖 픽셀은 제외)
+    offsets = np.arange(-sample_size, sample_size + 1)
+    sample_x = center_x[:, None, None] + offsets[None, None, :]
+    sample_y = center_y[:, None, None] + offsets[None, :, None]
+    valid = ((sample_x >= 0) & (sample_x < frame_width) &
+             (sample_y >= 0) & (sample_y < frame_height))
+    samples = frame[np.clip(sample_y, 0, frame_height - 1),
+                    np.clip(sample_x, 0, frame_width - 1)].astype(np.float64)
+    samples[~valid] = 0
+    counts = valid.sum(axis=(1, 2))
+    avg_colors = samples.sum(axis=(1, 2)) / np.maximum(counts, 1)[:, None]
+    
+    # 잔디색과의 거리 계산 (BGR)
+    grass_color_distance = np.sqrt(np.sum((avg_colors - np.array(grass_color, dtype=np.float64)) ** 2, axis=1))
+    return grass_color_distance < grass_threshold
 
 class PlayerTracker:
     """개별 선수를 추적하는 클래스"""
     
     def __init__(self, team_id: int, initial_bbox: Tuple[int, int, int, int], tracker_id: int, grass_color: Tuple[int, int, int]):
-        self.team_id = team_id  # 팀 정보 (1 또는 2)
+        self.team_id = team_id  # 팀/색상 클래스 정보 (1, 2는 두 팀, 3 이상은 심판/골키퍼 등 추가 클래스)
         self.tracker_id = tracker_id  # 고유 ID
         self.current_bbox = initial_bbox  # (x, y, w, h)
         self.previous_bbox = initial_bbox
@@ -16,6 +77,7 @@ class PlayerTracker:
         self.max_lost_frames_out_bounds = 2   # 화면 밖에서의 최대 허용 유실 프레임 (즉시 제거)
         self.out_of_bounds_frames = 0  # 화면 밖에 있었던 연속 프레임 수
         self.grass_color = grass_color  # 잔디 색상 (BGR)
+        self.appearance = None  # 외형 기술자 (잔디 제외 색상 히스토그램, 재식별용)
         
     def update_bbox(self, new_bbox: Tuple[int, int, int, int]):
         """bbox 업데이트 및 속도 계산"""
@@ -35,6 +97,13 @@ class PlayerTracker:
         self.frames_lost_score = 0
         self.out_of_bounds_frames = 0
     
+    def update_appearance(self, descriptor: np.ndarray, rate: float = 0.2):
+        """외형 기술자를 지수 이동 평균으로 갱신"""
+        if self.appearance is None:
+            self.appearance = descriptor.copy()
+        else:
+            self.appearance = (1 - rate) * self.appearance + rate * descriptor
+    
     def predict_next_position(self) -> Tuple[int, int, int, int]:
         """속도를 기반으로 다음 위치 예측"""
         x, y, w, h = self.current_bbox
@@ -179,7 +248,12 @@ class PlayerTracker:
     
     def increment_lost_score(self, frame: np.ndarray = None):
         """유실 점수 증가 (잔디색일 때 3배)"""
-        if frame is not None and self.is_bbox_on_grass(frame):
+        on_grass = frame is not None and self.is_bbox_on_grass(frame)
+        self.add_lost_score(on_grass)
+    
+    def add_lost_score(self, on_grass: bool):
+        """잔디 여부가 이미 계산된 경우의 유실 점수 증가"""
+        if on_grass:
             # 잔디색 영역에 있으면 6배로 증가
             self.frames_lost_score += 6
         else:
@@ -189,104 +263,206 @@ class PlayerTracker:
 class PlayerTrackerManager:
     """PlayerTracker들을 관리하는 클래스"""
     
-    def __init__(self, frame_width: int, frame_height: int, grass_color: Tuple[int, int, int] = (0, 128, 0)):
+    def __init__(self, frame_width: int, frame_height: int, grass_color: Tuple[int, int, int] = (0, 128, 0),
+                 calibration: PitchCalibration = None):
         self.trackers = []  # PlayerTracker 객체들의 리스트
         self.next_tracker_id = 0
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.max_assignment_distance = 50  # bbox 할당 최대 거리 (더 엄격하게)
+        self.max_assignment_distance_m = 3.0  # 보정이 있을 때 경기장 좌표 기준 할당 최대 거리 (미터)
+        self.calibration = calibration  # 영상-경기장 호모그래피 (있으면 미터 단위로 할당)
         self.initialization_complete = False  # 초기화 완료 플래그
         self.grass_color = grass_color  # 잔디 색상 (BGR)
+        self.camera_residual = np.zeros(2)  # 정수 bbox에 반영하지 못한 카메라 이동 소수부
+        self.frame_index = 0  # 업데이트 호출 횟수 (갤러리 항목의 경과 시간 계산용)
+        # 최근에 사라진 tracker의 외형 갤러리 (재등장 시 같은 ID 재사용)
+        self.appearance_gallery = AppearanceGallery(int(np.prod(APPEARANCE_BINS)))
+        self.tracker_params = {}  # 새 PlayerTracker에 덮어쓸 속성 (예: max_lost_frames_in_bounds, 파라미터 튜닝용)
+    
+    def reset(self):
+        """장면 전환 시 모든 tracker 제거 (ID는 계속 증가)"""
+        self.trackers = []
+        self.initialization_complete = False
+        self.camera_residual = np.zeros(2)
+        # 다른 장면의 위치로는 재등장 판정을 할 수 없으므로 갤러리도 비움
+        self.appearance_gallery = AppearanceGallery(int(np.prod(APPEARANCE_BINS)))
+    
+    def apply_camera_motion(self, dx: float, dy: float):
+        """카메라 이동만큼 모든 tracker bbox를 한 번에 이동
+        
+        할당 전에 호출하면 예측 위치가 카메라 이동을 포함하고, 이후 계산되는 속도에서는
+        카메라 이동이 빠지므로 선수 자체의 움직임만 남음
+        """
+        self.camera_residual += (dx, dy)
+        shift = np.round(self.camera_residual).astype(np.int64)
+        self.camera_residual -= shift
+        if not self.trackers or not shift.any():
+            return
+        
+        bboxes = np.array([t.current_bbox for t in self.trackers], dtype=np.int64).reshape(-1, 4)
+        bboxes[:, :2] += shift
+        for tracker, bbox in zip(self.trackers, bboxes.tolist()):
+            tracker.current_bbox = tuple(bbox)
+        self.appearance_gallery.shift_positions(int(shift[0]), int(shift[1]))
+    
+    @staticmethod
+    def _flatten_bboxes(bboxes_by_class: dict) -> List[Tuple[Tuple[int, int, int, int], int]]:
+        """{클래스 ID: bbox 리스트}를 [(bbox, 클래스 ID), ...]로 펼침"""
+        return [(bbox, class_id) for class_id, bboxes in bboxes_by_class.items() for bbox in bboxes]
     
     def initialize_trackers(self, team1_bboxes: List[Tuple[int, int, int, int]], 
                            team2_bboxes: List[Tuple[int, int, int, int]]):
         """첫 프레임에서 초기 tracker들 생성"""
+        self.initialize_trackers_by_class({1: team1_bboxes, 2: team2_bboxes})
+    
+    def initialize_trackers_by_class(self, bboxes_by_class: dict):
+        """첫 프레임에서 클래스별 초기 tracker들 생성"""
         if self.initialization_complete:
             return
         
-        # 팀1 tracker들 생성
-        for bbox in team1_bboxes:
-            new_tracker = PlayerTracker(1, bbox, self.next_tracker_id, self.grass_color)
-            self.trackers.append(new_tracker)
-            self.next_tracker_id += 1
-        
-        # 팀2 tracker들 생성
-        for bbox in team2_bboxes:
-            new_tracker = PlayerTracker(2, bbox, self.next_tracker_id, self.grass_color)
-            self.trackers.append(new_tracker)
+        for bbox, class_id in self._flatten_bboxes(bboxes_by_class):
+            self.trackers.append(self._new_tracker(class_id, bbox, self.next_tracker_id))
             self.next_tracker_id += 1
         
         self.initialization_complete = True
-        print(f"초기화 완료: Team1 {len(team1_bboxes)}명, Team2 {len(team2_bboxes)}명 등록")
+        counts = ", ".join(f"Class{class_id} {len(bboxes)}명" for class_id, bboxes in bboxes_by_class.items())
+        print(f"초기화 완료: {counts} 등록")
     
     def update_trackers_only(self, team1_bboxes: List[Tuple[int, int, int, int]], 
-                            team2_bboxes: List[Tuple[int, int, int, int]], frame: np.ndarray = None):
+                            team2_bboxes: List[Tuple[int, int, int, int]], frame: np.ndarray = None,
+                            appearance: AppearanceFrame = None):
         """기존 tracker들만 업데이트 (새로운 tracker 생성 안함)"""
+        self.update_trackers_only_by_class({1: team1_bboxes, 2: team2_bboxes}, frame, appearance)
+    
+    def update_trackers_only_by_class(self, bboxes_by_class: dict, frame: np.ndarray = None,
+                                      appearance: AppearanceFrame = None, grass_map: np.ndarray = None):
+        """클래스별 bbox로 기존 tracker들만 업데이트 (새로운 tracker 생성 안함)"""
         if not self.initialization_complete:
             return
         
-        all_bboxes = [(bbox, 1) for bbox in team1_bboxes] + [(bbox, 2) for bbox in team2_bboxes]
+        self.frame_index += 1
+        all_bboxes = self._flatten_bboxes(bboxes_by_class)
+        descriptors = self._compute_descriptors(all_bboxes, appearance)
         
         # 1단계: 각 tracker에 대해 가장 가까운 bbox 찾기
-        assignments = self._assign_bboxes_to_trackers(all_bboxes)
+        distances = self._predicted_distance_matrix(all_bboxes)
+        assignments = self._assign_bboxes_to_trackers(all_bboxes, distances)
         
         # 2단계: 충돌 해결 (여러 tracker가 같은 bbox를 원하는 경우)
-        assignments = self._resolve_conflicts(assignments, all_bboxes)
+        assignments = self._resolve_conflicts(assignments, all_bboxes, distances)
         
         # 3단계: tracker 업데이트
-        self._update_tracker_positions(assignments, frame)
+        self._update_tracker_positions(assignments, frame, grass_map)
+        self._update_appearances(assignments, descriptors)
         
         # 4단계: 유실되거나 화면 밖으로 나간 tracker 정리
         self._cleanup_trackers()
     
     def update_trackers(self, team1_bboxes: List[Tuple[int, int, int, int]], 
-                       team2_bboxes: List[Tuple[int, int, int, int]], frame: np.ndarray = None):
-        """모든 tracker들을 새로운 bbox 정보로 업데이트 (기존 방식 - 하위 호환성)"""
-        all_bboxes = [(bbox, 1) for bbox in team1_bboxes] + [(bbox, 2) for bbox in team2_bboxes]
+                       team2_bboxes: List[Tuple[int, int, int, int]], frame: np.ndarray = None,
+                       appearance: AppearanceFrame = None):
+        """모든 tracker들을 새로운 bbox 정보로 업데이트 (기존 방식 - 하위 호환성)
+        
+        appearance가 있으면 bbox 외형 기술자를 계산해 사라졌던 선수가 재등장할 때 이전 ID를 재사용
+        """
+        self.update_trackers_by_class({1: team1_bboxes, 2: team2_bboxes}, frame, appearance)
+    
+    def update_trackers_by_class(self, bboxes_by_class: dict, frame: np.ndarray = None,
+                                 appearance: AppearanceFrame = None, grass_map: np.ndarray = None):
+        """{클래스 ID: bbox 리스트}로 모든 tracker 업데이트 (클래스마다 별도 tracker 풀, 다른 클래스끼리는 할당 안함)"""
+        self.frame_index += 1
+        all_bboxes = self._flatten_bboxes(bboxes_by_class)
+        descriptors = self._compute_descriptors(all_bboxes, appearance)
         
         # 1단계: 각 tracker에 대해 가장 가까운 bbox 찾기
-        assignments = self._assign_bboxes_to_trackers(all_bboxes)
+        distances = self._predicted_distance_matrix(all_bboxes)
+        assignments = self._assign_bboxes_to_trackers(all_bboxes, distances)
         
         # 2단계: 충돌 해결 (여러 tracker가 같은 bbox를 원하는 경우)
-        assignments = self._resolve_conflicts(assignments, all_bboxes)
+        assignments = self._resolve_conflicts(assignments, all_bboxes, distances)
         
         # 3단계: tracker 업데이트
-        self._update_tracker_positions(assignments, frame)
+        self._update_tracker_positions(assignments, frame, grass_map)
+        self._update_appearances(assignments, descriptors)
         
-        # 4단계: 새로운 bbox들로 새 tracker 생성
-        self._create_new_trackers(all_bboxes, assignments)
+        # 4단계: 새로운 bbox들로 새 tracker 생성 (갤러리와 외형이 맞으면 이전 ID 재사용)
+        self._create_new_trackers(all_bboxes, assignments, descriptors)
         
         # 5단계: 유실되거나 화면 밖으로 나간 tracker 정리
         self._cleanup_trackers()
     
-    def _assign_bboxes_to_trackers(self, all_bboxes: List[Tuple[Tuple[int, int, int, int], int]]) -> dict:
+    def _compute_descriptors(self, all_bboxes: List, appearance: AppearanceFrame = None) -> Optional[np.ndarray]:
+        """모든 bbox의 외형 기술자를 한 번에 계산 (appearance가 없으면 None)"""
+        if appearance is None:
+            return None
+        return appearance.descriptors([bbox for bbox, _ in all_bboxes])
+    
+    def _update_appearances(self, assignments: dict, descriptors: Optional[np.ndarray]):
+        """bbox가 할당된 tracker들의 외형 기술자 갱신"""
+        if descriptors is None:
+            return
+        for tracker in self.trackers:
+            if tracker.tracker_id in assignments:
+                bbox_idx = assignments[tracker.tracker_id][0]
+                tracker.update_appearance(descriptors[bbox_idx])
+    
+    def _get_assignment_threshold(self) -> float:
+        """할당 최대 거리 (보정이 있으면 미터, 없으면 픽셀)"""
+        if self.calibration is not None:
+            return self.max_assignment_distance_m
+        return self.max_assignment_distance
+    
+    def _predicted_distance_matrix(self, all_bboxes: List[Tuple[Tuple[int, int, int, int], int]]) -> np.ndarray:
+        """모든 tracker 예측 위치와 모든 bbox 사이의 거리 행렬 (T, B) 계산 (다른 팀은 inf)
+        
+        보정이 있으면 발 위치를 경기장 미터 좌표로 일괄 변환해 거리를 계산
+        """
+        num_trackers, num_bboxes = len(self.trackers), len(all_bboxes)
+        if num_trackers == 0 or num_bboxes == 0:
+            return np.full((num_trackers, num_bboxes), np.inf)
+        
+        tracker_bboxes = np.array([t.current_bbox for t in self.trackers], dtype=np.int64).reshape(-1, 4)
+        velocities = np.array([(t.dx, t.dy) for t in self.trackers], dtype=np.int64).reshape(-1, 2)
+        tracker_teams = np.array([t.team_id for t in self.trackers])
+        bboxes = np.array([bbox for bbox, _ in all_bboxes], dtype=np.int64).reshape(-1, 4)
+        bbox_teams = np.array([team_id for _, team_id in all_bboxes])
+        
+        if self.calibration is not None:
+            # 예측된 발 위치와 감지된 발 위치를 한 번에 경기장 좌표로 변환
+            predicted_feet = bbox_foot_points(tracker_bboxes) + velocities
+            tracker_points = self.calibration.to_pitch(predicted_feet)
+            bbox_points = self.calibration.to_pitch(bbox_foot_points(bboxes))
+        else:
+            # 예측 중심점 (PlayerTracker.calculate_predicted_distance_to_bbox와 동일한 정수 연산)
+            tracker_points = tracker_bboxes[:, :2] + tracker_bboxes[:, 2:] // 2 + velocities
+            bbox_points = bboxes[:, :2] + bboxes[:, 2:] // 2
+        
+        distances = pairwise_distances(tracker_points, bbox_points)
+        
+        # 같은 팀만 고려
+        distances[tracker_teams[:, None] != bbox_teams[None, :]] = np.inf
+        return distances
+    
+    def _assign_bboxes_to_trackers(self, all_bboxes: List[Tuple[Tuple[int, int, int, int], int]],
+                                   distances: np.ndarray = None) -> dict:
         """각 tracker에 가장 가까운 bbox 할당 (예측 위치 기반)"""
         assignments = {}
-        
-        for tracker in self.trackers:
-            best_bbox = None
-            best_distance = float('inf')
-            best_idx = -1
-            
-            for idx, (bbox, team_id) in enumerate(all_bboxes):
-                # 같은 팀만 고려
-                if team_id != tracker.team_id:
-                    continue
-                
-                # 예측 위치를 기반으로 거리 계산
-                distance = tracker.calculate_predicted_distance_to_bbox(bbox)
-                
-                if distance < best_distance and distance < self.max_assignment_distance:
-                    best_distance = distance
-                    best_bbox = bbox
-                    best_idx = idx
-            
-            if best_bbox is not None:
-                assignments[tracker.tracker_id] = (best_idx, best_bbox, best_distance)
+        if not all_bboxes:
+            return assignments
+        if distances is None:
+            distances = self._predicted_distance_matrix(all_bboxes)
+        
+        threshold = self._get_assignment_threshold()
+        best_indices = np.argmin(distances, axis=1)
+        for tracker, best_idx, row in zip(self.trackers, best_indices.tolist(), distances):
+            best_distance = row[best_idx]
+            if best_distance < threshold:
+                assignments[tracker.tracker_id] = (best_idx, all_bboxes[best_idx][0], best_distance)
         
         return assignments
     
-    def _resolve_conflicts(self, assignments: dict, all_bboxes: List) -> dict:
+    def _resolve_conflicts(self, assignments: dict, all_bboxes: List, distances: np.ndarray = None) -> dict:
         """여러 tracker가 같은 bbox를 원하는 경우 해결"""
         bbox_conflicts = {}
         
@@ -317,16 +493,21 @@ class PlayerTrackerManager:
         
         # 충돌에서 진 tracker들에게 할당되지 않은 bbox 중 가장 가까운 것 할당
         self._assign_unassigned_bboxes_to_losing_trackers(
-            losing_trackers, all_bboxes, resolved_assignments
+            losing_trackers, all_bboxes, resolved_assignments, distances
         )
         
         return resolved_assignments
     
     def _assign_unassigned_bboxes_to_losing_trackers(self, losing_tracker_ids: List[int], 
-                                                   all_bboxes: List, resolved_assignments: dict):
+                                                   all_bboxes: List, resolved_assignments: dict,
+                                                   distances: np.ndarray = None):
         """충돌에서 진 tracker들에게 할당되지 않은 bbox 중 가장 가까운 것 할당"""
         if not losing_tracker_ids:
             return
+        if distances is None:
+            distances = self._predicted_distance_matrix(all_bboxes)
+        tracker_rows = {t.tracker_id: row for row, t in enumerate(self.trackers)}
+        threshold = self._get_assignment_threshold()
         
         # 이미 할당된 bbox들의 인덱스 구하기
         assigned_bbox_indices = set()
@@ -342,8 +523,8 @@ class PlayerTrackerManager:
         
         # 각 losing tracker에 대해 가장 가까운 할당되지 않은 bbox 찾기
         for tracker_id in losing_tracker_ids:
-            tracker = next((t for t in self.trackers if t.tracker_id == tracker_id), None)
-            if tracker is None:
+            row = tracker_rows.get(tracker_id)
+            if row is None:
                 continue
             
             best_bbox = None
@@ -351,14 +532,10 @@ class PlayerTrackerManager:
             best_idx = -1
             
             for idx, bbox, team_id in unassigned_bboxes:
-                # 같은 팀만 고려
-                if team_id != tracker.team_id:
-                    continue
-                
-                # 예측 위치를 기반으로 거리 계산
-                distance = tracker.calculate_predicted_distance_to_bbox(bbox)
+                # 예측 위치 기반 거리 (다른 팀은 inf)
+                distance = distances[row, idx]
                 
-                if distance < best_distance and distance < self.max_assignment_distance:
+                if distance < best_distance and distance < threshold:
                     best_distance = distance
                     best_bbox = bbox
                     best_idx = idx
@@ -369,39 +546,82 @@ class PlayerTrackerManager:
                 # 할당된 bbox는 unassigned_bboxes에서 제거
                 unassigned_bboxes = [(i, b, t) for i, b, t in unassigned_bboxes if i != best_idx]
     
-    def _update_tracker_positions(self, assignments: dict, frame: np.ndarray = None):
+    def _update_tracker_positions(self, assignments: dict, frame: np.ndarray = None,
+                                  grass_map: np.ndarray = None):
         """assignments에 따라 tracker 위치 업데이트"""
+        lost_trackers = []
         for tracker in self.trackers:
             if tracker.tracker_id in assignments:
                 _, bbox, _ = assignments[tracker.tracker_id]
                 tracker.update_bbox(bbox)
             else:
-                # bbox를 찾지 못한 경우
-                tracker.increment_lost_score(frame)
-                
-                # 화면 밖에 있는지 확인하고 카운터 증가
-                if tracker.is_out_of_bounds(self.frame_width, self.frame_height):
-                    tracker.increment_out_of_bounds_frames()
+                lost_trackers.append(tracker)
+        
+        if not lost_trackers:
+            return
+        
+        # bbox를 찾지 못한 tracker들의 잔디 여부를 한 번에 계산
+        on_grass = bboxes_on_grass([t.current_bbox for t in lost_trackers], self.grass_color,
+                                   frame, grass_map=grass_map)
+        
+        for tracker, tracker_on_grass in zip(lost_trackers, on_grass):
+            tracker.add_lost_score(tracker_on_grass)
+            
+            # 화면 밖에 있는지 확인하고 카운터 증가
+            if tracker.is_out_of_bounds(self.frame_width, self.frame_height):
+                tracker.increment_out_of_bounds_frames()
+    
+    def _new_tracker(self, team_id: int, bbox: Tuple[int, int, int, int], tracker_id: int) -> PlayerTracker:
+        """tracker_params를 적용한 새 PlayerTracker 생성"""
+        tracker = PlayerTracker(team_id, bbox, tracker_id, self.grass_color)
+        for name, value in self.tracker_params.items():
+            setattr(tracker, name, value)
+        return tracker
     
-    def _create_new_trackers(self, all_bboxes: List, assignments: dict):
-        """할당되지 않은 bbox들로 새로운 tracker 생성"""
+    def _create_new_trackers(self, all_bboxes: List, assignments: dict, descriptors: np.ndarray = None):
+        """할당되지 않은 bbox들로 새로운 tracker 생성 (외형 갤러리와 일치하면 이전 ID 재사용)"""
         assigned_indices = set()
         for _, (bbox_idx, _, _) in assignments.items():
             if bbox_idx >= 0:  # -1은 분할된 bbox
                 assigned_indices.add(bbox_idx)
         
-        for idx, (bbox, team_id) in enumerate(all_bboxes):
-            if idx not in assigned_indices:
-                new_tracker = PlayerTracker(team_id, bbox, self.next_tracker_id, self.grass_color)
-                self.trackers.append(new_tracker)
+        new_indices = [idx for idx in range(len(all_bboxes)) if idx not in assigned_indices]
+        if not new_indices:
+            return
+        
+        # 새 bbox들을 갤러리와 한 번에 비교
+        reused_ids = [None] * len(new_indices)
+        if descriptors is not None:
+            new_bboxes = np.array([all_bboxes[idx][0] for idx in new_indices], dtype=np.float64).reshape(-1, 4)
+            reused_ids = self.appearance_gallery.match(
+                descriptors[new_indices],
+                [all_bboxes[idx][1] for idx in new_indices],
+                new_bboxes[:, :2] + new_bboxes[:, 2:] // 2,
+                self.frame_index
+            )
+        
+        for idx, reused_id in zip(new_indices, reused_ids):
+            bbox, team_id = all_bboxes[idx]
+            if reused_id is None:
+                tracker_id = self.next_tracker_id
                 self.next_tracker_id += 1
+            else:
+                tracker_id = reused_id
+            new_tracker = self._new_tracker(team_id, bbox, tracker_id)
+            if descriptors is not None:
+                new_tracker.update_appearance(descriptors[idx])
+            self.trackers.append(new_tracker)
     
     def _cleanup_trackers(self):
-        """제거되어야 할 tracker들 정리"""
-        self.trackers = [
-            tracker for tracker in self.trackers 
-            if not tracker.should_be_removed(self.frame_width, self.frame_height)
-        ]
+        """제거되어야 할 tracker들 정리 (외형 정보가 있으면 갤러리에 보관)"""
+        remaining = []
+        for tracker in self.trackers:
+            if not tracker.should_be_removed(self.frame_width, self.frame_height):
+                remaining.append(tracker)
+            elif tracker.appearance is not None:
+                self.appearance_gallery.add(tracker.tracker_id, tracker.team_id, tracker.appearance,
+                                            tracker.get_center(), self.frame_index)
+        self.trackers = remaining
     
     def get_all_bboxes(self) -> Tuple[List[Tuple[int, int, int, int]], List[Tuple[int, int, int, int]]]:
         """팀별로 모든 tracker의 bbox 반환"""
@@ -411,13 +631,35 @@ class PlayerTrackerManager:
         for tracker in self.trackers:
             if tracker.team_id == 1:
                 team1_bboxes.append(tracker.current_bbox)
-            else:
+            elif tracker.team_id == 2:
                 team2_bboxes.append(tracker.current_bbox)
         
         return team1_bboxes, team2_bboxes
     
+    def get_bboxes_by_class(self) -> dict:
+        """클래스별 모든 tracker의 bbox 반환 {클래스 ID: bbox 리스트}"""
+        bboxes_by_class = {}
+        for tracker in self.trackers:
+            bboxes_by_class.setdefault(tracker.team_id, []).append(tracker.current_bbox)
+        return bboxes_by_class
+    
+    def get_tracker_snapshot(self) -> dict:
+        """모든 tracker의 ID, 팀, bbox를 배열로 반환 (벡터화된 거리 계산용)"""
+        return {
+            'tracker_ids': np.array([t.tracker_id for t in self.trackers], dtype=np.int64),
+            'team_ids': np.array([t.team_id for t in self.trackers], dtype=np.int64),
+            'bboxes': np.array([t.current_bbox for t in self.trackers], dtype=np.float64).reshape(-1, 4)
+        }
+    
     def get_tracker_count(self) -> Tuple[int, int]:
         """팀별 tracker 수 반환"""
         team1_count = sum(1 for t in self.trackers if t.team_id == 1)
         team2_count = sum(1 for t in self.trackers if t.team_id == 2)
-        return team1_count, team2_count 
\ No newline at end of file
+        return team1_count, team2_count
+    
+    def get_tracker_counts(self) -> dict:
+        """클래스별 tracker 수 반환 {클래스 ID: 수}"""
+        counts = {}
+        for tracker in self.trackers:
+            counts[tracker.team_id] = counts.get(tracker.team_id, 0) + 1
+        return counts 
\ No newline at end of file
@@ -0,0 +1,52 @@
+import json
+from typing import Optional
+
+class PossessionTimeline:
+    """프레임별 점유 정보를 구간(segment)으로 묶어 JSON Lines 파일에 순차 기록하는 클래스"""
+
+    def __init__(self, output_path: str, fps: float):
+        self.output_path = output_path
+        self.fps = fps if fps else 1
+        self.file = open(output_path, 'w')
+        self.current_segment = None  # 진행 중인 점유 구간
+        self.segment_count = 0
+
+    def update(self, frame_number: int, possession_info: Optional[dict]):
+        """현재 프레임의 점유 정보 반영 (점유자가 바뀌면 이전 구간을 파일에 기록)"""
+        if possession_info is not None and possession_info['in_possession']:
+            holder = (possession_info['team'], possession_info['tracker_id'])
+        else:
+            holder = None
+
+        if self.current_segment is not None:
+            current_holder = (self.current_segment['team'], self.current_segment['tracker_id'])
+            if holder == current_holder:
+                self.current_segment['end_frame'] = frame_number
+                return
+            self._write_current_segment()
+
+        if holder is not None:
+            self.current_segment = {
+                'team': holder[0],
+                'tracker_id': holder[1],
+                'start_frame': frame_number,
+                'end_frame': frame_number
+            }
+
+    def _write_current_segment(self):
+        """진행 중인 구간을 파일에 기록"""
+        segment = self.current_segment
+        segment['start_time'] = segment['start_frame'] / self.fps
+        segment['end_time'] = segment['end_frame'] / self.fps
+        self.file.write(json.dumps(segment) + '\n')
+        self.file.flush()
+        self.segment_count += 1
+        self.current_segment = None
+
+    def close(self):
+        """남은 구간을 기록하고 파일 닫기"""
+        if self.file.closed:
+            return
+        if self.current_segment is not None:
+            self._write_current_segment()
+        self.file.close()
@@ -0,0 +1,77 @@
+import cv2
+import numpy as np
+from typing import List
+
+class SceneChangeDetector:
+    """잔디 비율과 축소 히스토그램으로 장면(샷)을 분류하고 컷을 감지하는 클래스"""
+
+    def __init__(self, min_grass_ratio: float = 0.35, cut_threshold: float = 0.5,
+                 thumbnail_size: tuple = (64, 36)):
+        self.min_grass_ratio = min_grass_ratio  # 이보다 잔디가 적으면 필드가 아닌 장면 (관중석, 클로즈업 등)
+        self.cut_threshold = cut_threshold  # 히스토그램 Bhattacharyya 거리 임계값 (이보다 크면 컷)
+        self.thumbnail_size = thumbnail_size  # 히스토그램 계산용 축소 해상도 (width, height)
+
+        self.previous_hist = None
+        self.shots = []  # 샷 경계 기록
+        self.current_shot = None
+
+    def _compute_histogram(self, frame: np.ndarray) -> np.ndarray:
+        """축소된 프레임의 H-S 히스토그램 계산"""
+        thumbnail = cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2HSV)
+        hist = cv2.calcHist([hsv], [0, 1], None, [16, 4], [0, 180, 0, 256])
+        cv2.normalize(hist, hist, 1.0, 0.0, cv2.NORM_L1)
+        return hist
+
+    def update(self, frame: np.ndarray, grass_mask: np.ndarray, frame_number: int) -> dict:
+        """현재 프레임의 장면 정보 계산 (필드 여부, 컷 여부, 샷 번호)"""
+        grass_ratio = cv2.countNonZero(grass_mask) / grass_mask.size
+        is_pitch = grass_ratio >= self.min_grass_ratio
+
+        hist = self._compute_histogram(frame)
+        if self.previous_hist is None:
+            is_cut = False
+        else:
+            distance = cv2.compareHist(self.previous_hist, hist, cv2.HISTCMP_BHATTACHARYYA)
+            is_cut = distance > self.cut_threshold
+        self.previous_hist = hist
+
+        # 첫 프레임이거나 컷이면 새 샷 시작
+        if self.current_shot is None or is_cut:
+            self._start_shot(frame_number)
+
+        shot = self.current_shot
+        shot['end_frame'] = frame_number
+        if is_pitch:
+            shot['pitch_frames'] += 1
+        shot['frames'] += 1
+
+        return {
+            'shot_index': shot['shot_index'],
+            'is_cut': is_cut,
+            'is_pitch': is_pitch,
+            'grass_ratio': grass_ratio
+        }
+
+    def _start_shot(self, frame_number: int):
+        """새 샷 기록 시작"""
+        self.current_shot = {
+            'shot_index': len(self.shots),
+            'start_frame': frame_number,
+            'end_frame': frame_number,
+            'frames': 0,
+            'pitch_frames': 0
+        }
+        self.shots.append(self.current_shot)
+
+    def get_shot_boundaries(self) -> List[dict]:
+        """기록된 샷 경계 목록 반환 (필드 장면 여부 포함)"""
+        return [
+            {
+                'shot_index': shot['shot_index'],
+                'start_frame': shot['start_frame'],
+                'end_frame': shot['end_frame'],
+                'is_pitch': shot['pitch_frames'] * 2 >= shot['frames']
+            }
+            for shot in self.shots
+        ]
@@ -0,0 +1,64 @@
+import numpy as np
+from typing import List, Tuple
+from .appearance import gather_box_pixels
+
+TEAM_MODES = ("masks", "blobs")
+
+class TeamClassifier:
+    """잔디가 아닌 영역에서 한 번에 뽑은 blob들의 팀(색상 클래스)을 일괄 분류하는 클래스
+
+    bbox 안의 잔디가 아닌 픽셀마다 (미리 계산한 조회 테이블로) 가장 가까운 클래스 색상을 골라
+    클래스별 득표 히스토그램을 만들고, 득표 비율이 min_fraction 이상인 최다 득표 클래스로 분류합니다.
+    어느 클래스 색상과도 tolerance 이내가 아닌 픽셀은 득표하지 않으므로 공, 라인, 관중 등은 0(미분류)이 됩니다.
+    """
+
+    def __init__(self, class_colors_bgr: List[Tuple[int, int, int]], class_ids: List[int] = None,
+                 tolerance: int = 50, min_fraction: float = 0.2):
+        self.class_colors = np.array(class_colors_bgr, dtype=np.int64).reshape(-1, 3)
+        if class_ids is None:
+            class_ids = list(range(1, len(self.class_colors) + 1))
+        self.class_ids = np.array(class_ids, dtype=np.int64)
+        self.tolerance = tolerance  # 채널별 허용 오차 (create_uniform_mask의 bgr_range와 같은 기준)
+        self.min_fraction = min_fraction  # 잔디가 아닌 픽셀 중 해당 클래스 득표 최소 비율
+        self.lut = self._build_lut()
+
+    def _build_lut(self) -> np.ndarray:
+        """채널당 64단계로 양자화한 BGR 색상 -> 클래스 번호 조회 테이블 (어느 클래스도 아니면 클래스 수)"""
+        levels = np.arange(64, dtype=np.int16) * 4 + 2  # 각 양자화 구간의 중앙값
+        b, g, r = np.meshgrid(levels, levels, levels, indexing='ij')
+        grid = np.stack([b.ravel(), g.ravel(), r.ravel()], axis=1)
+
+        # 가장 가까운 클래스 색상 (채널별 최대 차이 기준)
+        channel_diff = np.stack([np.abs(grid - color.astype(np.int16)).max(axis=1)
+                                 for color in self.class_colors], axis=1)
+        nearest = np.argmin(channel_diff, axis=1)
+        matched = channel_diff[np.arange(len(grid)), nearest] <= self.tolerance
+        return np.where(matched, nearest, len(self.class_colors)).astype(np.uint8)
+
+    def classify(self, frame: np.ndarray, bboxes, grass_mask: np.ndarray) -> np.ndarray:
+        """bbox (N, 4)별 클래스 ID 배열 반환 (미분류는 0)"""
+        bboxes = np.asarray(bboxes, dtype=np.int64).reshape(-1, 4)
+        num_boxes, num_classes = len(bboxes), len(self.class_colors)
+        if num_boxes == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        frame_height, frame_width = frame.shape[:2]
+        labels, flat_indices = gather_box_pixels(bboxes, frame_width, frame_height)
+        keep = grass_mask.reshape(-1)[flat_indices] == 0
+        labels = labels[keep]
+        pixels = frame.reshape(-1, 3)[flat_indices[keep]] >> 2
+
+        # 조회 테이블로 픽셀별 클래스 결정 (마지막 열은 어느 클래스도 아닌 픽셀)
+        lut_index = (pixels[:, 0].astype(np.int32) << 12) | (pixels[:, 1].astype(np.int32) << 6) | pixels[:, 2]
+        pixel_classes = self.lut[lut_index].astype(np.int64)
+
+        # bbox별 클래스 득표 히스토그램
+        votes = np.bincount(labels * (num_classes + 1) + pixel_classes,
+                            minlength=num_boxes * (num_classes + 1)).reshape(num_boxes, num_classes + 1)
+        non_grass = votes.sum(axis=1)
+        votes = votes[:, :num_classes]
+
+        best = np.argmax(votes, axis=1)
+        best_votes = votes[np.arange(num_boxes), best]
+        confident = (best_votes > 0) & (best_votes >= self.min_fraction * np.maximum(non_grass, 1))
+        return np.where(confident, self.class_ids[best], 0)
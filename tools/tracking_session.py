@@ -0,0 +1,164 @@
+import numpy as np
+from typing import Optional
+from .player_tracker import PlayerTracker, PlayerTrackerManager
+from .ball_tracker import BallTrackerManager
+from .pitch_calibration import PitchCalibration
+
+def apply_tracker_params(tracker_manager, ball_tracker_manager, tracker_params):
+    """튜닝 파라미터 적용 ("players.<속성>": PlayerTrackerManager, "player.<속성>": 각 PlayerTracker,
+    "ball.<속성>": BallTrackerManager)"""
+    for name, value in (tracker_params or {}).items():
+        target, _, attribute = name.partition(".")
+        if target == "player":
+            if not hasattr(PlayerTracker(0, (0, 0, 1, 1), -1, (0, 0, 0)), attribute):
+                raise ValueError(f"Unknown tracker parameter: {name}")
+            tracker_manager.tracker_params[attribute] = value
+            continue
+        owner = {"players": tracker_manager, "ball": ball_tracker_manager}.get(target)
+        if owner is None or not hasattr(owner, attribute):
+            raise ValueError(f"Unknown tracker parameter: {name}")
+        setattr(owner, attribute, value)
+
+def validate_tracker_params(tracker_params):
+    """튜닝 파라미터 이름 확인 (알 수 없는 이름이면 ValueError, 입출력을 열기 전에 미리 확인할 때 사용)"""
+    apply_tracker_params(PlayerTrackerManager(1, 1, (0, 0, 0)), BallTrackerManager(1, 1, (0, 0, 0)), tracker_params)
+
+class TrackingSession:
+    """카메라/경기 하나의 선수·공 tracker를 묶어 프레임별 입력 스냅샷으로만 상태를 바꾸는 추적 세션
+
+    입력은 DetectionLogReader 레코드와 같은 dict (frame_number, is_cut, skipped, camera_shift,
+    detected_by_class, ball_bboxes, grass_map, descriptors, scene)이고, step()은 tracker 객체를 참조하지 않는
+    결과 스냅샷을 반환합니다. 세션끼리 공유하는 상태가 없으므로 여러 세션을 스레드/프로세스에서 동시에 실행할 수 있고,
+    같은 입력 순서면 결과가 비트 단위로 같습니다. 한 세션의 step()은 한 번에 한 스레드에서만 호출해야 합니다.
+    """
+
+    def __init__(self, frame_width: int, frame_height: int, grass_color, class_names: dict, fps: float,
+                 calibration: PitchCalibration = None, tracker_debug_mode: bool = False, tracker_params: dict = None):
+        self.class_names = dict(class_names)
+        self.fps = fps
+        self.tracker_debug_mode = tracker_debug_mode
+        # 세션 내부 상태 (밖에서 직접 바꾸지 않음, 벤치마크 계측용으로만 노출)
+        self.player_manager = PlayerTrackerManager(frame_width, frame_height, grass_color, calibration=calibration)
+        self.ball_manager = BallTrackerManager(frame_width, frame_height, grass_color, calibration=calibration)
+        apply_tracker_params(self.player_manager, self.ball_manager, tracker_params)
+        self.is_first_frame = True  # tracker_debug_mode에서 첫 프레임만 등록
+
+    def reset(self):
+        """장면 전환 시 모든 tracker 제거 (ID는 계속 증가)"""
+        self.player_manager.reset()
+        self.ball_manager.reset()
+        self.is_first_frame = True
+
+    def step(self, record: dict, frame: np.ndarray = None, appearance=None) -> dict:
+        """프레임 하나의 감지 스냅샷으로 tracker를 갱신하고 결과 스냅샷 반환
+
+        frame/appearance는 전체 실행에서 잔디 판정 맵과 외형 기술자 대신 프레임 픽셀을 쓸 때만 넘깁니다.
+        반환: {frame_data (tracking_data.json 프레임 항목), ball_info, tracked_by_class, player_snapshot,
+        ball_position} (skipped 프레임은 frame_data와 비활성 ball_info만)
+        """
+        frame_number = record["frame_number"]
+        if record.get("is_cut"):
+            self.reset()
+        if record.get("skipped"):
+            frame_data = {
+                "frame_number": frame_number,
+                "timestamp": frame_number / self.fps,
+                "players": {name: [] for name in self.class_names.values()},
+                "ball": None,
+                "scene": record.get("scene")
+            }
+            return {"frame_data": frame_data, "ball_info": {"active": False}, "tracked_by_class": {},
+                    "player_snapshot": None, "ball_position": None}
+
+        # 카메라 이동만큼 모든 tracker 위치를 먼저 이동 (할당 전 예측 보정)
+        camera_shift = tuple(record.get("camera_shift", (0.0, 0.0)))
+        self.player_manager.apply_camera_motion(*camera_shift)
+        self.ball_manager.apply_camera_motion(*camera_shift)
+        self._update_trackers(record["detected_by_class"], record["ball_bboxes"], frame, appearance,
+                              record.get("grass_map"))
+
+        tracked_by_class = self.player_manager.get_bboxes_by_class()
+        player_snapshot = self.player_manager.get_tracker_snapshot()
+        frame_data, ball_info = self._build_frame_data(frame_number, tracked_by_class, player_snapshot,
+                                                       camera_shift, record.get("scene"))
+        return {
+            "frame_data": frame_data,
+            "ball_info": ball_info,
+            "tracked_by_class": tracked_by_class,
+            "player_snapshot": player_snapshot,
+            "ball_position": self.ball_manager.get_best_ball_position(),
+        }
+
+    def _update_trackers(self, detected_by_class: dict, detected_ball_bboxes, frame: Optional[np.ndarray],
+                         appearance, grass_map: Optional[np.ndarray]):
+        """감지 결과로 공/선수 tracker 업데이트"""
+        # 공 추적 업데이트 (선수 위치는 갱신 전 스냅샷으로 전달)
+        self.ball_manager.update_ball_tracking(detected_ball_bboxes, self.player_manager.get_tracker_snapshot())
+
+        # 추적 모드에 따른 처리
+        if self.tracker_debug_mode:
+            # 추적 전용 모드: 첫 프레임에서만 등록, 나머지는 추적만
+            if self.is_first_frame:
+                self.player_manager.initialize_trackers_by_class(detected_by_class)
+                self.is_first_frame = False
+            else:
+                self.player_manager.update_trackers_only_by_class(detected_by_class, frame, appearance=appearance,
+                                                                  grass_map=grass_map)
+        else:
+            # 일반 모드: 매 프레임 등록/업데이트
+            self.player_manager.update_trackers_by_class(detected_by_class, frame, appearance=appearance,
+                                                         grass_map=grass_map)
+
+    def _build_frame_data(self, frame_number: int, tracked_by_class: dict, player_snapshot: dict, camera_shift,
+                          scene_info):
+        """프레임 하나의 추적 결과 JSON 데이터와 공 정보 반환"""
+        frame_data = {
+            "frame_number": frame_number,
+            "timestamp": frame_number / self.fps,  # 초 단위 타임스탬프
+            "players": {name: [] for name in self.class_names.values()},
+            "ball": None,
+            "camera_motion": {"dx": round(camera_shift[0], 2), "dy": round(camera_shift[1], 2)}
+        }
+        if scene_info is not None:
+            frame_data["scene"] = scene_info
+
+        # 클래스별 선수 데이터 수집 (tracker ID는 get_bboxes_by_class와 같은 tracker 순서)
+        for class_id, name in self.class_names.items():
+            tracker_ids = player_snapshot['tracker_ids'][player_snapshot['team_ids'] == class_id].tolist()
+            for tracker_id, bbox in zip(tracker_ids, tracked_by_class.get(class_id, [])):
+                x, y, w, h = bbox
+                player_data = {
+                    "id": tracker_id,
+                    "position": {
+                        "x": int(x + w/2),  # 중심점 x 좌표
+                        "y": int(y + h/2)   # 중심점 y 좌표
+                    },
+                    "bbox": {
+                        "x": int(x),
+                        "y": int(y),
+                        "width": int(w),
+                        "height": int(h)
+                    }
+                }
+                frame_data["players"][name].append(player_data)
+
+        # 공 데이터 수집
+        ball_info = self.ball_manager.get_ball_info()
+        if ball_info['active']:
+            ball_bbox = self.ball_manager.get_ball_bbox()
+            if ball_bbox:
+                x, y, w, h = ball_bbox
+                frame_data["ball"] = {
+                    "position": {
+                        "x": int(x + w/2),  # 중심점 x 좌표
+                        "y": int(y + h/2)   # 중심점 y 좌표
+                    },
+                    "bbox": {
+                        "x": int(x),
+                        "y": int(y),
+                        "width": int(w),
+                        "height": int(h)
+                    },
+                    "possession": ball_info['possession']
+                }
+        return frame_data, ball_info
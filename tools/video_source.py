@@ -0,0 +1,156 @@
+import sys
+import time
+import threading
+import cv2
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+DEFAULT_LIVE_FPS = 25  # 카메라/스트림이 FPS를 알려주지 않을 때 사용
+
+class LatestFrameReader:
+    """백그라운드 스레드에서 프레임을 계속 받아 가장 최근 프레임 하나만 보관하는 클래스
+
+    처리가 입력보다 느리면 읽지 않은 이전 프레임을 버리고 (dropped_frames 증가) 항상 최신 프레임을 넘겨줍니다.
+    """
+
+    def __init__(self, grab: Callable[[], Tuple[bool, Optional[np.ndarray]]],
+                 close: Optional[Callable[[], None]] = None):
+        self.grab = grab  # (ok, frame)을 반환하는 입력 함수 (블로킹 가능)
+        self.close = close  # 수신 스레드가 끝날 때 그 스레드에서 호출 (grab 중인 입력을 다른 스레드가 해제하지 않도록)
+        self.condition = threading.Condition()
+        self.latest = None  # (frame, 수신 시각)
+        self.finished = False
+        self.stopped = False
+        self.received_frames = 0
+        self.dropped_frames = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        """입력이 끝날 때까지 프레임 수신"""
+        try:
+            while not self.stopped:
+                ok, frame = self.grab()
+                captured_at = time.monotonic()
+                with self.condition:
+                    if not ok:
+                        break
+                    if self.latest is not None:
+                        self.dropped_frames += 1  # 처리되지 못한 이전 프레임 폐기
+                    self.latest = (frame, captured_at)
+                    self.received_frames += 1
+                    self.condition.notify_all()
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+        finally:
+            if self.close is not None:
+                self.close()
+
+    def stop(self, timeout: float = 1.0):
+        """수신 스레드 종료 요청 후 잠시 대기 (입력 해제는 수신 스레드가 grab을 마친 뒤 직접 함)"""
+        self.stopped = True
+        self.thread.join(timeout)
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray], Optional[float]]:
+        """새 프레임이 올 때까지 기다렸다가 (ok, frame, 수신 시각) 반환"""
+        with self.condition:
+            while self.latest is None and not self.finished:
+                self.condition.wait()
+            if self.latest is None:
+                return False, None, None
+            frame, captured_at = self.latest
+            self.latest = None
+            return True, frame, captured_at
+
+class VideoSource:
+    """파일, 카메라 번호, 스트림 URL, stdin 원시 프레임을 같은 방식으로 읽는 입력 소스
+
+    spec:
+        "0", "1" ...       카메라 번호 (실시간)
+        "rtsp://..." 등    스트림 URL (실시간)
+        "-"                stdin으로 들어오는 BGR24 원시 프레임 (stdin_size 크기, 실시간)
+        그 외              동영상 파일 (realtime=True면 FPS 속도로 재생해 실시간 입력처럼 사용)
+
+    실시간 입력은 LatestFrameReader로 읽어 밀린 프레임을 버리고, 총 프레임 수는 알 수 없으므로 0입니다.
+    """
+
+    def __init__(self, spec: str, realtime: bool = False, stdin_size: Tuple[int, int] = (640, 360),
+                 stdin_fps: float = DEFAULT_LIVE_FPS):
+        self.spec = spec
+        self.cap = None
+        self.reader = None
+        self.stdin_size = stdin_size
+
+        if spec == "-":
+            self.is_live = True
+            self.fps = stdin_fps
+            self.total_frames = 0
+            self.reader = LatestFrameReader(self._read_stdin_frame)
+            return
+
+        is_camera = spec.isdigit()
+        self.cap = cv2.VideoCapture(int(spec) if is_camera else spec)
+        self.is_live = is_camera or "://" in spec or realtime
+        fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap.isOpened() else 0
+        self.fps = int(fps) if fps and fps > 0 else DEFAULT_LIVE_FPS
+        if self.is_live:
+            self.total_frames = 0
+        else:
+            self.total_frames = max(0, int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+
+        if self.is_live and self.cap.isOpened():
+            grab = self._read_paced_file_frame if realtime and not is_camera and "://" not in spec else self.cap.read
+            self.next_frame_time = None
+            self.reader = LatestFrameReader(grab, close=self.cap.release)
+
+    def is_opened(self) -> bool:
+        """입력을 열었는지 확인"""
+        return self.spec == "-" or (self.cap is not None and self.cap.isOpened())
+
+    @property
+    def dropped_frames(self) -> int:
+        """처리가 밀려 버린 프레임 수"""
+        return self.reader.dropped_frames if self.reader is not None else 0
+
+    def _read_stdin_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """stdin에서 BGR24 프레임 하나를 정확히 읽음"""
+        width, height = self.stdin_size
+        frame_size = width * height * 3
+        data = bytearray()
+        while len(data) < frame_size:
+            chunk = sys.stdin.buffer.read(frame_size - len(data))
+            if not chunk:
+                return False, None
+            data.extend(chunk)
+        return True, np.frombuffer(bytes(data), dtype=np.uint8).reshape(height, width, 3)
+
+    def _read_paced_file_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """파일 프레임을 FPS 간격에 맞춰 읽음 (실시간 입력 대용)"""
+        now = time.monotonic()
+        if self.next_frame_time is None:
+            self.next_frame_time = now
+        elif self.next_frame_time > now:
+            time.sleep(self.next_frame_time - now)
+        self.next_frame_time += 1.0 / self.fps
+        return self.cap.read()
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """다음 (실시간이면 가장 최근) 프레임과 수신 시각 (time.monotonic) 반환"""
+        if self.reader is not None:
+            return self.reader.read()
+        ok, frame = self.cap.read()
+        return ok, frame, time.monotonic()
+
+    def rewind(self) -> bool:
+        """처음으로 되감기 (파일만 가능, 실시간 입력이면 False)"""
+        if self.is_live:
+            return False
+        return bool(self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0))
+
+    def release(self):
+        """입력 해제 (실시간 입력의 캡처는 수신 스레드가 읽기를 마친 뒤 해제)"""
+        if self.reader is not None:
+            self.reader.stop()
+        elif self.cap is not None:
+            self.cap.release()
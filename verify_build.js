@@ -7,10 +7,13 @@ console.log('🔍 Verifying build requirements...\n');
 
 const requiredFiles = [
   'main.js',
+  'frame_reassembler.js',
+  'analysis_client.js',
   'main.html',
   'analyze.html',
   'preload.js',
   'main.py',
+  'server.py',
   'dist/bundle.js',
   'python-dist/soccer_detector'
 ];